@@ -1,48 +1,153 @@
 # backend_api/api/routers/dashboard.py
 
+import os
 import json
+import sqlite3
+from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, List
+from fastapi import APIRouter, HTTPException, Request
 
 from core.config import PATH_TO_PAYROLL_ENGINE
-from schemas.general import DashboardRatesResponse
+from schemas.general import DashboardRatesResponse, BaremeFreshness
+from services import reference_data
 
 router = APIRouter(
     prefix="/api/dashboard",
     tags=["Dashboard"]
 )
 
+CHEMIN_COTISATIONS = PATH_TO_PAYROLL_ENGINE / "data" / "cotisations.json"
+# Base de fraîcheur alimentée par backend_calculs/scripts/scheduler.py (voir scripts/fraicheur.py)
+CHEMIN_FRAICHEUR = Path(os.getenv("FRAICHEUR_DB", PATH_TO_PAYROLL_ENGINE / "data" / "fraicheur.sqlite"))
+SLO_PAR_DEFAUT_HEURES = 24.0
+ORDRE_STATUTS = {"green": 0, "orange": 1, "red": 2}
+# Les statuts dépendent aussi de l'heure : la réponse en cache est recalculée au plus tard après ce délai.
+TTL_STATUTS_SECONDES = 300
 
-@router.get("/contribution-rates", response_model=DashboardRatesResponse)
-def get_contribution_rates():
-    """ Récupère les taux de cotisation et vérifie leur fraîcheur. """
+
+def _lire_fraicheur() -> List[Dict[str, Any]]:
+    """État courant de chaque barème ; liste vide tant que le scheduler n'a jamais tourné."""
+    if not CHEMIN_FRAICHEUR.exists():
+        return []
+    conn = sqlite3.connect(f"file:{CHEMIN_FRAICHEUR}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
     try:
-        chemin_cotisations = PATH_TO_PAYROLL_ENGINE / "data" / "cotisations.json"
-        data = json.loads(chemin_cotisations.read_text(encoding="utf-8"))
-        last_scraped_str = data.get("meta", {}).get("last_scraped")
-        rates_with_status = []
-
-        if last_scraped_str:
-            last_scraped_date = datetime.fromisoformat(last_scraped_str.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-            delta = now - last_scraped_date
-
-            for rate in data.get("cotisations", []):
-                if delta > timedelta(days=7):
-                    status = "red"
-                elif delta > timedelta(days=1):
-                    status = "orange"
-                else:
-                    status = "green"
-                rate["status"] = status
-                rates_with_status.append(rate)
-
-        return {"rates": rates_with_status, "last_check": last_scraped_str}
+        return [dict(row) for row in conn.execute("SELECT * FROM etat")]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def _parse_iso(s: str | None) -> datetime | None:
+    if not s:
+        return None
+    return datetime.fromisoformat(s.replace("Z", "+00:00"))
+
+
+def _statut(derniere_reussite: str | None, slo_heures: float | None, now: datetime) -> str:
+    """ Vert dans le SLO du barème, orange jusqu'à 7 fois le SLO, rouge au-delà ou si jamais rafraîchi. """
+    date = _parse_iso(derniere_reussite)
+    if date is None:
+        return "red"
+    slo = timedelta(hours=slo_heures or SLO_PAR_DEFAUT_HEURES)
+    age = now - date
+    if age <= slo:
+        return "green"
+    if age <= 7 * slo:
+        return "orange"
+    return "red"
+
+
+def _construire_contribution_rates() -> Dict[str, Any]:
+    """ Taux de cotisation et fraîcheur de chacun, barème par barème. """
+    data = json.loads(CHEMIN_COTISATIONS.read_text(encoding="utf-8"))
+    now = datetime.now(timezone.utc)
+    etats = _lire_fraicheur()
+
+    # Un taux peut être alimenté par plusieurs barèmes (ex: part salariale / patronale) : on garde le pire.
+    par_id: Dict[str, Dict[str, Any]] = {}
+    for etat in etats:
+        statut = _statut(etat["derniere_reussite"], etat["slo_heures"], now)
+        for cid in json.loads(etat["ids_cotisations"] or "[]"):
+            courant = par_id.get(cid)
+            if courant is None or ORDRE_STATUTS[statut] > ORDRE_STATUTS[courant["status"]]:
+                par_id[cid] = {"status": statut, "bareme": etat["bareme"], "last_scraped": etat["derniere_reussite"]}
 
+    # Repli pour les taux qu'aucun barème planifié ne couvre : date globale du fichier.
+    last_scraped_str = data.get("meta", {}).get("last_scraped")
+    repli = {"status": _statut(last_scraped_str, SLO_PAR_DEFAUT_HEURES, now), "bareme": None, "last_scraped": last_scraped_str}
+
+    rates_with_status = [
+        {**rate, **par_id.get(rate.get("id"), repli)}
+        for rate in data.get("cotisations", [])
+    ]
+    tentatives = [e["derniere_tentative"] for e in etats if e["derniere_tentative"]]
+    response = {"rates": rates_with_status, "last_check": max(tentatives) if tentatives else last_scraped_str}
+    return DashboardRatesResponse(**response).model_dump(mode="json")
+
+
+reference_data.register(
+    "contribution-rates",
+    # Le fichier WAL change à chaque passe de réconciliation, avant même le checkpoint SQLite.
+    lambda: [CHEMIN_COTISATIONS, CHEMIN_FRAICHEUR, Path(f"{CHEMIN_FRAICHEUR}-wal")],
+    _construire_contribution_rates,
+    ttl=TTL_STATUTS_SECONDES,
+)
+
+
+@router.get("/contribution-rates", response_model=DashboardRatesResponse)
+def get_contribution_rates(request: Request):
+    """ Récupère les taux de cotisation et leur fraîcheur (réponse en cache, ETag / 304). """
+    try:
+        return reference_data.respond(request, "contribution-rates")
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Fichier cotisations.json introuvable.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/baremes-freshness", response_model=List[BaremeFreshness])
+def get_baremes_freshness():
+    """ Fraîcheur, SLO, planification et historique récent (latence, écarts) de chaque barème. """
+    if not CHEMIN_FRAICHEUR.exists():
+        return []
+    now = datetime.now(timezone.utc)
+    depuis = (now - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    conn = sqlite3.connect(f"file:{CHEMIN_FRAICHEUR}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        latences = {
+            row["bareme"]: row["latence"]
+            for row in conn.execute(
+                "SELECT bareme, AVG(duree_s) AS latence FROM passes WHERE ts >= ? GROUP BY bareme", (depuis,)
+            )
+        }
+        ecarts = {
+            row["bareme"]: row["n"]
+            for row in conn.execute(
+                "SELECT bareme, COUNT(DISTINCT ts) AS n FROM ecarts WHERE ts >= ? GROUP BY bareme", (depuis,)
+            )
+        }
+        etats = [dict(row) for row in conn.execute("SELECT * FROM etat ORDER BY bareme")]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
 
+    return [
+        {
+            "bareme": e["bareme"],
+            "fichier": e["fichier"],
+            "status": _statut(e["derniere_reussite"], e["slo_heures"], now),
+            "slo_heures": e["slo_heures"],
+            "derniere_tentative": e["derniere_tentative"],
+            "derniere_reussite": e["derniere_reussite"],
+            "prochaine_execution": e["prochaine_execution"],
+            "echecs_consecutifs": e["echecs_consecutifs"],
+            "latence_moyenne_30j": latences.get(e["bareme"]),
+            "ecarts_30j": ecarts.get(e["bareme"], 0),
+        }
+        for e in etats
+    ]
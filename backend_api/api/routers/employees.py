@@ -1,14 +1,16 @@
 # backend_api/api/routers/employees.py
 
+import base64
 import json
 import traceback
 from datetime import date
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query
 
 from core.config import supabase, PATH_TO_PAYROLL_ENGINE
-from schemas.employee import FullEmployee, NewFullEmployee
+from schemas.employee import EmployeeListPage, EmployeeOverview, FullEmployee, NewFullEmployee
 from schemas.payslip import ContractResponse
+from services import employee_overview
 
 router = APIRouter(
     prefix="/api/employees",
@@ -31,6 +33,83 @@ def get_employees():
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
+# Colonnes servies par la liste : les colonnes JSON du contrat ne sont lues que sur la fiche détaillée.
+LIST_COLUMNS = "id, employee_folder_name, first_name, last_name, job_title, contract_type, statut, hire_date"
+# Caractères réservés de la syntaxe des filtres PostgREST (or=, listes, jokers)
+_FILTER_RESERVED = ',()*"\\'
+
+
+def _encode_cursor(last_name: str, employee_id: str) -> str:
+    raw = json.dumps([last_name, employee_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_name, employee_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(last_name), str(employee_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide.")
+
+
+def _quote(value: str) -> str:
+    """ Valeur entre guillemets pour un filtre PostgREST (les virgules et parenthèses y sont permises). """
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _apply_filters(query, statut: Optional[str], contract_type: Optional[str], search: Optional[str], ids: Optional[str] = None):
+    if ids:
+        query = query.in_('id', [i.strip() for i in ids.split(",") if i.strip()])
+    if statut:
+        query = query.eq('statut', statut)
+    if contract_type:
+        query = query.eq('contract_type', contract_type)
+    if search:
+        term = "".join(c for c in search if c not in _FILTER_RESERVED).strip()
+        if term:
+            query = query.or_(",".join(f"{column}.ilike.*{term}*" for column in ("first_name", "last_name", "job_title")))
+    return query
+
+
+@router.get("/list", response_model=EmployeeListPage)
+def list_employees(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    statut: Optional[str] = None,
+    contract_type: Optional[str] = None,
+    search: Optional[str] = None,
+    ids: Optional[str] = None,
+):
+    """
+    Liste paginée des salariés : colonnes de la liste uniquement, tri (last_name, id) et pagination
+    par curseur (keyset), filtres côté serveur (`ids` : identifiants séparés par des virgules).
+    Le nombre total correspondant aux filtres n'est servi qu'avec la première page (sans curseur).
+    """
+    try:
+        after = _decode_cursor(cursor) if cursor else None
+        # Le total est compté avec la première page seulement : le client le garde pour les suivantes.
+        query = supabase.table('employees').select(LIST_COLUMNS, count="exact" if after is None else None)
+        query = _apply_filters(query, statut, contract_type, search, ids)
+        if after is not None:
+            last_name, employee_id = after
+            query = query.or_(f"last_name.gt.{_quote(last_name)},and(last_name.eq.{_quote(last_name)},id.gt.{_quote(employee_id)})")
+        # Une ligne de plus que demandé : sa présence signale une page suivante.
+        response = query.order('last_name').order('id').limit(limit + 1).execute()
+        rows = response.data or []
+
+        total = response.count if after is None else None
+
+        items = rows[:limit]
+        next_cursor = _encode_cursor(items[-1]['last_name'], items[-1]['id']) if len(rows) > limit else None
+        return {"items": items, "total": total, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("ERROR: Exception dans list_employees:")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
 @router.get("/{employee_id}", response_model=FullEmployee)
 def get_employee_details(employee_id: str):
     """ Récupère les détails complets d'un seul salarié. """
@@ -122,30 +201,32 @@ async def create_employee(employee_data: NewFullEmployee):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
+@router.get("/{employee_id}/overview", response_model=EmployeeOverview)
+def get_employee_overview(employee_id: str, year: int, month: int):
+    """
+    Fiche complète, bulletins, contrat et saisies du mois d'un salarié en un seul appel
+    (une seule lecture de la fiche, lectures indépendantes en parallèle, résultat en cache).
+    """
+    try:
+        return employee_overview.get_overview(employee_id, year, month)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"ERROR: Exception dans get_employee_overview pour l'ID {employee_id}:")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
 @router.get("/{employee_id}/contract", response_model=ContractResponse)
 def get_employee_contract_url(employee_id: str):
     """ Génère une URL sécurisée pour le contrat PDF d'un salarié. """
     try:
-        print(f"DEBUG: Récupération du nom de dossier pour l'employé {employee_id}.")
-        emp_response = supabase.table('employees').select("employee_folder_name").eq('id', employee_id).single().execute()
-        print(f"DEBUG: Réponse BRUTE de Supabase (get folder_name):", emp_response)
-        if not emp_response.data:
-            raise HTTPException(status_code=404, detail="Employé non trouvé.")
-        folder_name = emp_response.data['employee_folder_name']
-
-        path_to_file = f"{folder_name}/contrat.pdf"
-
-        # Vérifier si le fichier existe avant de générer l'URL
-        print(f"DEBUG: Vérification de l'existence du fichier '{path_to_file}' dans le bucket 'contrats'.")
-        files_in_folder = supabase.storage.from_("contrats").list(folder_name)
-        if not any(f['name'] == 'contrat.pdf' for f in files_in_folder):
+        folder_name = employee_overview.employee_folder_name(employee_id)
+        url = employee_overview.fetch_contract_url(folder_name)
+        if url is None:
             print(f"WARN: Le fichier contrat.pdf n'existe pas pour l'employé {employee_id}.")
-            return {"url": None}
-
-        print("DEBUG: Génération de l'URL signée...")
-        signed_url_response = supabase.storage.from_("contrats").create_signed_url(path_to_file, 3600)
-        print("DEBUG: URL signée générée avec succès.")
-        return {"url": signed_url_response['signedURL']}
+        return {"url": url}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ERROR: Exception dans get_employee_contract_url pour l'ID {employee_id}:")
         traceback.print_exc()
@@ -0,0 +1,76 @@
+# backend_api/api/routers/jobs.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Header, HTTPException
+
+from schemas.job import Job, JobBatch, PayrollEventsJobRequest
+from schemas.payslip import PayslipBatchRequest
+from services import employee_overview, job_queue, signed_urls
+
+router = APIRouter(
+    prefix="/api/jobs",
+    tags=["Jobs"]
+)
+
+# Les travaux sont exécutés par worker.py ; ces routes ne font qu'enregistrer et consulter.
+# Le client (X-Tenant-ID) sert à la limite de travaux simultanés et au filtrage des listes.
+#
+# Les workers écrivent hors du processus de l'API : ses caches en mémoire (aperçu salarié, liens
+# signés) ne voient pas ces écritures. Ils sont invalidés ici, la première fois que l'API lit un
+# travail terminé (GET /api/jobs/{id} ou la liste). Sans cette lecture, ou dans un autre processus
+# de l'API, l'aperçu reste périmé au plus EMPLOYEE_OVERVIEW_TTL_SECONDS.
+
+# Travaux terminés déjà pris en compte (bornés : les plus anciens sont oubliés)
+_applied: "OrderedDict[str, None]" = OrderedDict()
+_applied_lock = threading.Lock()
+MAX_APPLIED = 10000
+
+
+def _invalidate_caches(job: Dict[str, Any]) -> Dict[str, Any]:
+    """ Invalide les caches touchés par un travail réussi, une seule fois par travail. """
+    if job["status"] != "succeeded":
+        return job
+    with _applied_lock:
+        if job["id"] in _applied:
+            return job
+        _applied[job["id"]] = None
+        while len(_applied) > MAX_APPLIED:
+            _applied.popitem(last=False)
+    storage_path = (job.get("result") or {}).get("storage_path")
+    if job["kind"] == "payslip" and storage_path:
+        signed_urls.record_upload("payslips", storage_path)
+    employee_id = (job.get("payload") or {}).get("employee_id")
+    if employee_id:
+        employee_overview.invalidate(employee_id)
+    return job
+
+
+@router.post("/payslips", response_model=JobBatch, status_code=202)
+def enqueue_payslips(request: PayslipBatchRequest, force: bool = False, x_tenant_id: Optional[str] = Header(None)):
+    """ Met en file la génération des bulletins du mois, un travail par salarié ; répond sans attendre. """
+    return {"jobs": job_queue.enqueue_payslips(request.employee_ids, request.year, request.month, force, x_tenant_id)}
+
+
+@router.post("/payroll-events", response_model=Job, status_code=202)
+def enqueue_payroll_events(request: PayrollEventsJobRequest, x_tenant_id: Optional[str] = Header(None)):
+    """ Met en file le recalcul des événements de paie d'un salarié pour un mois. """
+    return job_queue.enqueue_payroll_events(request.employee_id, request.year, request.month, x_tenant_id)
+
+
+@router.get("", response_model=List[Job])
+def list_jobs(status: Optional[Literal["queued", "running", "succeeded", "failed"]] = None, kind: Optional[str] = None,
+              limit: int = 50, x_tenant_id: Optional[str] = Header(None)):
+    """ Travaux récents du client, les plus récents d'abord. """
+    jobs = job_queue.list_jobs(tenant=x_tenant_id or job_queue.DEFAULT_TENANT, status=status, kind=kind, limit=max(1, min(limit, 500)))
+    return [_invalidate_caches(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=Job)
+def get_job(job_id: str, x_tenant_id: Optional[str] = Header(None)):
+    """ Statut d'un travail, avec son résultat une fois terminé (ou la dernière erreur). """
+    job = job_queue.get(job_id)
+    if job is None or job["tenant"] != (x_tenant_id or job_queue.DEFAULT_TENANT):
+        raise HTTPException(status_code=404, detail="Travail non trouvé.")
+    return _invalidate_caches(job)
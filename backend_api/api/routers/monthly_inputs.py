@@ -1,18 +1,16 @@
 # backend_api/api/routers/monthly_inputs.py
 
-import os
+import asyncio
 import sys 
 import traceback
 import json
-from typing import List
-from fastapi import APIRouter, HTTPException, Request
+from typing import List, Literal, Optional
+from fastapi import APIRouter, File, Header, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
 
 from core.config import supabase, PATH_TO_PAYROLL_ENGINE
-from schemas.monthly_input import MonthlyInput, MonthlyInputCreate
-
-print("DEBUG ⛓️ PATH_TO_PAYROLL_ENGINE =", PATH_TO_PAYROLL_ENGINE)
-print("DEBUG 📁 Exists:", PATH_TO_PAYROLL_ENGINE.exists())
-print("DEBUG 🧾 Listing:", os.listdir(PATH_TO_PAYROLL_ENGINE) if PATH_TO_PAYROLL_ENGINE.exists() else "not found")
+from schemas.monthly_input import MonthlyInput, MonthlyInputCreate, MonthlyInputImportReport
+from services import monthly_input_import, monthly_inputs_cache, reference_data
 
 router = APIRouter(
     tags=["Monthly Inputs"]
@@ -21,13 +19,45 @@ router = APIRouter(
 
 @router.get("/api/monthly-inputs")
 def list_monthly_inputs(year: int, month: int):
-    """Retourne toutes les saisies ponctuelles du mois, tous salariés confondus"""
-    response = supabase.table('monthly_inputs') \
-        .select("*") \
-        .match({"year": year, "month": month}) \
-        .order("created_at", desc=True) \
-        .execute()
-    return response.data
+    """Retourne toutes les saisies ponctuelles du mois, tous salariés confondus (cache du mois)"""
+    return monthly_inputs_cache.list_month(year, month)
+
+
+# Intervalle des commentaires de maintien de connexion du flux SSE (secondes)
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/api/monthly-inputs/events")
+async def monthly_input_events(request: Request, year: int, month: int, last_event_id: Optional[int] = Header(None)):
+    """
+    Flux SSE des changements de saisies du mois. Sans Last-Event-ID, le flux commence par un
+    événement "snapshot" (toutes les saisies du mois) ; ensuite "upsert" (lignes), "delete" (ids)
+    et "reset" (recharger le mois). Après une reconnexion, les événements manqués sont rejoués.
+    """
+    loop, queue, scope, missed = monthly_inputs_cache.subscribe(year, month, last_event_id)
+
+    async def stream():
+        try:
+            if last_event_id is None:
+                rows = await asyncio.to_thread(monthly_inputs_cache.list_month, year, month)
+                yield _sse({"id": monthly_inputs_cache.current_version(), "type": "snapshot", "year": year, "month": month, "rows": rows})
+            for event in missed:
+                yield _sse(event)
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+        finally:
+            monthly_inputs_cache.unsubscribe(loop, queue, scope)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @router.post("/api/monthly-inputs", status_code=201)
 def create_monthly_inputs(payload: List[MonthlyInput]):
@@ -54,6 +84,7 @@ def create_monthly_inputs(payload: List[MonthlyInput]):
 
         print("\n3. Envoi à Supabase...", file=sys.stderr)
         response = supabase.table("monthly_inputs").insert(data_to_insert).execute()
+        monthly_inputs_cache.apply_upsert(response.data)
         
         print("\n4. Réponse de Supabase reçue.", file=sys.stderr)
         return {"status": "success", "inserted": len(response.data)}
@@ -65,10 +96,36 @@ def create_monthly_inputs(payload: List[MonthlyInput]):
     
 
 
+@router.post("/api/monthly-inputs/import", response_model=MonthlyInputImportReport)
+def import_monthly_inputs(
+    file: UploadFile = File(...),
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    format: Optional[Literal["csv", "json"]] = None,
+    dry_run: bool = False,
+):
+    """
+    Importe des saisies en masse depuis un fichier CSV ou JSON (tableau ou JSON Lines), lu au fil
+    de l'eau. Colonnes : employee_id ou employee_folder_name, name (libellé ou identifiant du
+    catalogue de primes), amount, et facultativement year, month (sinon ceux de la requête),
+    description, is_socially_taxed, is_taxable. Les lignes valides sont écrites en upsert sur
+    (salarié, année, mois, nom) ; les autres sont renvoyées avec leurs erreurs.
+    `dry_run=true` valide sans rien écrire.
+    """
+    try:
+        file_format = format or monthly_input_import.detect_format(file.filename, file.content_type)
+        return monthly_input_import.import_monthly_inputs(file.file, file_format, year, month, dry_run)
+    except Exception as e:
+        print("❌ ERREUR dans import_monthly_inputs :", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/api/monthly-inputs/{input_id}")
 def delete_monthly_input(input_id: str):
     """Supprime une saisie ponctuelle"""
-    supabase.table('monthly_inputs').delete().eq("id", input_id).execute()
+    response = supabase.table('monthly_inputs').delete().eq("id", input_id).execute()
+    monthly_inputs_cache.apply_delete(response.data or [{"id": input_id}])
     return {"status": "success"}
 
 
@@ -78,14 +135,7 @@ def get_employee_monthly_inputs(employee_id: str, year: int, month: int):
     """
     Retourne toutes les saisies ponctuelles (prime, acompte, etc.) pour un employé donné.
     """
-    response = (
-        supabase.table("monthly_inputs")
-        .select("*")
-        .match({"employee_id": employee_id, "year": year, "month": month})
-        .order("created_at", desc=True)
-        .execute()
-    )
-    return response.data or []
+    return monthly_inputs_cache.list_employee(employee_id, year, month)
 
 
 # --- Création d'une ou plusieurs saisies pour un employé ---
@@ -104,6 +154,7 @@ def create_employee_monthly_inputs(employee_id: str, prime_data: MonthlyInputCre
         # --- FIN DE L'ESPION ---
 
         response = supabase.table("monthly_inputs").insert(data_to_insert).execute()
+        monthly_inputs_cache.apply_upsert(response.data)
 
         print("✅ Insertion réussie.")
         return {"status": "success", "inserted_data": response.data[0]}
@@ -118,24 +169,30 @@ def create_employee_monthly_inputs(employee_id: str, prime_data: MonthlyInputCre
 def delete_employee_monthly_input(employee_id: str, input_id: str):
     """Supprime une saisie ponctuelle pour un employé donné"""
     try:
-        supabase.table("monthly_inputs").delete().eq("id", input_id).eq("employee_id", employee_id).execute()
+        response = supabase.table("monthly_inputs").delete().eq("id", input_id).eq("employee_id", employee_id).execute()
+        monthly_inputs_cache.apply_delete(response.data or [])
         return {"status": "success"}
     except Exception as e:
         print("❌ Erreur delete_employee_monthly_input :", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+CHEMIN_PRIMES = PATH_TO_PAYROLL_ENGINE / "data" / "primes.json"
+
+
+def _construire_primes_catalogue():
+    primes_data = json.loads(CHEMIN_PRIMES.read_text(encoding="utf-8"))
+    return primes_data.get("primes", [])
+
+
+reference_data.register("primes-catalogue", lambda: [CHEMIN_PRIMES], _construire_primes_catalogue)
+
+
 @router.get("/api/primes-catalogue")
-def get_primes_catalogue():
-    """Lit et retourne le contenu du fichier primes.json."""
-    import traceback
+def get_primes_catalogue(request: Request):
+    """Retourne le contenu du fichier primes.json (réponse en cache, ETag / 304)."""
     try:
-        primes_path = PATH_TO_PAYROLL_ENGINE / "data" / "primes.json"
-        print(f"DEBUG lecture fichier: {primes_path} | exists={primes_path.exists()}")
-        raw = primes_path.read_text(encoding="utf-8")
-        print(f"DEBUG taille={len(raw)} premiers_caractères={raw[:80]!r}")
-        primes_data = json.loads(raw)
-        print("DEBUG JSON chargé avec succès")
-        return primes_data.get("primes", [])
+        return reference_data.respond(request, "primes-catalogue")
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"{type(e).__name__}: {e}")
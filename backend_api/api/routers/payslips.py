@@ -1,61 +1,109 @@
 # backend_api/api/routers/payslips.py
 
+import io
 import json
 import traceback
 import requests
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 
 from core.config import supabase, supabase_url, supabase_key
-from schemas.payslip import PayslipRequest, PayslipInfo
-from services.payslip_generator import process_payslip_generation
+from schemas.job import JobBatch
+from schemas.payslip import PayslipBatchRequest, PayslipRequest, PayslipInfo
+from services import employee_overview, job_queue, profiler, signed_urls
+from services.payslip_generator import render_if_changed, store_payslip_upload_later, stored_pdf_bytes
+from utils.zip_stream import stream_zip
 
 router = APIRouter(
     tags=["Payslips"]
 )
 
-@router.post("/api/actions/generate-payslip")
-def generate_payslip(request: PayslipRequest):
-    """ Déclenche le service de génération de fiche de paie. """
-    return process_payslip_generation(
-        employee_id=request.employee_id,
-        year=request.year,
-        month=request.month
+@router.post("/api/actions/generate-payslip", status_code=202)
+def generate_payslip(request: PayslipRequest, stream: bool = False, force: bool = False, x_tenant_id: Optional[str] = Header(None)):
+    """
+    Met en file la génération de la fiche de paie (worker.py) et répond tout de suite (202) avec le
+    travail, à suivre sur GET /api/jobs/{id} ; son résultat porte le lien de téléchargement. Un
+    bulletin dont les entrées n'ont pas changé n'est pas recalculé, sauf `?force=true`.
+    Avec `?stream=true`, le PDF est le corps de la réponse : il est donc généré pendant la requête
+    (200). Le bulletin et les cumuls sont enregistrés en BDD avant la réponse, seul l'envoi du PDF
+    dans le stockage se poursuit en arrière-plan.
+    """
+    if not stream:
+        return job_queue.enqueue_payslips([request.employee_id], request.year, request.month, force, x_tenant_id)[0]
+    with profiler.profile_if_slow("generate-payslip"):
+        rendered = render_if_changed(request.employee_id, request.year, request.month, force)
+    if rendered["up_to_date"]:
+        try:
+            pdf_bytes = stored_pdf_bytes(rendered)
+        except Exception as e:
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=f"Bulletin à jour introuvable dans le stockage : {e}")
+    else:
+        pdf_bytes = rendered["pdf_bytes"]
+        store_payslip_upload_later(rendered)
+    return StreamingResponse(
+        io.BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{rendered["pdf_name"]}"', "X-Payslip-Status": "up_to_date" if rendered["up_to_date"] else "generated"},
+    )
+
+@router.post("/api/actions/generate-payslips", response_model=JobBatch, status_code=202)
+def generate_payslips(request: PayslipBatchRequest, force: bool = False, x_tenant_id: Optional[str] = Header(None)):
+    """
+    Met en file les bulletins de plusieurs salariés pour un mois, un travail par salarié (202).
+    Le résultat de chaque travail indique s'il a été généré ("success") ou était déjà à jour
+    ("up_to_date" : entrées inchangées, non recalculé sauf `?force=true`).
+    """
+    return {"jobs": job_queue.enqueue_payslips(request.employee_ids, request.year, request.month, force, x_tenant_id)}
+
+@router.post("/api/actions/generate-payslips/zip")
+def generate_payslips_zip(request: PayslipBatchRequest, force: bool = False):
+    """
+    Génère les bulletins de plusieurs salariés et les renvoie dans une archive ZIP construite au fil
+    des générations (pendant la requête : l'archive est le corps de la réponse) ; chaque bulletin est enregistré en BDD avant d'être ajouté à l'archive, seul
+    l'envoi de son PDF dans le stockage se poursuit en arrière-plan. Les bulletins à jour sont repris
+    du stockage et listés dans A_JOUR.txt ; les échecs sont listés dans ERREURS.txt plutôt que
+    d'interrompre l'archive.
+    """
+    def entries():
+        up_to_date, errors = [], []
+        for employee_id in dict.fromkeys(request.employee_ids):
+            try:
+                rendered = render_if_changed(employee_id, request.year, request.month, force)
+                if rendered["up_to_date"]:
+                    pdf_bytes = stored_pdf_bytes(rendered)
+                    up_to_date.append(rendered["pdf_name"])
+                    yield rendered["pdf_name"], pdf_bytes
+                    continue
+            except HTTPException as e:
+                errors.append(f"{employee_id} : {e.detail}")
+                continue
+            except Exception as e:
+                errors.append(f"{employee_id} : {e}")
+                continue
+            try:
+                store_payslip_upload_later(rendered)
+            except Exception as e:
+                errors.append(f"{employee_id} : bulletin non enregistré ({e})")
+            yield rendered["pdf_name"], rendered["pdf_bytes"]
+        if up_to_date:
+            yield "A_JOUR.txt", "\n".join(up_to_date).encode("utf-8")
+        if errors:
+            yield "ERREURS.txt", "\n".join(errors).encode("utf-8")
+
+    archive_name = f"Bulletins_{request.month:02d}-{request.year}.zip"
+    return StreamingResponse(
+        stream_zip(entries()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'},
     )
 
 @router.get("/api/employees/{employee_id}/payslips", response_model=List[PayslipInfo])
 def get_employee_payslips(employee_id: str):
     """ Récupère la liste des bulletins générés pour un salarié. """
     try:
-        payslips_db = supabase.table('payslips').select("id, month, year, pdf_storage_path").eq('employee_id', employee_id).execute().data
-        if not payslips_db:
-            return []
-
-        paths_to_sign = [p['pdf_storage_path'] for p in payslips_db if p.get('pdf_storage_path')]
-        if not paths_to_sign:
-            return []
-
-        # Générer les URLs de téléchargement en une seule fois
-        signed_urls_response = supabase.storage.from_("payslips").create_signed_urls(paths_to_sign, 3600, options={'download': True})
-
-        if isinstance(signed_urls_response, dict) and signed_urls_response.get('error'):
-            raise Exception(f"Erreur Supabase Storage: {signed_urls_response.get('message')}")
-
-        url_map = {path: url['signedURL'] for path, url in zip(paths_to_sign, signed_urls_response) if url.get('signedURL')}
-
-        response_data = []
-        for p in payslips_db:
-            storage_path = p.get('pdf_storage_path')
-            if storage_path in url_map:
-                file_name = storage_path.split('/')[-1]
-                response_data.append({
-                    "id": p['id'],
-                    "name": file_name,
-                    "month": p['month'],
-                    "year": p['year'],
-                    "url": url_map[storage_path]
-                })
-        return response_data
+        return employee_overview.fetch_payslips(employee_id)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -65,7 +113,7 @@ def delete_payslip(payslip_id: str):
     """ Supprime un bulletin de paie de la BDD et du stockage. """
     try:
         # 1. Récupérer le chemin du fichier PDF avant de supprimer l'entrée de la BDD
-        payslip_to_delete = supabase.table('payslips').select("pdf_storage_path").eq('id', payslip_id).single().execute().data
+        payslip_to_delete = supabase.table('payslips').select("employee_id, pdf_storage_path").eq('id', payslip_id).single().execute().data
         
         # 2. Supprimer l'entrée de la base de données
         supabase.table('payslips').delete().eq('id', payslip_id).execute()
@@ -75,6 +123,9 @@ def delete_payslip(payslip_id: str):
             path = payslip_to_delete['pdf_storage_path']
             # Le nom du bucket doit être correct, ici "payslips"
             supabase.storage.from_('payslips').remove([path])
+            signed_urls.record_removal('payslips', path)
+        if payslip_to_delete:
+            employee_overview.invalidate(payslip_to_delete.get('employee_id'))
             
         return # FastAPI renverra automatiquement un statut 204 No Content
 
@@ -94,10 +145,7 @@ def debug_storage_file(employee_id: str, year: int, month: int):
         print(f"\n--- DÉBOGAGE ULTIME POUR {employee_id} - {month}/{year} ---")
 
         # Récupérer le nom du dossier de l'employé
-        emp_response = supabase.table('employees').select("employee_folder_name").eq('id', employee_id).single().execute()
-        if not emp_response.data:
-            raise HTTPException(status_code=404, detail="Employé non trouvé.")
-        folder_name = emp_response.data['employee_folder_name']
+        folder_name = employee_overview.employee_folder_name(employee_id)
 
         # Reconstruire le chemin du fichier dans le stockage
         pdf_name = f"Bulletin_{folder_name}_{month:02d}-{year}.pdf"
@@ -1,42 +1,92 @@
 # backend_api/api/routers/schedules.py
 
-import json
 import traceback
-import sys
-from datetime import date
-from fastapi import APIRouter, HTTPException
+from typing import Literal, Optional
+from fastapi import APIRouter, Header, HTTPException
 
-from core.config import supabase, PATH_TO_PAYROLL_ENGINE
-from schemas.schedule import (CalendarResponse, PlannedCalendarRequest, ActualHoursRequest)
-from services import payroll_analyzer
+from core.config import supabase
+from schemas.schedule import (CalendarResponse, PlannedCalendarRequest, ActualHoursRequest,
+                              CalendarBatchResponse, CalendarBatchUpdate)
+from schemas.job import Job
+from services import calendar_batch, job_queue, payroll_events
 
 router = APIRouter(
     prefix="/api/employees/{employee_id}",
     tags=["Schedules & Calendars"]
 )
 
-@router.get("/calendar-data", response_model=CalendarResponse)
-def get_employee_calendar(employee_id: str, year: int, month: int):
-    """ Récupère les heures prévues et réelles pour le calendrier d'un salarié. """
+# Calendriers de plusieurs salariés et plusieurs mois (vues d'équipe)
+batch_router = APIRouter(
+    prefix="/api/schedules",
+    tags=["Schedules & Calendars"]
+)
+
+
+@batch_router.get("/calendars", response_model=CalendarBatchResponse, response_model_exclude_none=True)
+def get_calendars(employee_ids: str, start: str, end: Optional[str] = None,
+                  kinds: str = "planned,actual", encoding: Literal["compact", "full"] = "compact"):
+    """
+    Calendriers prévus et/ou réels (`kinds`) des salariés `employee_ids` (séparés par des
+    virgules) de `start` à `end` inclus (AAAA-MM), en une seule lecture. En encodage compact,
+    chaque (salarié, mois) porte un tableau d'heures par jour et des indices dans `type_codes`.
+    """
+    ids = list(dict.fromkeys(i.strip() for i in employee_ids.split(",") if i.strip()))
+    kind_list = [k.strip() for k in kinds.split(",") if k.strip()]
+    try:
+        first = calendar_batch.parse_period(start)
+        last = calendar_batch.parse_period(end) if end else first
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start et end attendus au format AAAA-MM.")
+    months = calendar_batch.month_range(first, last)
+    if not ids or len(ids) > calendar_batch.MAX_EMPLOYEES:
+        raise HTTPException(status_code=400, detail=f"Entre 1 et {calendar_batch.MAX_EMPLOYEES} salariés par requête.")
+    if not months or len(months) > calendar_batch.MAX_MONTHS:
+        raise HTTPException(status_code=400, detail=f"Entre 1 et {calendar_batch.MAX_MONTHS} mois par requête.")
+    if not kind_list or any(k not in ("planned", "actual") for k in kind_list):
+        raise HTTPException(status_code=400, detail="kinds : 'planned' et/ou 'actual'.")
     try:
-        emp_response = supabase.table('employees').select("employee_folder_name").eq('id', employee_id).single().execute()
-        if not emp_response.data:
-            raise HTTPException(status_code=404, detail="Employé non trouvé.")
-        folder_name = emp_response.data['employee_folder_name']
+        return calendar_batch.read_batch(ids, first, last, kind_list, compact=(encoding == "compact"))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Erreur interne: {str(e)}")
 
-        employee_path = PATH_TO_PAYROLL_ENGINE / "data" / "employes" / folder_name
 
-        # Charger les heures prévues
-        planned_path = employee_path / "calendriers" / f"{month:02d}.json"
-        planned_data = []
-        if planned_path.exists():
-            planned_data = json.loads(planned_path.read_text(encoding="utf-8")).get('calendrier_prevu', [])
+@batch_router.put("/calendars", status_code=200)
+def update_calendars(payload: CalendarBatchUpdate):
+    """
+    Enregistre en un upsert les calendriers de plusieurs (salarié, mois). Chaque entrée fournit
+    `planned` / `actual` (compacts, indices dans `type_codes`) ou `calendrier_prevu` /
+    `calendrier_reel` ; un calendrier absent de l'entrée n'est pas modifié.
+    """
+    if len(payload.entries) > calendar_batch.MAX_EMPLOYEES * calendar_batch.MAX_MONTHS:
+        raise HTTPException(status_code=400, detail="Trop d'entrées dans la requête.")
+    for entry in payload.entries:
+        if not 1 <= entry.month <= 12:
+            raise HTTPException(status_code=400, detail=f"Mois invalide : {entry.month}.")
+    try:
+        written = calendar_batch.write_batch([e.model_dump() for e in payload.entries], payload.type_codes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    for employee_id, year, month in written:
+        payroll_events.schedule(employee_id, year, month)
+    return {"status": "success", "message": f"{len(written)} calendrier(s) enregistré(s)."}
 
-        # Charger les heures réelles
-        actual_path = employee_path / "horaires" / f"{month:02d}.json"
-        actual_data = []
-        if actual_path.exists():
-            actual_data = json.loads(actual_path.read_text(encoding="utf-8")).get('calendrier_reel', [])
+@router.get("/calendar-data", response_model=CalendarResponse)
+def get_employee_calendar(employee_id: str, year: int, month: int):
+    """ Récupère les heures prévues et réelles pour le calendrier d'un salarié (table employee_schedules). """
+    try:
+        response = supabase.table('employee_schedules').select("planned_calendar, actual_hours") \
+            .match({'employee_id': employee_id, 'year': year, 'month': month}) \
+            .maybe_single().execute()
+        row = response.data if response else None
+
+        planned_data = [{"day": e['jour'], "type": e.get('type') or "", "hours": e.get('heures_prevues')}
+                        for e in calendar_batch.entries_of(row, "planned")]
+        actual_data = [{"day": e['jour'], "type": e.get('type') or "", "hours": e.get('heures_faites')}
+                       for e in calendar_batch.entries_of(row, "actual")]
 
         return {"planned": planned_data, "actual": actual_data}
     except Exception as e:
@@ -89,6 +139,7 @@ def update_planned_calendar(employee_id: str, payload: PlannedCalendarRequest):
             "month": payload.month,
             "planned_calendar": json_content
         }, on_conflict="employee_id, year, month").execute()
+        payroll_events.schedule(employee_id, payload.year, payload.month)
 
         return {"status": "success", "message": "Planning prévisionnel enregistré."}
     except Exception as e:
@@ -140,6 +191,7 @@ def update_actual_hours(employee_id: str, payload: ActualHoursRequest):
             "month": payload.month,
             "actual_hours": json_content
         }, on_conflict="employee_id, year, month").execute()
+        payroll_events.schedule(employee_id, payload.year, payload.month)
 
         return {"status": "success", "message": "Heures réelles enregistrées."}
     except Exception as e:
@@ -148,95 +200,16 @@ def update_actual_hours(employee_id: str, payload: ActualHoursRequest):
 
 
 
-@router.post("/calculate-payroll-events", status_code=200)
-def calculate_payroll_events(employee_id: str, request_body: dict):
+@router.post("/calculate-payroll-events", response_model=Job, status_code=202)
+def calculate_payroll_events(employee_id: str, request_body: dict, x_tenant_id: Optional[str] = Header(None)):
     """
-    Déclenche le calcul des événements de paie pour un employé sur une période donnée.
+    Met en file le calcul des événements de paie d'un employé pour un mois et répond tout de suite
+    (202) avec le travail, à suivre sur GET /api/jobs/{id}. Le worker ne réanalyse que les semaines
+    modifiées depuis le dernier résultat.
     """
     try:
         year = int(request_body.get('year'))
         month = int(request_body.get('month'))
-
-        print(f"\n--- Début du calcul de paie pour l'employé {employee_id} ({month}/{year}) ---", file=sys.stderr)
-
-        # 1. Récupération des données du contrat
-        employee_res = supabase.table('employees').select("employee_folder_name, duree_hebdomadaire").eq('id', employee_id).single().execute()
-        if not employee_res.data:
-            raise HTTPException(status_code=404, detail="Employé non trouvé.")
-        employee_name = employee_res.data['employee_folder_name']
-        duree_hebdo = employee_res.data.get('duree_hebdomadaire')
-        if not duree_hebdo:
-            raise HTTPException(status_code=400, detail="La durée hebdomadaire du contrat n'est pas définie.")
-
-        # 2. Récupération des horaires (M-1, M, M+1)
-        dates_to_process = []
-        for i in [-1, 0, 1]:
-            d = date(year, month, 15)
-            target_month, target_year = (d.month + i, d.year)
-            if target_month == 0: target_month, target_year = (12, target_year - 1)
-            elif target_month == 13: target_month, target_year = (1, target_year + 1)
-            dates_to_process.append({'year': target_year, 'month': target_month})
-        
-        schedule_res = supabase.table('employee_schedules').select("year, month, planned_calendar, actual_hours") \
-            .eq('employee_id', employee_id) \
-            .in_('year', [d['year'] for d in dates_to_process]) \
-            .in_('month', [d['month'] for d in dates_to_process]) \
-            .execute()
-
-        ### ESPION 1 : VÉRIFIE LES DONNÉES BRUTES REÇUES DE SUPABASE ###
-        print("\n" + "="*20 + " ESPION 1 : DONNÉES BRUTES DE SUPABASE " + "="*20)
-        # Utilise json.dumps pour un affichage propre, en gérant les erreurs si l'objet n'est pas sérialisable
-        try:
-            print(json.dumps(schedule_res.data, indent=2))
-        except TypeError:
-            print(schedule_res.data)
-        print("="*67 + "\n")
-        
-        print(f"-> Données de {len(schedule_res.data)} mois récupérées depuis Supabase.", file=sys.stderr)
-
-        # 3. Préparation et enrichissement des données
-        db_data_map = {(row['year'], row['month']): row for row in schedule_res.data}
-        planned_data_all_months, actual_data_all_months = [], []
-        for date_info in dates_to_process:
-            y, m = date_info['year'], date_info['month']
-            db_row = db_data_map.get((y, m))
-            if db_row:
-                planned_list = (db_row.get('planned_calendar') or {}).get('calendrier_prevu', [])
-                actual_list = (db_row.get('actual_hours') or {}).get('calendrier_reel', [])
-                for entry in planned_list: entry.update({'annee': y, 'mois': m})
-                for entry in actual_list: entry.update({'annee': y, 'mois': m})
-                planned_data_all_months.extend(planned_list)
-                actual_data_all_months.extend(actual_list)
-        
-        ### ESPION 2 : VÉRIFIE LES DONNÉES PRÊTES POUR L'ANALYSE (DÉJÀ EN PLACE) ###
-        print("\n" + "="*20 + " ESPION 2 : DONNÉES PRÊTES POUR L'ANALYSEUR " + "="*20)
-        print("Contenu de la variable 'planned_data_all_months' :")
-        print(json.dumps(planned_data_all_months, indent=2))
-        print("="*75 + "\n")
-
-
-        # --- 4. Appel de l'analyseur avec les données prêtes ---
-        payroll_events_list = payroll_analyzer.analyser_horaires_du_mois(
-            planned_data_all_months=planned_data_all_months,
-            actual_data_all_months=actual_data_all_months,
-            duree_hebdo_contrat=duree_hebdo,
-            annee=year,
-            mois=month,
-            employee_name=employee_name
-        )
-        print(f"-> Analyse terminée : {len(payroll_events_list)} événements de paie générés.", file=sys.stderr)
-
-        # --- 5. Sauvegarde du résultat ---
-        result_json = {"periode": {"annee": year, "mois": month}, "calendrier_analyse": payroll_events_list}
-        supabase.table('employee_schedules').update({"payroll_events": result_json}) \
-            .match({'employee_id': employee_id, 'year': year, 'month': month}) \
-            .execute()
-        print(f"-> Résultat sauvegardé avec succès.", file=sys.stderr)
-
-        return {"status": "success", "message": f"{len(payroll_events_list)} événements de paie calculés."}
-
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
-    
-    
\ No newline at end of file
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="year et month requis (entiers).")
+    return job_queue.enqueue_payroll_events(employee_id, year, month, x_tenant_id)
@@ -7,6 +7,8 @@ from supabase import create_client, Client
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from services import metrics
+
 # --- Chargement des variables d'environnement ---
 load_dotenv()
 
@@ -34,6 +36,8 @@ supabase_key = os.getenv("SUPABASE_KEY")
 if not supabase_url or not supabase_key:
     raise RuntimeError("Variables d'environnement SUPABASE manquantes.")
 supabase: Client = create_client(supabase_url, supabase_key)
+# Durées et nombre d'appels Supabase, exposés par /metrics et l'en-tête Server-Timing
+metrics.instrument_supabase()
 
 # --- Constantes ---
 # Chemin vers le fichier actuel (main.py)
@@ -1,8 +1,11 @@
 # backend_api/main.py
 
+import time
 from fastapi import Request, HTTPException
+from fastapi.responses import PlainTextResponse
 from core.config import app
-from api.routers import employees, dashboard, payslips, schedules, monthly_inputs, auth
+from api.routers import employees, dashboard, payslips, schedules, monthly_inputs, jobs, auth
+from services import metrics, monthly_inputs_cache, profiler
 
 print("--- LECTURE DU FICHIER main.py (POINT D'ENTRÉE) ---")
 
@@ -11,15 +14,57 @@ app.include_router(employees.router)
 app.include_router(dashboard.router)
 app.include_router(payslips.router)
 app.include_router(schedules.router)
+app.include_router(schedules.batch_router)
 app.include_router(monthly_inputs.router)
+app.include_router(jobs.router)
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 
 
+@app.on_event("startup")
+async def subscribe_monthly_inputs():
+    """ Abonnement Realtime du cache des saisies (sans effet bloquant en cas d'échec). """
+    await monthly_inputs_cache.start_realtime()
+
+
+@app.middleware("http")
+async def request_id(request: Request, call_next):
+    """ Identifiant de requête (X-Request-ID), repris dans le nom des profils de requêtes lentes. """
+    token = profiler.new_request_id(request.headers.get("x-request-id"))
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = profiler.current_request_id()
+        return response
+    finally:
+        profiler.reset_request_id(token)
+
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """ Mesure chaque requête et renvoie le détail de ses étapes dans l'en-tête Server-Timing. """
+    if not metrics.ENABLED:
+        return await call_next(request)
+    token = metrics.begin_request()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_metrics = metrics.end_request(token)
+    total = time.perf_counter() - start
+    metrics.observe("request", total)
+    response.headers["Server-Timing"] = metrics.server_timing_header(request_metrics, total)
+    return response
+
+
 @app.get("/")
 def read_root():
     """ Point de terminaison racine pour vérifier que l'API est en ligne. """
     return {"message": "API du SaaS RH fonctionnelle !"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """ Métriques du processus au format texte Prometheus. """
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.post("/api/test-cors")
 async def test_cors_endpoint(request: Request):
     """ Point de terminaison pour tester la configuration CORS. """
@@ -2,7 +2,9 @@
 
 from pydantic import BaseModel
 from datetime import date
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from schemas.payslip import PayslipInfo
 
 class FullEmployee(BaseModel):
     id: str
@@ -56,4 +58,31 @@ class NewFullEmployee(BaseModel):
     elements_variables: Dict[str, Any] | None = None
     avantages_en_nature: Dict[str, Any] | None = None
     # Spécificités
-    specificites_paie: Dict[str, Any]
\ No newline at end of file
+    specificites_paie: Dict[str, Any]
+
+class EmployeeListItem(BaseModel):
+    """ Projection légère d'un salarié pour les listes (sans les colonnes JSON du contrat). """
+    id: str
+    employee_folder_name: str | None = None
+    first_name: str
+    last_name: str
+    job_title: str | None = None
+    contract_type: str | None = None
+    statut: str | None = None
+    hire_date: date | None = None
+
+class EmployeeListPage(BaseModel):
+    items: List[EmployeeListItem]
+    # Nombre total de salariés correspondant aux filtres (toutes pages confondues), première page seulement
+    total: int | None = None
+    # Curseur opaque de la page suivante (None sur la dernière page)
+    next_cursor: str | None = None
+
+class EmployeeOverview(BaseModel):
+    """ Vue agrégée de la page salarié : fiche, bulletins, contrat et saisies du mois. """
+    employee: FullEmployee
+    payslips: List[PayslipInfo]
+    contract_url: str | None = None
+    year: int
+    month: int
+    monthly_inputs: List[Dict[str, Any]]
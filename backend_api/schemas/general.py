@@ -9,11 +9,25 @@ class ContributionRate(BaseModel):
     salarial: float | dict | str | None = None
     patronal: float | dict | str | None = None
     status: str
+    bareme: str | None = None
+    last_scraped: str | None = None
 
 class DashboardRatesResponse(BaseModel):
     rates: List[ContributionRate]
     last_check: str | None = None
 
+class BaremeFreshness(BaseModel):
+    bareme: str
+    fichier: str | None = None
+    status: str
+    slo_heures: float | None = None
+    derniere_tentative: str | None = None
+    derniere_reussite: str | None = None
+    prochaine_execution: str | None = None
+    echecs_consecutifs: int = 0
+    latence_moyenne_30j: float | None = None
+    ecarts_30j: int = 0
+
 class PayrollEventsResponse(BaseModel):
     status: str
     events_count: int
\ No newline at end of file
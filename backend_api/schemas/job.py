@@ -0,0 +1,28 @@
+# backend_api/schemas/job.py
+
+from pydantic import BaseModel
+from typing import Any, List
+
+class Job(BaseModel):
+    id: str
+    kind: str
+    tenant: str
+    # "queued", "running", "succeeded" ou "failed"
+    status: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    run_after: str | None = None
+    result: Any = None
+    error: str | None = None
+    created_at: str
+    started_at: str | None = None
+    finished_at: str | None = None
+
+class JobBatch(BaseModel):
+    jobs: List[Job]
+
+class PayrollEventsJobRequest(BaseModel):
+    employee_id: str
+    year: int
+    month: int
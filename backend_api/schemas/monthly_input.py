@@ -44,3 +44,18 @@ class MonthlyInputsRequest(BaseModel):
     primes: list[dict] = []
     notes_de_frais: list[dict] = []
     acompte: Optional[float] = None
+
+
+# --- Bilan de l'import en masse (POST /api/monthly-inputs/import) ---
+class MonthlyInputImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class MonthlyInputImportReport(BaseModel):
+    received: int
+    valid: int
+    imported: int
+    duplicates: int
+    error_count: int
+    errors: List[MonthlyInputImportError]
+    dry_run: bool = False
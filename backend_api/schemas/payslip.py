@@ -1,6 +1,7 @@
 # backend_api/schemas/payslip.py
 
 from pydantic import BaseModel
+from typing import List
 
 class PayslipRequest(BaseModel):
     employee_id: str
@@ -15,4 +16,9 @@ class PayslipInfo(BaseModel):
     name: str
     month: int
     year: int
-    url: str
\ No newline at end of file
+    url: str
+
+class PayslipBatchRequest(BaseModel):
+    employee_ids: List[str]
+    year: int
+    month: int
@@ -31,3 +31,30 @@ class ActualHoursRequest(BaseModel):
     year: int
     month: int
     calendrier_reel: List[ActualHoursEntry]
+
+
+# --- Calendriers groupés (GET/PUT /api/schedules/calendars) ---
+class CompactCalendar(BaseModel):
+    # Indice 0 = le 1er du mois ; null = rien de saisi ce jour-là
+    hours: List[float | None]
+    # Indices dans type_codes de la réponse ou de la requête
+    types: List[int | None] | None = None
+
+class CalendarBatchEntry(BaseModel):
+    employee_id: str
+    year: int
+    month: int
+    # Encodage compact...
+    planned: CompactCalendar | None = None
+    actual: CompactCalendar | None = None
+    # ... ou listes par jour, comme les routes par salarié
+    calendrier_prevu: List[PlannedCalendarEntry] | None = None
+    calendrier_reel: List[ActualHoursEntry] | None = None
+
+class CalendarBatchResponse(BaseModel):
+    type_codes: List[str] | None = None
+    entries: List[CalendarBatchEntry]
+
+class CalendarBatchUpdate(BaseModel):
+    type_codes: List[str] = []
+    entries: List[CalendarBatchEntry]
@@ -0,0 +1,194 @@
+# backend_api/services/calendar_batch.py
+
+import calendar
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.config import supabase
+
+# Lecture et écriture groupées des calendriers (prévu et réel) de plusieurs salariés sur
+# plusieurs mois.
+#
+# Les routes par salarié et par mois coûtaient deux appels par salarié pour afficher le planning
+# d'une équipe. Ici, une seule lecture de employee_schedules couvre tous les (salarié, mois)
+# demandés, et l'écriture est un upsert groupé sur (employee_id, year, month).
+#
+# Encodage compact : pour un salarié et un mois, un tableau `hours` indexé par jour (indice 0 =
+# le 1er) et un tableau `types` d'indices dans `type_codes`, la liste des types de jour partagée
+# par toute la réponse ("travail", "weekend", ...). null = rien de saisi ce jour-là.
+
+MAX_EMPLOYEES = 200
+MAX_MONTHS = 24
+
+_Period = Tuple[int, int]
+
+# Colonne de employee_schedules, clé de la liste dans le JSON, clé des heures dans une entrée
+_KINDS = {
+    "planned": ("planned_calendar", "calendrier_prevu", "heures_prevues"),
+    "actual": ("actual_hours", "calendrier_reel", "heures_faites"),
+}
+
+
+def parse_period(value: str) -> _Period:
+    """ "2024-03" -> (2024, 3) ; ValueError si le mois est invalide. """
+    year, _, month = value.strip().partition("-")
+    period = (int(year), int(month))
+    if not 1 <= period[1] <= 12:
+        raise ValueError(f"mois invalide : {value!r}")
+    return period
+
+
+def month_range(start: _Period, end: _Period) -> List[_Period]:
+    """ Mois de `start` à `end` inclus. """
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def period_filter(start: _Period, end: _Period) -> str:
+    """ Filtre PostgREST (syntaxe or=) des lignes dont (year, month) est dans l'intervalle. """
+    (y0, m0), (y1, m1) = start, end
+    if y0 == y1:
+        return f"and(year.eq.{y0},month.gte.{m0},month.lte.{m1})"
+    filters = [f"and(year.eq.{y0},month.gte.{m0})", f"and(year.eq.{y1},month.lte.{m1})"]
+    if y1 - y0 > 1:
+        filters.append(f"and(year.gt.{y0},year.lt.{y1})")
+    return ",".join(filters)
+
+
+def fetch_rows(employee_ids: List[str], start: _Period, end: _Period, kinds: Iterable[str]) -> List[Dict[str, Any]]:
+    """ Lignes de employee_schedules des salariés sur la période, en une seule lecture. """
+    columns = ", ".join(["employee_id", "year", "month"] + [_KINDS[k][0] for k in kinds])
+    response = supabase.table('employee_schedules').select(columns) \
+        .in_('employee_id', employee_ids) \
+        .or_(period_filter(start, end)) \
+        .execute()
+    return response.data or []
+
+
+def entries_of(row: Optional[Dict[str, Any]], kind: str) -> List[Dict[str, Any]]:
+    """ Liste `calendrier_prevu` / `calendrier_reel` stockée dans la ligne (vide si absente). """
+    column, list_key, _ = _KINDS[kind]
+    return ((row or {}).get(column) or {}).get(list_key) or []
+
+
+class _TypeCodes:
+    """ Table des types de jour d'une réponse compacte : chaque type reçoit un indice à sa première apparition. """
+
+    def __init__(self, codes: Optional[List[str]] = None):
+        self.codes: List[str] = list(codes or [])
+        self._index = {code: i for i, code in enumerate(self.codes)}
+
+    def encode(self, type_: Optional[str]) -> Optional[int]:
+        if type_ is None:
+            return None
+        if type_ not in self._index:
+            self._index[type_] = len(self.codes)
+            self.codes.append(type_)
+        return self._index[type_]
+
+    def decode(self, index: Optional[int]) -> Optional[str]:
+        if index is None:
+            return None
+        if not 0 <= index < len(self.codes):
+            raise ValueError(f"indice de type inconnu : {index}")
+        return self.codes[index]
+
+
+def encode_compact(entries: List[Dict[str, Any]], kind: str, year: int, month: int, type_codes: _TypeCodes) -> Dict[str, Any]:
+    """ Liste d'entrées par jour -> {"hours": [...], "types": [...]} sur tous les jours du mois. """
+    hours_key = _KINDS[kind][2]
+    days = calendar.monthrange(year, month)[1]
+    hours: List[Optional[float]] = [None] * days
+    types: List[Optional[int]] = [None] * days
+    for entry in entries:
+        day = entry.get('jour')
+        if isinstance(day, int) and 1 <= day <= days:
+            hours[day - 1] = entry.get(hours_key)
+            types[day - 1] = type_codes.encode(entry.get('type'))
+    # Sans aucun type (heures réelles saisies sans type), le tableau est omis.
+    return {"hours": hours, "types": types if any(t is not None for t in types) else None}
+
+
+def decode_compact(compact: Dict[str, Any], kind: str, year: int, month: int, type_codes: _TypeCodes) -> List[Dict[str, Any]]:
+    """
+    Inverse de encode_compact. Un jour sans type ni heures est omis ; un jour prévu avec des
+    heures mais sans type est un jour de "travail".
+    """
+    hours_key = _KINDS[kind][2]
+    days = calendar.monthrange(year, month)[1]
+    hours = compact.get("hours") or []
+    types = compact.get("types") or []
+    if len(hours) > days or len(types) > days:
+        raise ValueError(f"{kind} : plus de {days} jours pour {month:02d}/{year}")
+    entries = []
+    for i in range(max(len(hours), len(types))):
+        day_hours = hours[i] if i < len(hours) else None
+        day_type = type_codes.decode(types[i] if i < len(types) else None)
+        if day_type is None and day_hours is None:
+            continue
+        if day_type is None and kind == "planned":
+            day_type = "travail"
+        entries.append({"jour": i + 1, "type": day_type, hours_key: day_hours})
+    return entries
+
+
+def read_batch(employee_ids: List[str], start: _Period, end: _Period, kinds: List[str], compact: bool) -> Dict[str, Any]:
+    """
+    Calendriers des salariés sur la période : une entrée par (salarié, mois) demandé, même sans
+    ligne en base (calendrier vide), dans l'ordre des salariés puis des mois.
+    """
+    months = month_range(start, end)
+    rows = {(r['employee_id'], r['year'], r['month']): r for r in fetch_rows(employee_ids, start, end, kinds)}
+    type_codes = _TypeCodes()
+    result = []
+    for employee_id in employee_ids:
+        for year, month in months:
+            row = rows.get((employee_id, year, month))
+            item: Dict[str, Any] = {"employee_id": employee_id, "year": year, "month": month}
+            for kind in kinds:
+                entries = entries_of(row, kind)
+                if compact:
+                    item[kind] = encode_compact(entries, kind, year, month, type_codes)
+                else:
+                    item[_KINDS[kind][1]] = entries
+            result.append(item)
+    return {"type_codes": type_codes.codes if compact else None, "entries": result}
+
+
+def _stored(kind: str, year: int, month: int, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Même forme que les routes unitaires (update_planned_calendar / update_actual_hours)
+    return {"periode": {"mois": month, "annee": year}, _KINDS[kind][1]: entries}
+
+
+def write_batch(items: List[Dict[str, Any]], type_codes: Optional[List[str]] = None) -> List[Tuple[str, int, int]]:
+    """
+    Enregistre les calendriers fournis (compacts ou en listes) et retourne les (salarié, année,
+    mois) écrits. Seules les colonnes présentes dans une entrée sont écrites : les lignes sont
+    regroupées par ensemble de colonnes, soit un seul upsert quand toutes les entrées fournissent
+    les mêmes calendriers.
+    """
+    codes = _TypeCodes(type_codes)
+    groups: Dict[Tuple[str, ...], Dict[Tuple[str, int, int], Dict[str, Any]]] = {}
+    for item in items:
+        year, month = item["year"], item["month"]
+        row: Dict[str, Any] = {"employee_id": item["employee_id"], "year": year, "month": month}
+        for kind, (column, list_key, _) in _KINDS.items():
+            if item.get(kind) is not None:
+                row[column] = _stored(kind, year, month, decode_compact(item[kind], kind, year, month, codes))
+            elif item.get(list_key) is not None:
+                row[column] = _stored(kind, year, month, item[list_key])
+        columns = tuple(sorted(k for k in row if k in ("planned_calendar", "actual_hours")))
+        if columns:
+            # Un upsert ne peut pas toucher deux fois la même ligne : la dernière entrée l'emporte.
+            groups.setdefault(columns, {})[(row["employee_id"], year, month)] = row
+
+    written: List[Tuple[str, int, int]] = []
+    for rows in groups.values():
+        supabase.table('employee_schedules').upsert(list(rows.values()), on_conflict="employee_id, year, month").execute()
+        written.extend(rows)
+    print(f"INFO: {len(written)} calendrier(s) enregistré(s) en {len(groups)} upsert(s).", file=sys.stderr)
+    return written
@@ -0,0 +1,122 @@
+# backend_api/services/employee_overview.py
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+
+from core.config import supabase
+from services import signed_urls
+
+# Vue agrégée de la fiche salarié (page EmployeeDetail).
+#
+# La page appelait séparément la fiche, les bulletins, le contrat et les saisies du mois, et
+# chaque route relisait `employees` pour retrouver le dossier du salarié. Ici, la fiche, les
+# bulletins et les saisies sont lus en parallèle (ils ne dépendent que de l'identifiant), puis
+# la présence du contrat est vérifiée avec le dossier de la fiche déjà lue. Le résultat est
+# gardé OVERVIEW_TTL secondes par (salarié, mois) ; les routes qui modifient ces données
+# appellent invalidate(employee_id).
+
+OVERVIEW_TTL = float(os.getenv("EMPLOYEE_OVERVIEW_TTL_SECONDS", "30") or 0)
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="employee-overview")
+_cache: Dict[Tuple[str, int, int], Tuple[float, Dict[str, Any]]] = {}
+# Le dossier d'un salarié est fixé à sa création : il n'est lu qu'une fois par processus.
+_folder_names: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def _submit(fn, *args):
+    # Copie du contexte : les appels Supabase des threads comptent dans les métriques de la requête.
+    return _executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def employee_folder_name(employee_id: str) -> str:
+    """ Dossier du salarié (data/employes/<dossier>, préfixe de stockage), 404 s'il n'existe pas. """
+    folder_name = _folder_names.get(employee_id)
+    if folder_name is None:
+        response = supabase.table('employees').select("employee_folder_name").eq('id', employee_id).maybe_single().execute()
+        if not response or not response.data:
+            raise HTTPException(status_code=404, detail="Employé non trouvé.")
+        folder_name = _folder_names[employee_id] = response.data['employee_folder_name']
+    return folder_name
+
+
+def fetch_payslips(employee_id: str) -> List[Dict[str, Any]]:
+    """ Bulletins du salarié avec leur URL de téléchargement signée (cache de signed_urls). """
+    payslips_db = supabase.table('payslips').select("id, month, year, pdf_storage_path").eq('employee_id', employee_id).execute().data
+    # pdf_storage_path n'est renseigné qu'après l'envoi du PDF : il tient lieu de preuve d'existence.
+    url_map = signed_urls.sign("payslips", [p['pdf_storage_path'] for p in payslips_db or [] if p.get('pdf_storage_path')], download=True)
+
+    response_data = []
+    for p in payslips_db or []:
+        storage_path = p.get('pdf_storage_path')
+        if url_map.get(storage_path):
+            response_data.append({
+                "id": p['id'],
+                "name": storage_path.split('/')[-1],
+                "month": p['month'],
+                "year": p['year'],
+                "url": url_map[storage_path]
+            })
+    return response_data
+
+
+def fetch_contract_url(folder_name: str) -> Optional[str]:
+    """ URL signée du contrat PDF du dossier, None s'il n'a pas été déposé. """
+    return signed_urls.sign_one("contrats", f"{folder_name}/contrat.pdf")
+
+
+def _fetch_employee(employee_id: str) -> Optional[Dict[str, Any]]:
+    response = supabase.table('employees').select("*").eq('id', employee_id).maybe_single().execute()
+    return response.data if response else None
+
+
+def _fetch_monthly_inputs(employee_id: str, year: int, month: int) -> List[Dict[str, Any]]:
+    from services import monthly_inputs_cache  # import circulaire : le cache des saisies invalide cette vue
+    return monthly_inputs_cache.list_employee(employee_id, year, month)
+
+
+def _build_overview(employee_id: str, year: int, month: int) -> Dict[str, Any]:
+    employee_future = _submit(_fetch_employee, employee_id)
+    payslips_future = _submit(fetch_payslips, employee_id)
+    inputs_future = _submit(_fetch_monthly_inputs, employee_id, year, month)
+
+    employee = employee_future.result()
+    if not employee:
+        # Les autres lectures se terminent en arrière-plan ; leur résultat est ignoré.
+        raise HTTPException(status_code=404, detail="Employé non trouvé.")
+    _folder_names[employee_id] = employee['employee_folder_name']
+    contract_url = fetch_contract_url(employee['employee_folder_name'])
+
+    return {
+        "employee": employee,
+        "payslips": payslips_future.result(),
+        "contract_url": contract_url,
+        "year": year,
+        "month": month,
+        "monthly_inputs": inputs_future.result(),
+    }
+
+
+def get_overview(employee_id: str, year: int, month: int) -> Dict[str, Any]:
+    """ Fiche, bulletins, contrat et saisies du mois d'un salarié (en cache OVERVIEW_TTL secondes). """
+    key = (employee_id, year, month)
+    cached = _cache.get(key)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    overview = _build_overview(employee_id, year, month)
+    if OVERVIEW_TTL > 0:
+        with _lock:
+            _cache[key] = (time.monotonic() + OVERVIEW_TTL, overview)
+    return overview
+
+
+def invalidate(employee_id: Optional[str] = None) -> None:
+    """ Oublie les vues en cache d'un salarié (ou de tous). """
+    with _lock:
+        for key in [k for k in _cache if employee_id is None or k[0] == employee_id]:
+            del _cache[key]
@@ -0,0 +1,34 @@
+# backend_api/services/job_handlers.py
+
+from typing import Any, Dict
+from fastapi import HTTPException
+
+from services import job_queue, payroll_events
+from services.job_queue import PermanentJobError
+from services.payslip_generator import process_payslip_generation
+
+# Exécution des travaux de la file (importé par worker.py seulement : l'API ne fait qu'enregistrer
+# les travaux). Une HTTPException 4xx des services est un échec définitif, sans nouvelle tentative.
+
+
+def _run(fn, *args):
+    try:
+        return fn(*args)
+    except HTTPException as e:
+        if 400 <= e.status_code < 500:
+            raise PermanentJobError(str(e.detail))
+        raise Exception(str(e.detail))
+
+
+@job_queue.handler("payslip")
+def generate_payslip(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """ Génère et enregistre un bulletin (non recalculé si ses entrées n'ont pas changé, sauf `force`). """
+    return _run(process_payslip_generation, payload["employee_id"], int(payload["year"]), int(payload["month"]), bool(payload.get("force")))
+
+
+@job_queue.handler("payroll_events")
+def recompute_payroll_events(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """ Recalcule les événements de paie d'un mois (semaines modifiées seulement). """
+    year, month = int(payload["year"]), int(payload["month"])
+    result = _run(payroll_events.recompute, payload["employee_id"], [(year, month)]).get((year, month))
+    return {"events_count": len((result or {}).get('calendrier_analyse', []))}
@@ -0,0 +1,265 @@
+# backend_api/services/job_queue.py
+
+import json
+import os
+import random
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# File de travaux persistante (SQLite) pour les traitements longs : génération de bulletins,
+# analyse des horaires. L'API enregistre le travail et répond tout de suite avec son identifiant ;
+# les processus de worker.py le prennent, l'exécutent et y écrivent le résultat.
+#
+#   - Une prise de travail se fait dans une transaction BEGIN IMMEDIATE : deux workers ne peuvent
+#     pas prendre le même travail, et la limite MAX_RUNNING_PER_TENANT (travaux en cours par
+#     client) est vérifiée dans la même transaction.
+#   - Un travail pris reçoit un bail (LEASE_SECONDS), prolongé tant que le worker tourne ; un bail
+#     expiré (worker tué) remet le travail en file.
+#   - En cas d'échec, le travail est relancé avec un backoff exponentiel (jitter "equal") jusqu'à
+#     max_attempts tentatives ; un échec définitif (erreur 4xx) n'est pas relancé.
+#   - Deux travaux de même dedupe_key (même bulletin, par exemple) ne tournent jamais en même temps,
+#     et une demande identique à un travail encore en file renvoie ce travail.
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DB_FILE = Path(os.getenv("JOBS_DB", BACKEND_DIR / "data" / "jobs.sqlite"))
+MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+MAX_RUNNING_PER_TENANT = int(os.getenv("JOBS_MAX_RUNNING_PER_TENANT", "2"))
+LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "120"))
+BACKOFF_BASE_SECONDS = float(os.getenv("JOBS_BACKOFF_BASE_SECONDS", "10"))
+BACKOFF_MAX_SECONDS = float(os.getenv("JOBS_BACKOFF_MAX_SECONDS", "600"))
+RETENTION_DAYS = float(os.getenv("JOBS_RETENTION_DAYS", "7"))
+DEFAULT_TENANT = "default"
+
+STATUSES = ("queued", "running", "succeeded", "failed")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS idx_jobs_tenant_status ON jobs (tenant, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_dedupe_key ON jobs (dedupe_key, status);
+"""
+
+# Fonctions d'exécution par type de travail (enregistrées par services/job_handlers.py)
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+
+class PermanentJobError(Exception):
+    """ Échec qu'une nouvelle tentative ne corrigerait pas (données invalides, salarié inconnu...). """
+
+
+def handler(kind: str):
+    """ Décorateur : enregistre la fonction qui exécute les travaux de type `kind`. """
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def connect(db_file: Optional[Path] = None) -> sqlite3.Connection:
+    path = Path(db_file or DB_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Transactions explicites (BEGIN IMMEDIATE) : pas de transaction implicite du module sqlite3.
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA_SQL)
+    return conn
+
+
+@contextmanager
+def session(db_file: Optional[Path] = None) -> Iterator[sqlite3.Connection]:
+    """ Connexion en transaction d'écriture (BEGIN IMMEDIATE) : commit en sortie de bloc, puis fermeture. """
+    conn = connect(db_file)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def _job(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    for field in ("run_after", "lease_until"):
+        job[field] = _iso(job[field]) if job[field] is not None else None
+    return job
+
+
+def enqueue(kind: str, payload: Dict[str, Any], tenant: Optional[str] = None, dedupe_key: Optional[str] = None,
+            max_attempts: Optional[int] = None) -> Dict[str, Any]:
+    """ Ajoute un travail à la file (ou renvoie le travail identique encore en file) ; ne l'exécute pas. """
+    tenant = tenant or DEFAULT_TENANT
+    now = time.time()
+    with session() as conn:
+        if dedupe_key is not None:
+            existing = conn.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND tenant = ? AND status = 'queued' ORDER BY created_at LIMIT 1",
+                (dedupe_key, tenant),
+            ).fetchone()
+            if existing is not None:
+                return _job(existing)
+        job_id = str(uuid.uuid4())
+        conn.execute(
+            "INSERT INTO jobs (id, kind, tenant, payload, dedupe_key, status, max_attempts, run_after, created_at) "
+            "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, kind, tenant, json.dumps(payload, ensure_ascii=False), dedupe_key, max_attempts or MAX_ATTEMPTS, now, _iso(now)),
+        )
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+
+def enqueue_payslips(employee_ids: List[str], year: int, month: int, force: bool = False, tenant: Optional[str] = None) -> List[Dict[str, Any]]:
+    """ Un travail "payslip" par salarié (doublons de la liste ignorés). """
+    return [
+        enqueue("payslip", {"employee_id": employee_id, "year": year, "month": month, "force": force},
+                tenant=tenant, dedupe_key=f"payslip:{employee_id}:{year}:{month}")
+        for employee_id in dict.fromkeys(employee_ids)
+    ]
+
+
+def enqueue_payroll_events(employee_id: str, year: int, month: int, tenant: Optional[str] = None) -> Dict[str, Any]:
+    """ Travail "payroll_events" : recalcul des événements de paie d'un salarié pour un mois. """
+    return enqueue("payroll_events", {"employee_id": employee_id, "year": year, "month": month},
+                   tenant=tenant, dedupe_key=f"payroll_events:{employee_id}:{year}:{month}")
+
+
+def get(job_id: str) -> Optional[Dict[str, Any]]:
+    conn = connect()
+    try:
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def list_jobs(tenant: Optional[str] = None, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """ Travaux les plus récents d'abord, filtrés par client, statut et type. """
+    clauses, params = [], []
+    for column, value in (("tenant", tenant), ("status", status), ("kind", kind)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = connect()
+    try:
+        rows = conn.execute(f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)).fetchall()
+        return [_job(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def _backoff(attempts: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** max(0, attempts - 1))
+    # Jitter "equal" : au moins la moitié du backoff, pour rester borné vers le bas.
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _release_expired(conn: sqlite3.Connection, now: float) -> None:
+    """ Travaux dont le worker a disparu (bail expiré) : remis en file, ou en échec s'ils ont épuisé leurs tentatives. """
+    conn.execute(
+        "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+        "error = 'bail expiré : worker arrêté pendant le traitement', lease_until = NULL, worker = NULL, "
+        "finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END "
+        "WHERE status = 'running' AND lease_until < ?",
+        (_iso(now), now),
+    )
+
+
+def claim(worker: str) -> Optional[Dict[str, Any]]:
+    """
+    Prend le prochain travail exécutable : échu, client sous sa limite de travaux en cours, aucun
+    travail de même dedupe_key en cours. None si la file n'en a pas.
+    """
+    now = time.time()
+    with session() as conn:
+        _release_expired(conn, now)
+        row = conn.execute(
+            "SELECT j.id FROM jobs j WHERE j.status = 'queued' AND j.run_after <= :now "
+            "AND (SELECT COUNT(*) FROM jobs r WHERE r.tenant = j.tenant AND r.status = 'running') < :limit "
+            "AND (j.dedupe_key IS NULL OR NOT EXISTS (SELECT 1 FROM jobs r WHERE r.dedupe_key = j.dedupe_key AND r.status = 'running')) "
+            "ORDER BY j.run_after, j.created_at LIMIT 1",
+            {"now": now, "limit": MAX_RUNNING_PER_TENANT},
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, lease_until = ?, "
+            "started_at = ?, error = NULL WHERE id = ?",
+            (worker, now + LEASE_SECONDS, _iso(now), row["id"]),
+        )
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+
+def heartbeat(job_id: str, worker: str) -> None:
+    """ Prolonge le bail d'un travail en cours. """
+    with session() as conn:
+        conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                     (time.time() + LEASE_SECONDS, job_id, worker))
+
+
+def complete(job_id: str, worker: str, result: Any) -> None:
+    now = time.time()
+    with session() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'succeeded', result = ?, lease_until = NULL, finished_at = ? WHERE id = ? AND worker = ?",
+            (json.dumps(result, ensure_ascii=False, default=str), _iso(now), job_id, worker),
+        )
+
+
+def fail(job_id: str, worker: str, error: str, retry: bool = True) -> str:
+    """ Enregistre l'échec d'une tentative ; retourne le nouveau statut ("queued" si relancé, sinon "failed"). """
+    now = time.time()
+    with session() as conn:
+        row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ?", (job_id, worker)).fetchone()
+        if row is None:
+            return "failed"  # bail repris entre-temps par un autre worker
+        if retry and row["attempts"] < row["max_attempts"]:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, run_after = ?, lease_until = NULL, worker = NULL WHERE id = ?",
+                (error, now + _backoff(row["attempts"]), job_id),
+            )
+            return "queued"
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL, finished_at = ? WHERE id = ?",
+            (error, _iso(now), job_id),
+        )
+        return "failed"
+
+
+def purge(now: Optional[float] = None) -> int:
+    """ Supprime les travaux terminés depuis plus de RETENTION_DAYS jours. """
+    limit = _iso((now or time.time()) - RETENTION_DAYS * 86400)
+    with session() as conn:
+        return conn.execute("DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?", (limit,)).rowcount
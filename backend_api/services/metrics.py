@@ -0,0 +1,218 @@
+# backend_api/services/metrics.py
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# Métriques de l'API : durées par étape et compteurs.
+#
+# Deux vues sont alimentées par les mêmes appels `stage()` / `increment()` :
+#   - des agrégats de processus (histogrammes et compteurs), exposés au format texte Prometheus
+#     par GET /metrics ;
+#   - le détail de la requête en cours (contextvar), renvoyé dans l'en-tête `Server-Timing`
+#     par le middleware de main.py. Cela permet de voir si un bulletin lent l'est à cause de la
+#     base, du moteur ou de weasyprint.
+# Les étapes du moteur de paie (sous-processus) sont relues depuis sa sortie d'erreur
+# (voir record_engine_metrics). PAYROLL_METRICS=0 désactive toute la collecte.
+
+ENABLED = os.getenv("PAYROLL_METRICS", "1") != "0"
+# Variable d'environnement et préfixe de ligne convenus avec backend_calculs/moteur_paie/metriques.py
+ENGINE_METRICS_ENV = "PAIE_METRIQUES"
+ENGINE_METRICS_PREFIX = "METRIQUES: "
+# Bornes des histogrammes, en secondes
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+
+_histograms: Dict[str, _Histogram] = {}
+_counters: Dict[str, float] = {}
+_lock = threading.Lock()
+# Profondeur d'appels Supabase instrumentés du thread (un execute() peut en appeler un autre).
+_in_call = threading.local()
+
+# Mesures de la requête en cours : {"timings": {étape: secondes}, "counters": {nom: valeur}}.
+# Le dictionnaire est partagé par référence avec le threadpool des routes synchrones.
+_current: contextvars.ContextVar[Optional[Dict[str, Dict[str, float]]]] = contextvars.ContextVar("payroll_metrics", default=None)
+
+
+def observe(name: str, seconds: float) -> None:
+    """Enregistre une durée d'étape (agrégats du processus et requête en cours)."""
+    if not ENABLED:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = _Histogram()
+        histogram.observe(seconds)
+    request = _current.get()
+    if request is not None:
+        request["timings"][name] = request["timings"].get(name, 0.0) + seconds
+
+
+def increment(name: str, value: float = 1) -> None:
+    """Incrémente un compteur (requêtes BDD, octets lus/écrits, taille des PDF...)."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0.0) + value
+    request = _current.get()
+    if request is not None:
+        request["counters"][name] = request["counters"].get(name, 0.0) + value
+
+
+@contextmanager
+def stage(name: str):
+    """Chronomètre le bloc sous le nom d'étape `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def begin_request() -> contextvars.Token:
+    return _current.set({"timings": {}, "counters": {}})
+
+
+def end_request(token: contextvars.Token) -> Dict[str, Dict[str, float]]:
+    request = _current.get() or {"timings": {}, "counters": {}}
+    _current.reset(token)
+    return request
+
+
+def server_timing_header(request: Dict[str, Dict[str, float]], total: Optional[float] = None) -> str:
+    """Valeur de l'en-tête Server-Timing : durées en millisecondes, compteurs en description."""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in request["timings"].items()]
+    parts.extend(f'{name};desc="{value:g}"' for name, value in request["counters"].items())
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def parse_engine_metrics(stderr: str) -> Dict[str, Any]:
+    """Dernière ligne de métriques de la sortie d'erreur du moteur ({} si absente)."""
+    for line in reversed(stderr.splitlines()):
+        if line.startswith(ENGINE_METRICS_PREFIX):
+            try:
+                return json.loads(line[len(ENGINE_METRICS_PREFIX):])
+            except ValueError:
+                return {}
+    return {}
+
+
+def record_engine_metrics(engine_metrics: Dict[str, Any]) -> None:
+    """Reprend les durées d'étapes et compteurs émis par le moteur de paie (sous-processus)."""
+    for name, ms in (engine_metrics.get("etapes_ms") or {}).items():
+        observe(f"engine.{name}", ms / 1000.0)
+    for name, value in (engine_metrics.get("compteurs") or {}).items():
+        increment(f"engine.{name}", value)
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def render_prometheus() -> str:
+    """Agrégats au format d'exposition texte Prometheus."""
+    with _lock:
+        histograms: List[Tuple[str, int, float, List[int]]] = [(n, h.count, h.total, list(h.buckets)) for n, h in sorted(_histograms.items())]
+        counters = sorted(_counters.items())
+
+    lines = [
+        "# HELP payroll_stage_seconds Durée des étapes (API, base de données, moteur de paie).",
+        "# TYPE payroll_stage_seconds histogram",
+    ]
+    for name, count, total, buckets in histograms:
+        for bound, value in zip(BUCKETS, buckets):
+            lines.append(f'payroll_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {value}')
+        lines.append(f'payroll_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+        lines.append(f'payroll_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+        lines.append(f'payroll_stage_seconds_count{{stage="{name}"}} {count}')
+    for name, value in counters:
+        metric = f"payroll_{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def instrument_supabase() -> None:
+    """
+    Chronomètre et compte les appels du client Supabase (requêtes PostgREST et Storage) en
+    enveloppant les méthodes des classes de la bibliothèque. Sans effet si leur structure
+    interne diffère de celle attendue.
+    """
+    if not ENABLED:
+        return
+    try:
+        from postgrest._sync import request_builder as postgrest_builders
+    except ImportError:
+        postgrest_builders = None
+    try:
+        from storage3._sync import file_api as storage_api
+    except ImportError:
+        storage_api = None
+
+    def wrap(cls, method: str, stage_name: str, counter: str, payload_bytes=None, result_bytes=None):
+        original = getattr(cls, method, None)
+        if original is None or getattr(original, "_payroll_metrics", False):
+            return
+
+        def wrapper(self, *args, **kwargs):
+            if getattr(_in_call, "depth", 0):
+                return original(self, *args, **kwargs)
+            _in_call.depth = 1
+            try:
+                return measured(self, *args, **kwargs)
+            finally:
+                _in_call.depth = 0
+
+        def measured(self, *args, **kwargs):
+            increment(counter)
+            if payload_bytes:
+                increment("storage.bytes_written", payload_bytes(args, kwargs))
+            with stage(stage_name):
+                result = original(self, *args, **kwargs)
+            if result_bytes:
+                increment("storage.bytes_read", result_bytes(result))
+            return result
+
+        wrapper._payroll_metrics = True
+        wrapper.__wrapped__ = original
+        setattr(cls, method, wrapper)
+
+    if postgrest_builders is not None:
+        for class_name in ("SyncQueryRequestBuilder", "SyncSingleRequestBuilder", "SyncMaybeSingleRequestBuilder", "SyncExplainRequestBuilder"):
+            cls = getattr(postgrest_builders, class_name, None)
+            if cls is not None:
+                wrap(cls, "execute", "db", "db.queries")
+
+    if storage_api is not None:
+        bucket_cls = getattr(storage_api, "SyncBucketActionsMixin", None)
+        if bucket_cls is not None:
+            def upload_size(args, kwargs):
+                data = kwargs.get("file", args[1] if len(args) > 1 else None)
+                return len(data) if isinstance(data, (bytes, bytearray)) else 0
+
+            wrap(bucket_cls, "upload", "storage", "storage.requests", payload_bytes=upload_size)
+            wrap(bucket_cls, "download", "storage", "storage.requests", result_bytes=lambda r: len(r) if isinstance(r, (bytes, bytearray)) else 0)
+            for method in ("create_signed_url", "create_signed_urls", "remove"):
+                wrap(bucket_cls, method, "storage", "storage.requests")
@@ -0,0 +1,304 @@
+# backend_api/services/monthly_input_import.py
+
+import csv
+import io
+import itertools
+import json
+import sys
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from core.config import supabase
+from services import monthly_inputs_cache, reference_data
+
+# Import en masse des saisies du mois (CSV ou JSON).
+#
+# Le fichier est lu au fil de l'eau : CSV ligne par ligne, JSON objet par objet (tableau ou
+# JSON Lines), si bien que la mémoire ne dépend que de la taille d'un lot, pas de celle du
+# fichier. Une ligne JSON Lines illisible est une erreur de cette ligne ; dans un tableau, un
+# élément illisible arrête la lecture (la position est signalée). Chaque ligne est validée (salarié connu, période, montant, prime du catalogue
+# primes.json) puis les lignes valides sont écrites par lots en upsert sur la clé naturelle
+# (employee_id, year, month, name) : réimporter un fichier corrigé remplace les saisies au lieu
+# de les dupliquer. Dans un même fichier, la dernière ligne d'une clé l'emporte. L'upsert suppose
+# un index unique sur ces colonnes de monthly_inputs. Un lot refusé par la base est signalé sur
+# chacune de ses lignes, sans interrompre l'import : le bilan est toujours retourné.
+
+NATURAL_KEY = "employee_id,year,month,name"
+BATCH_SIZE = 500
+# Au-delà, les erreurs sont seulement comptées (la réponse reste de taille bornée).
+MAX_REPORTED_ERRORS = 1000
+CHUNK_SIZE = 64 * 1024
+# Taille maximale d'un objet JSON (ou d'une ligne JSON Lines) : borne la mémoire tampon.
+MAX_OBJECT_CHARS = 1024 * 1024
+
+_TRUE = {"1", "true", "vrai", "oui", "yes", "o", "y", "x"}
+_FALSE = {"0", "false", "faux", "non", "no", "n", ""}
+
+
+def iter_json_objects(stream: io.TextIOBase) -> Iterator[Tuple[Any, Optional[str]]]:
+    """
+    (objet, None) pour chaque objet d'un tableau (`[{...}, {...}]`) ou d'un fichier JSON Lines,
+    lu par blocs de CHUNK_SIZE caractères ; (None, erreur) pour une ligne JSON Lines illisible.
+    """
+    buffer = ""
+    while not buffer:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        buffer = chunk.lstrip()
+    if buffer.startswith("["):
+        yield from ((obj, None) for obj in _iter_json_array(stream, buffer[1:]))
+    else:
+        yield from _iter_json_lines(stream, buffer)
+
+
+def _iter_json_lines(stream: io.TextIOBase, buffer: str) -> Iterator[Tuple[Any, Optional[str]]]:
+    """ Un objet par ligne : une ligne illisible est signalée et la lecture reprend à la suivante. """
+    eof = skipping = False
+    while True:
+        newline = buffer.find("\n")
+        if newline < 0 and not eof:
+            if len(buffer) > MAX_OBJECT_CHARS:
+                # Ligne démesurée : signalée une fois, puis ignorée jusqu'au prochain saut de ligne.
+                if not skipping:
+                    yield None, f"ligne de plus de {MAX_OBJECT_CHARS} caractères"
+                skipping, buffer = True, ""
+            chunk = stream.read(CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        line, buffer = (buffer, "") if newline < 0 else (buffer[:newline], buffer[newline + 1:])
+        if skipping:
+            skipping = False
+        elif line.strip():
+            try:
+                yield json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield None, f"JSON invalide : {e}"
+        if eof and not buffer:
+            return
+
+
+def _iter_json_array(stream: io.TextIOBase, buffer: str) -> Iterator[Any]:
+    """
+    Éléments d'un tableau JSON (crochet ouvrant déjà lu). Un élément illisible ne permet pas de
+    retrouver le suivant : ValueError avec sa position, dès la fin du fichier ou MAX_OBJECT_CHARS
+    caractères lus sans objet complet.
+    """
+    decoder = json.JSONDecoder()
+    offset = 1  # caractères consommés, crochet compris
+    eof = False
+    while True:
+        stripped = buffer.lstrip(" \t\r\n,")
+        offset += len(buffer) - len(stripped)
+        buffer = stripped
+        if buffer.startswith("]"):
+            return
+        if not buffer:
+            if eof:
+                return
+            chunk = stream.read(CHUNK_SIZE)
+            eof = not chunk
+            buffer = chunk
+            continue
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if eof or len(buffer) > MAX_OBJECT_CHARS:
+                raise ValueError(f"objet JSON invalide ou trop long au caractère {offset} ({e.msg})")
+            chunk = stream.read(CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield obj
+        buffer = buffer[end:]
+        offset += end
+
+
+def iter_csv_rows(stream: io.TextIOBase) -> Iterator[Dict[str, Any]]:
+    """ Lignes d'un CSV à en-tête ; séparateur ';' (export Excel français) ou ','. """
+    header = stream.readline()
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    reader = csv.DictReader(itertools.chain([header], stream), delimiter=delimiter)
+    for row in reader:
+        yield {(k or "").strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".json", ".jsonl", ".ndjson")) or "json" in (content_type or ""):
+        return "json"
+    return "csv"
+
+
+def _parse_bool(value: Any) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return None if text == "" else False
+    raise ValueError(f"booléen invalide : {value!r}")
+
+
+def _parse_amount(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    # "1 234,56" (format français) ou "1234.56"
+    text = str(value or "").replace(" ", "").replace("\u00a0", "").replace("\u202f", "").replace(",", ".")
+    if not text:
+        raise ValueError("montant manquant")
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"montant invalide : {value!r}")
+
+
+def _catalogue_index() -> Dict[str, Dict[str, Any]]:
+    """ Primes du catalogue, par identifiant et par libellé (insensible à la casse). """
+    index = {}
+    for prime in reference_data.get_data("primes-catalogue"):
+        index[str(prime["id"]).lower()] = prime
+        index[str(prime["libelle"]).strip().lower()] = prime
+    return index
+
+
+def _employee_index() -> Tuple[set, Dict[str, str]]:
+    """ Identifiants des salariés et correspondance dossier -> identifiant (une seule lecture projetée). """
+    rows = supabase.table('employees').select("id, employee_folder_name").execute().data or []
+    return {r['id'] for r in rows}, {r['employee_folder_name'].lower(): r['id'] for r in rows if r.get('employee_folder_name')}
+
+
+def validate_row(raw: Dict[str, Any], catalogue: Dict[str, Dict[str, Any]], employee_ids: set, folders: Dict[str, str],
+                 default_year: Optional[int], default_month: Optional[int]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """ Ligne prête à écrire dans monthly_inputs, ou None et la liste des erreurs. """
+    errors: List[str] = []
+    if not isinstance(raw, dict):
+        return None, ["ligne non reconnue (objet attendu)"]
+
+    employee_id = str(raw.get("employee_id") or "").strip()
+    folder = str(raw.get("employee_folder_name") or "").strip()
+    if employee_id:
+        if employee_id not in employee_ids:
+            errors.append(f"salarié inconnu : {employee_id}")
+    elif folder:
+        employee_id = folders.get(folder.lower(), "")
+        if not employee_id:
+            errors.append(f"dossier salarié inconnu : {folder}")
+    else:
+        errors.append("employee_id ou employee_folder_name requis")
+
+    year = month = None
+    try:
+        year = int(raw.get("year") or default_year)
+        month = int(raw.get("month") or default_month)
+        if not 1 <= month <= 12 or not 2000 <= year <= 2100:
+            errors.append(f"période invalide : {month}/{year}")
+    except (TypeError, ValueError):
+        errors.append("year et month requis (entiers)")
+
+    amount = None
+    try:
+        amount = _parse_amount(raw.get("amount"))
+    except ValueError as e:
+        errors.append(str(e))
+
+    flags = {}
+    for field in ("is_socially_taxed", "is_taxable"):
+        try:
+            flags[field] = _parse_bool(raw.get(field))
+        except ValueError as e:
+            errors.append(f"{field} : {e}")
+
+    name = str(raw.get("name") or "").strip()
+    if not name:
+        errors.append("name requis")
+    else:
+        prime = catalogue.get(name.lower())
+        if prime is not None:
+            # Prime du catalogue : libellé et soumissions de référence
+            name = prime["libelle"]
+            for field, key in (("is_socially_taxed", "soumise_a_cotisations"), ("is_taxable", "soumise_a_impot")):
+                if flags.get(field) is None:
+                    flags[field] = prime[key]
+                elif flags[field] != prime[key]:
+                    errors.append(f"{field} contredit le catalogue pour « {name} »")
+        elif flags.get("is_socially_taxed") is None or flags.get("is_taxable") is None:
+            errors.append(f"prime hors catalogue « {name} » : is_socially_taxed et is_taxable requis")
+
+    if errors:
+        return None, errors
+    row = {
+        "employee_id": employee_id, "year": year, "month": month, "name": name, "amount": amount,
+        "is_socially_taxed": flags["is_socially_taxed"], "is_taxable": flags["is_taxable"],
+    }
+    description = str(raw.get("description") or "").strip()
+    if description:
+        row["description"] = description
+    return row, []
+
+
+def _record_error(report: Dict[str, Any], line_number: int, errors: List[str]) -> None:
+    report["error_count"] += 1
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"row": line_number, "errors": errors})
+
+
+def _flush(batch: Dict[Tuple, Tuple[int, Dict[str, Any]]], dry_run: bool, report: Dict[str, Any]) -> int:
+    """
+    Écrit le lot (clé -> (numéro de ligne, saisie)) et le vide. Un lot refusé par la base est
+    signalé sur chacune de ses lignes ; les lots suivants sont tout de même écrits.
+    """
+    if not batch:
+        return 0
+    try:
+        if not dry_run:
+            response = supabase.table("monthly_inputs").upsert([row for _, row in batch.values()], on_conflict=NATURAL_KEY).execute()
+            monthly_inputs_cache.apply_upsert(response.data or [])
+        return len(batch)
+    except Exception as e:
+        print(f"ERREUR: Écriture d'un lot de {len(batch)} saisie(s) échouée : {e}", file=sys.stderr)
+        for line_number, _ in sorted(batch.values(), key=lambda item: item[0]):
+            _record_error(report, line_number, [f"écriture refusée par la base : {e}"])
+        return 0
+    finally:
+        batch.clear()
+
+
+def import_monthly_inputs(binary: BinaryIO, file_format: str, default_year: Optional[int] = None,
+                          default_month: Optional[int] = None, dry_run: bool = False) -> Dict[str, Any]:
+    """ Valide et écrit les saisies du fichier ; retourne le bilan et les erreurs par ligne (numérotées à partir de 1). """
+    stream = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    rows = iter_json_objects(stream) if file_format == "json" else ((row, None) for row in iter_csv_rows(stream))
+    catalogue = _catalogue_index()
+    employee_ids, folders = _employee_index()
+
+    report = {"received": 0, "valid": 0, "imported": 0, "duplicates": 0, "error_count": 0, "errors": [], "dry_run": dry_run}
+    batch: Dict[Tuple, Tuple[int, Dict[str, Any]]] = {}
+    try:
+        for line_number, (raw, read_error) in enumerate(rows, start=1):
+            report["received"] += 1
+            if read_error:
+                _record_error(report, line_number, [read_error])
+                continue
+            row, errors = validate_row(raw, catalogue, employee_ids, folders, default_year, default_month)
+            if errors:
+                _record_error(report, line_number, errors)
+                continue
+            report["valid"] += 1
+            key = (row["employee_id"], row["year"], row["month"], row["name"])
+            # Un lot ne peut pas toucher deux fois la même clé ; entre lots, l'upsert suivant remplace.
+            if key in batch:
+                report["duplicates"] += 1
+            batch[key] = (line_number, row)
+            if len(batch) >= BATCH_SIZE:
+                report["imported"] += _flush(batch, dry_run, report)
+    except (ValueError, csv.Error) as e:
+        # Fichier illisible à partir d'ici : ce qui précède est gardé, la suite est signalée.
+        report["error_count"] += 1
+        report["errors"].append({"row": report["received"] + 1, "errors": [f"fichier illisible : {e}"]})
+    report["imported"] += _flush(batch, dry_run, report)
+    stream.detach()
+
+    print(f"INFO: Import de saisies : {report['received']} ligne(s), {report['imported']} écrite(s), {report['error_count']} en erreur{' (simulation)' if dry_run else ''}.", file=sys.stderr)
+    return report
@@ -0,0 +1,231 @@
+# backend_api/services/monthly_inputs_cache.py
+
+import asyncio
+import collections
+import itertools
+import os
+import sys
+import threading
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.config import supabase, supabase_url, supabase_key
+from services import employee_overview
+
+# Cache des saisies du mois, partitionné par (année, mois), et flux de changements.
+#
+# Chaque mois lu est gardé en mémoire (trié par created_at décroissant, comme les routes le
+# servaient). Les écritures de l'API y sont appliquées directement (apply_upsert / apply_delete),
+# et les écritures faites ailleurs arrivent par Supabase Realtime quand l'abonnement est actif
+# (start_realtime). Un mois est de toute façon relu au bout de CACHE_TTL secondes, au cas où
+# l'abonnement serait absent ou coupé ; CACHE_TTL à 0 désactive le cache (chaque lecture va en base).
+#
+# Une écriture peut arriver pendant le chargement d'un mois pas encore en cache : elle n'a alors
+# rien à mettre à jour, et le chargement en cours risque de ramener l'état d'avant. Chaque écriture
+# incrémente donc la génération de son mois ; un chargement pendant lequel elle a changé est refait.
+#
+# Chaque changement devient un événement numéroté ({"id", "type", "year", "month", ...}) diffusé
+# aux abonnés du mois (flux SSE de la route /api/monthly-inputs/events) et gardé dans un
+# historique court pour rejouer ce qu'un client reconnecté (Last-Event-ID) a manqué.
+
+CACHE_TTL = float(os.getenv("MONTHLY_INPUTS_CACHE_TTL_SECONDS", "300") or 0)
+HISTORY_SIZE = 1000
+MAX_LOAD_ATTEMPTS = 3
+REALTIME_ENABLED = os.getenv("MONTHLY_INPUTS_REALTIME", "1") != "0"
+
+_Month = Tuple[int, int]
+
+# (année, mois) -> (instant de chargement, {id: ligne})
+_months: Dict[_Month, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+# (année, mois) -> nombre d'écritures appliquées ; _resets compte les invalidations complètes
+_generations: Dict[_Month, int] = {}
+_resets = 0
+_events: Deque[Dict[str, Any]] = collections.deque(maxlen=HISTORY_SIZE)
+_sequence = itertools.count(1)
+_subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue, Optional[_Month]]] = set()
+_lock = threading.Lock()
+
+
+def _sorted(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(rows, key=lambda r: r.get("created_at") or "", reverse=True)
+
+
+def _load_month(year: int, month: int) -> Dict[str, Dict[str, Any]]:
+    response = supabase.table('monthly_inputs').select("*").match({"year": year, "month": month}).execute()
+    return {row["id"]: row for row in response.data or []}
+
+
+def _generation(key: _Month) -> Tuple[int, int]:
+    return _resets, _generations.get(key, 0)
+
+
+def _month_rows(year: int, month: int) -> Dict[str, Dict[str, Any]]:
+    if CACHE_TTL <= 0:
+        return _load_month(year, month)
+    key = (year, month)
+    entry = _months.get(key)
+    if entry is not None and time.monotonic() - entry[0] < CACHE_TTL:
+        return entry[1]
+    for _ in range(MAX_LOAD_ATTEMPTS):
+        with _lock:
+            generation = _generation(key)
+        rows = _load_month(year, month)
+        with _lock:
+            if _generation(key) == generation:
+                _months[key] = (time.monotonic(), rows)
+                return rows
+    # Écritures continues pendant les chargements : la dernière lecture est servie sans être gardée.
+    print(f"AVERTISSEMENT: Saisies {month:02d}/{year} modifiées pendant chaque chargement, non mises en cache.", file=sys.stderr)
+    return rows
+
+
+def list_month(year: int, month: int) -> List[Dict[str, Any]]:
+    """ Saisies du mois, tous salariés confondus, les plus récentes d'abord. """
+    return _sorted(list(_month_rows(year, month).values()))
+
+
+def list_employee(employee_id: str, year: int, month: int) -> List[Dict[str, Any]]:
+    """ Saisies du mois d'un salarié, les plus récentes d'abord. """
+    return _sorted(r for r in list(_month_rows(year, month).values()) if r.get("employee_id") == employee_id)
+
+
+def current_version() -> int:
+    """ Numéro du dernier événement émis (0 si aucun). """
+    return _events[-1]["id"] if _events else 0
+
+
+def _publish(event: Dict[str, Any]) -> None:
+    with _lock:
+        event["id"] = next(_sequence)
+        _events.append(event)
+        subscribers = list(_subscribers)
+    month = (event.get("year"), event.get("month"))
+    for loop, queue, scope in subscribers:
+        if scope is None or scope == month or event["type"] == "reset":
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Boucle fermée : l'abonné est parti sans se désinscrire.
+                unsubscribe(loop, queue, scope)
+
+
+def apply_upsert(rows: Iterable[Dict[str, Any]]) -> None:
+    """ Lignes créées ou modifiées (telles que renvoyées par Supabase) : cache et abonnés. """
+    changed: Dict[_Month, List[Dict[str, Any]]] = {}
+    with _lock:
+        for row in rows:
+            if not row or "id" not in row:
+                continue
+            key = (row.get("year"), row.get("month"))
+            _generations[key] = _generations.get(key, 0) + 1
+            entry = _months.get(key)
+            if entry is not None:
+                if entry[1].get(row["id"]) == row:
+                    continue  # écho Realtime d'une écriture déjà appliquée
+                entry[1][row["id"]] = row
+            changed.setdefault(key, []).append(row)
+    for (year, month), month_rows in changed.items():
+        for employee_id in {r.get("employee_id") for r in month_rows}:
+            employee_overview.invalidate(employee_id)
+        _publish({"type": "upsert", "year": year, "month": month, "rows": month_rows})
+
+
+def apply_delete(rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Lignes supprimées. Une ligne réduite à son identifiant (Realtime sans REPLICA IDENTITY FULL)
+    est retrouvée dans les mois en cache ; introuvable, elle invalide tout le cache.
+    """
+    removed: Dict[_Month, List[Dict[str, Any]]] = {}
+    unknown = False
+    with _lock:
+        for row in rows:
+            if not row or "id" not in row:
+                continue
+            if row.get("year") is not None and row.get("month") is not None:
+                key = (row["year"], row["month"])
+            else:
+                key = next((k for k, (_, month_rows) in _months.items() if row["id"] in month_rows), None)
+                if key is None:
+                    unknown = True
+                    continue
+            _generations[key] = _generations.get(key, 0) + 1
+            cached = _months[key][1].pop(row["id"], None) if key in _months else None
+            removed.setdefault(key, []).append(cached or row)
+    for (year, month), month_rows in removed.items():
+        for employee_id in {r.get("employee_id") for r in month_rows}:
+            employee_overview.invalidate(employee_id)
+        _publish({"type": "delete", "year": year, "month": month, "ids": [r["id"] for r in month_rows]})
+    if unknown:
+        invalidate()
+
+
+def invalidate() -> None:
+    """ Vide le cache ; les abonnés reçoivent un événement "reset" et rechargent leur mois. """
+    global _resets
+    with _lock:
+        _months.clear()
+        _resets += 1
+    employee_overview.invalidate()
+    _publish({"type": "reset"})
+
+
+def subscribe(year: Optional[int] = None, month: Optional[int] = None, last_event_id: Optional[int] = None) -> Tuple[asyncio.AbstractEventLoop, asyncio.Queue, Optional[_Month], List[Dict[str, Any]]]:
+    """
+    Inscrit un abonné (à appeler depuis la boucle asyncio) et retourne les événements manqués
+    depuis `last_event_id` ; un seul "reset" si l'historique ne remonte plus assez loin.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    scope = (year, month) if year is not None and month is not None else None
+    with _lock:
+        _subscribers.add((loop, queue, scope))
+        history = list(_events)
+    missed: List[Dict[str, Any]] = []
+    if last_event_id is not None:
+        latest = history[-1]["id"] if history else 0
+        # Historique trop court, ou numéros d'un processus précédent (redémarrage) : tout recharger.
+        if (history and history[0]["id"] > last_event_id + 1) or last_event_id > latest:
+            missed = [{"type": "reset", "id": latest}]
+        else:
+            missed = [e for e in history if e["id"] > last_event_id and (scope is None or e["type"] == "reset" or (e.get("year"), e.get("month")) == scope)]
+    return loop, queue, scope, missed
+
+
+def unsubscribe(loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, scope: Optional[_Month]) -> None:
+    with _lock:
+        _subscribers.discard((loop, queue, scope))
+
+
+def handle_realtime_change(payload: Dict[str, Any]) -> None:
+    """ Événement postgres_changes de Supabase Realtime sur monthly_inputs (formats v1 et v2 du client). """
+    data = payload.get("data", payload) if isinstance(payload, dict) else {}
+    event_type = (data.get("type") or data.get("eventType") or "").upper()
+    new = data.get("record") or data.get("new")
+    old = data.get("old_record") or data.get("old")
+    if event_type in ("INSERT", "UPDATE") and new:
+        # Saisie déplacée vers un autre mois : elle quitte l'ancien.
+        if event_type == "UPDATE" and old and old.get("year") is not None and (old.get("year"), old.get("month")) != (new.get("year"), new.get("month")):
+            apply_delete([old])
+        apply_upsert([new])
+    elif event_type == "DELETE" and old:
+        apply_delete([old])
+
+
+async def start_realtime() -> None:
+    """
+    Abonnement Supabase Realtime aux changements de monthly_inputs (client asynchrone). En cas
+    d'échec, le cache reste tenu à jour par les écritures de l'API et par CACHE_TTL.
+    """
+    if not REALTIME_ENABLED:
+        return
+    try:
+        from supabase import acreate_client
+        client = await acreate_client(supabase_url, supabase_key)
+        if hasattr(client.realtime, "connect"):
+            await client.realtime.connect()
+        channel = client.channel("monthly-inputs-cache")
+        channel.on_postgres_changes("*", schema="public", table="monthly_inputs", callback=handle_realtime_change)
+        await channel.subscribe()
+        print("INFO: Cache des saisies abonné à Supabase Realtime (monthly_inputs).", file=sys.stderr)
+    except Exception as e:
+        print(f"AVERTISSEMENT: Abonnement Realtime aux saisies impossible ({type(e).__name__}: {e}) ; expiration du cache après {CACHE_TTL:.0f} s.", file=sys.stderr)
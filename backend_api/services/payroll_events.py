@@ -0,0 +1,200 @@
+# backend_api/services/payroll_events.py
+
+import calendar
+import hashlib
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from fastapi import HTTPException
+
+from core.config import supabase
+from services import calendar_batch, metrics, payroll_analyzer, payslip_hash
+
+# Événements de paie (heures supplémentaires, absences...) tenus à jour au fil des saisies.
+#
+# L'analyseur traite chaque semaine ISO indépendamment : les événements d'un jour ne dépendent
+# que des heures prévues et réelles de sa semaine et de la durée du contrat. Le résultat enregistré
+# dans employee_schedules.payroll_events porte donc une "version" : l'empreinte de l'analyseur, la
+# durée hebdomadaire et une empreinte par semaine touchant le mois. Au recalcul, seules les
+# semaines dont l'empreinte a changé sont réanalysées ; les événements des autres jours sont
+# repris tels quels. Un résultat dont la version correspond aux données est à jour, et le
+# générateur de bulletins le reprend sans rien recalculer.
+#
+# Les écritures de calendriers appellent schedule() : le recalcul du salarié est lancé
+# DEBOUNCE_SECONDS après sa dernière écriture (une série de modifications = un seul recalcul),
+# par un thread de fond, pour le mois écrit et ses voisins (une semaine peut chevaucher deux mois).
+
+DEBOUNCE_SECONDS = float(os.getenv("PAYROLL_EVENTS_DEBOUNCE_SECONDS", "2") or 0)
+
+_Period = Tuple[int, int]
+
+ANALYZER_VERSION = hashlib.sha256(Path(payroll_analyzer.__file__).read_bytes()).hexdigest()[:16]
+
+# salarié -> (échéance en time.monotonic(), mois à recalculer)
+_pending: Dict[str, Tuple[float, Set[_Period]]] = {}
+_condition = threading.Condition()
+_worker: Optional[threading.Thread] = None
+
+
+def _shift(year: int, month: int, offset: int) -> _Period:
+    index = year * 12 + (month - 1) + offset
+    return index // 12, index % 12 + 1
+
+
+def collect_days(rows: Dict[_Period, Dict[str, Any]], year: int, month: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """ Jours prévus et réels de M-1, M et M+1 (copies annotées de 'annee' et 'mois'), comme les attend l'analyseur. """
+    planned, actual = [], []
+    for y, m in (_shift(year, month, -1), (year, month), _shift(year, month, 1)):
+        row = rows.get((y, m))
+        for entry in calendar_batch.entries_of(row, "planned"):
+            planned.append({**entry, 'annee': y, 'mois': m})
+        for entry in calendar_batch.entries_of(row, "actual"):
+            actual.append({**entry, 'annee': y, 'mois': m})
+    return planned, actual
+
+
+def _week(entry: Dict[str, Any]) -> Tuple[int, int]:
+    return date(entry['annee'], entry['mois'], entry['jour']).isocalendar()[:2]
+
+
+def _month_weeks(year: int, month: int) -> Dict[Tuple[int, int], Set[int]]:
+    """ Semaines ISO touchant le mois -> jours du mois qu'elles contiennent. """
+    weeks: Dict[Tuple[int, int], Set[int]] = {}
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        weeks.setdefault(date(year, month, day).isocalendar()[:2], set()).add(day)
+    return weeks
+
+
+def version_of(planned: List[Dict[str, Any]], actual: List[Dict[str, Any]], duree_hebdo: float, year: int, month: int) -> Dict[str, Any]:
+    """ Version des événements du mois : ce dont dépend le résultat de l'analyseur. """
+    weeks = {week: {"prevu": [], "reel": []} for week in _month_weeks(year, month)}
+    for kind, entries in (("prevu", planned), ("reel", actual)):
+        for entry in entries:
+            week = _week(entry)
+            if week in weeks:
+                weeks[week][kind].append(entry)
+    digests = {}
+    for (iso_year, iso_week), data in weeks.items():
+        for kind in data:
+            data[kind].sort(key=lambda e: (e['annee'], e['mois'], e['jour']))
+        digests[f"{iso_year}-W{iso_week:02d}"] = hashlib.sha256(payslip_hash.canonical_json(data)).hexdigest()[:16]
+    return {"analyseur": ANALYZER_VERSION, "duree_hebdo": duree_hebdo, "semaines": digests}
+
+
+def analyse_month(planned: List[Dict[str, Any]], actual: List[Dict[str, Any]], duree_hebdo: float, year: int, month: int,
+                  employee_name: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Événements de paie du mois ({"periode", "calendrier_analyse", "version"}). `previous` (le
+    résultat enregistré) est repris tel quel s'il est à jour ; sinon seules les semaines dont
+    l'empreinte a changé sont réanalysées.
+    """
+    version = version_of(planned, actual, duree_hebdo, year, month)
+    old_version = (previous or {}).get("version") or {}
+    if old_version == version:
+        return previous
+
+    weeks = _month_weeks(year, month)
+    if old_version.get("analyseur") == version["analyseur"] and old_version.get("duree_hebdo") == duree_hebdo:
+        old_digests = old_version.get("semaines") or {}
+        stale = {w for w in weeks if old_digests.get(f"{w[0]}-W{w[1]:02d}") != version["semaines"][f"{w[0]}-W{w[1]:02d}"]}
+    else:
+        stale = set(weeks)
+    stale_days = set().union(*(weeks[w] for w in stale)) if stale else set()
+
+    kept = [ev for ev in (previous or {}).get("calendrier_analyse") or [] if ev.get('jour') not in stale_days]
+    fresh = []
+    if stale:
+        with metrics.stage("analysis"):
+            fresh = payroll_analyzer.analyser_horaires_du_mois(
+                planned_data_all_months=[e for e in planned if _week(e) in stale],
+                actual_data_all_months=[e for e in actual if _week(e) in stale],
+                duree_hebdo_contrat=duree_hebdo,
+                annee=year,
+                mois=month,
+                employee_name=employee_name
+            )
+    print(f"INFO: Événements de paie {employee_name} {month:02d}/{year} : {len(stale)}/{len(weeks)} semaine(s) réanalysée(s).", file=sys.stderr)
+    # Chaque jour vient entièrement de l'une des deux listes : le tri stable garde l'ordre de l'analyseur.
+    events = sorted(kept + fresh, key=lambda ev: ev['jour'])
+    return {"periode": {"annee": year, "mois": month}, "calendrier_analyse": events, "version": version}
+
+
+def recompute(employee_id: str, months: Iterable[_Period]) -> Dict[_Period, Dict[str, Any]]:
+    """
+    Recalcule et enregistre les événements des mois de `months` qui ont une ligne dans
+    employee_schedules, en une lecture pour tous ; seuls les résultats modifiés sont écrits.
+    """
+    months = sorted(set(months))
+    if not months:
+        return {}
+    employee = supabase.table('employees').select("employee_folder_name, duree_hebdomadaire").eq('id', employee_id).maybe_single().execute()
+    if not employee or not employee.data:
+        raise HTTPException(status_code=404, detail="Employé non trouvé.")
+    employee_name = employee.data['employee_folder_name']
+    duree_hebdo = employee.data.get('duree_hebdomadaire')
+    if not duree_hebdo:
+        raise HTTPException(status_code=400, detail="La durée hebdomadaire du contrat n'est pas définie.")
+
+    start, end = _shift(*months[0], -1), _shift(*months[-1], 1)
+    response = supabase.table('employee_schedules').select("year, month, planned_calendar, actual_hours, payroll_events") \
+        .eq('employee_id', employee_id) \
+        .or_(calendar_batch.period_filter(start, end)) \
+        .execute()
+    rows = {(r['year'], r['month']): r for r in response.data or []}
+
+    results = {}
+    for year, month in months:
+        row = rows.get((year, month))
+        if row is None:
+            continue
+        planned, actual = collect_days(rows, year, month)
+        events = analyse_month(planned, actual, duree_hebdo, year, month, employee_name, previous=row.get('payroll_events'))
+        if events is not row.get('payroll_events'):
+            supabase.table('employee_schedules').update({"payroll_events": events}) \
+                .match({'employee_id': employee_id, 'year': year, 'month': month}) \
+                .execute()
+        results[(year, month)] = events
+    return results
+
+
+def schedule(employee_id: str, year: int, month: int) -> None:
+    """ Planifie le recalcul (différé de DEBOUNCE_SECONDS) après une écriture du calendrier du mois. """
+    with _condition:
+        _, months = _pending.get(employee_id, (0.0, set()))
+        months.update(_shift(year, month, offset) for offset in (-1, 0, 1))
+        _pending[employee_id] = (time.monotonic() + DEBOUNCE_SECONDS, months)
+        _ensure_worker()
+        _condition.notify()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run, name="payroll-events", daemon=True)
+        _worker.start()
+
+
+def _next_batch() -> List[Tuple[str, Set[_Period]]]:
+    with _condition:
+        while True:
+            now = time.monotonic()
+            due = [employee_id for employee_id, (deadline, _) in _pending.items() if deadline <= now]
+            if due:
+                return [(employee_id, _pending.pop(employee_id)[1]) for employee_id in due]
+            next_deadline = min((deadline for deadline, _ in _pending.values()), default=None)
+            _condition.wait(None if next_deadline is None else next_deadline - now)
+
+
+def _run() -> None:
+    while True:
+        for employee_id, months in _next_batch():
+            try:
+                recompute(employee_id, months)
+            except Exception:
+                print(f"ERREUR: Recalcul des événements de paie de {employee_id} échoué :", file=sys.stderr)
+                traceback.print_exc()
@@ -1,23 +1,31 @@
 # backend_api/services/payslip_generator.py
 
 import json
+import os
 import sys
 import subprocess
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
+from typing import Any, Dict, Optional
 from fastapi import HTTPException
 
 from core.config import supabase, PATH_TO_PAYROLL_ENGINE
-from services import payroll_analyzer
+from services import employee_overview, metrics, payroll_events, payslip_hash, signed_urls
 from utils.parsers import parse_if_json_string
 
+# Envois différés des PDF servis directement au client (voir store_payslip_upload_later).
+_storage_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="payslip-storage")
 
 
-def process_payslip_generation(employee_id: str, year: int, month: int):
+def render_payslip(employee_id: str, year: int, month: int, skip_if_hash: Optional[str] = None) -> Dict[str, Any]:
     """
     Workflow de génération de paie "juste à temps", 100% basé sur la BDD,
-    avec une gestion propre des fichiers temporaires.
+    avec une gestion propre des fichiers temporaires. Calcule le bulletin et rend le PDF
+    en mémoire, sans rien enregistrer : voir store_payslip.
+    Si l'empreinte des entrées vaut `skip_if_hash` (celle du bulletin enregistré), le moteur
+    n'est pas lancé et le résultat porte seulement "up_to_date": True.
     """
     files_to_cleanup = []
     try:
@@ -40,14 +48,15 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
             elif m_offset == 13: m_offset, y_offset = (1, y_offset + 1)
             dates_to_process.append({'year': y_offset, 'month': m_offset})
 
-        schedule_res = supabase.table('employee_schedules').select("year, month, planned_calendar, actual_hours") \
+        schedule_res = supabase.table('employee_schedules').select("year, month, planned_calendar, actual_hours, payroll_events") \
             .eq('employee_id', employee_id) \
             .in_('year', [d['year'] for d in dates_to_process]) \
             .in_('month', [d['month'] for d in dates_to_process]) \
             .execute()
 
         prev_month, prev_year = (month - 1, year) if month > 1 else (12, year - 1)
-        cumuls_res = supabase.table('employee_schedules').select("cumuls").match({'employee_id': employee_id, 'year': prev_year, 'month': prev_month}).maybe_single().execute()
+        # Cumuls et événements du mois précédent, en une seule lecture
+        previous_res = supabase.table('employee_schedules').select("cumuls, payroll_events").match({'employee_id': employee_id, 'year': prev_year, 'month': prev_month}).maybe_single().execute()
         saisies_res = supabase.table('monthly_inputs').select("*").match({'employee_id': employee_id, 'year': year, 'month': month}).execute()
         print(f"\nDEBUG [Generator - Étape 1]: Données de saisies brutes lues depuis Supabase -> {json.dumps(saisies_res.data)}\n")
 
@@ -66,8 +75,6 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
             for entry in actual_list:
                 new_entry = entry.copy(); new_entry.update({'annee': y, 'mois': m}); actual_data_all_months.append(new_entry)
 
-        payroll_events_list = payroll_analyzer.analyser_horaires_du_mois(planned_data_all_months, actual_data_all_months, duree_hebdo, year, month, employee_folder_name)
-        payroll_events_json = { "periode": {"annee": year, "mois": month}, "calendrier_analyse": payroll_events_list }
         print(f"\nDEBUG [Generator]: Nombre de saisies trouvées en BDD pour ce mois : {len(saisies_res.data)}\n")
 
         saisies_data = { "periode": {"mois": month, "annee": year}, "primes": [] }
@@ -86,10 +93,32 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
 
         print(f"\nDEBUG [Generator - Étape 2]: Contenu final du JSON de saisies préparé pour le moteur -> {json.dumps(saisies_data)}\n")
 
-        previous_cumuls_data = (cumuls_res.data or {}).get('cumuls') if cumuls_res else None
+        previous_cumuls_data = (previous_res.data or {}).get('cumuls') if previous_res else None
         if previous_cumuls_data is None:
             previous_cumuls_data = { "periode": {"annee_en_cours": year, "dernier_mois_calcule": 0}, "cumuls": { "brut_total": 0.0, "heures_remunerees": 0.0, "reduction_generale_patronale": 0.0, "net_imposable": 0.0, "impot_preleve_a_la_source": 0.0, "heures_supplementaires_remunerees": 0.0 } }
 
+        contrat_json_content = {
+            "salarie": {"nom": employee_data.get('last_name'),"prenom": employee_data.get('first_name'),"nir": employee_data.get('nir'),"date_naissance": employee_data.get('date_naissance'),"lieu_naissance": employee_data.get('lieu_naissance'),"nationalite": employee_data.get('nationalite'),"adresse": parse_if_json_string(employee_data.get('adresse')),"coordonnees_bancaires": parse_if_json_string(employee_data.get('coordonnees_bancaires')),},
+            "contrat": {"date_entree": employee_data.get('hire_date'),"type_contrat": employee_data.get('contract_type'),"statut": employee_data.get('statut'),"emploi": employee_data.get('job_title'),"periode_essai": parse_if_json_string(employee_data.get('periode_essai')),"temps_travail": {"is_temps_partiel": employee_data.get('is_temps_partiel'), "duree_hebdomadaire": employee_data.get('duree_hebdomadaire')}},
+            "remuneration": {"salaire_de_base": parse_if_json_string(employee_data.get('salaire_de_base')),"classification_conventionnelle": parse_if_json_string(employee_data.get('classification_conventionnelle')),"elements_variables": parse_if_json_string(employee_data.get('elements_variables')),"avantages_en_nature": parse_if_json_string(employee_data.get('avantages_en_nature')),},
+            "specificites_paie": parse_if_json_string(employee_data.get('specificites_paie', {})),
+        }
+        payroll_events_M_minus_1 = (previous_res.data or {}).get('payroll_events') if previous_res else {}
+
+        # Empreinte de tout ce que le moteur va lire : inutile de recalculer si elle n'a pas changé.
+        inputs_hash = payslip_hash.input_hash({
+            "periode": {"annee": year, "mois": month}, "dossier": employee_folder_name,
+            "contrat": contrat_json_content, "prevu": planned_data_all_months, "reel": actual_data_all_months,
+            "saisies": saisies_data, "cumuls": previous_cumuls_data, "evenements_precedents": payroll_events_M_minus_1,
+        })
+        if skip_if_hash is not None and inputs_hash == skip_if_hash:
+            print(f"INFO: Bulletin {employee_folder_name} {month:02d}/{year} à jour (entrées inchangées), calcul ignoré.", file=sys.stderr)
+            return {"employee_id": employee_id, "year": year, "month": month, "up_to_date": True, "input_hash": inputs_hash}
+
+        # Événements déjà tenus à jour par le recalcul différé : repris s'ils correspondent aux calendriers.
+        stored_events = (db_data_map.get((year, month)) or {}).get('payroll_events')
+        payroll_events_json = payroll_events.analyse_month(planned_data_all_months, actual_data_all_months, duree_hebdo, year, month, employee_folder_name, previous=stored_events)
+
         # --- ÉTAPE 3 : ÉCRIRE LES FICHIERS TEMPORAIRES ET EXÉCUTER ---
 
         employee_path = PATH_TO_PAYROLL_ENGINE / "data" / "employes" / employee_folder_name
@@ -98,15 +127,11 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
             (employee_path / sub_dir).mkdir(parents=True, exist_ok=True)
 
         def write_temp_json(path: Path, data: dict):
-            path.write_text(json.dumps(data, indent=2, ensure_ascii=False, default=str), encoding='utf-8')
+            content = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+            path.write_text(content, encoding='utf-8')
+            metrics.increment("files.bytes_written", len(content.encode('utf-8')))
             files_to_cleanup.append(path)
 
-        contrat_json_content = {
-            "salarie": {"nom": employee_data.get('last_name'),"prenom": employee_data.get('first_name'),"nir": employee_data.get('nir'),"date_naissance": employee_data.get('date_naissance'),"lieu_naissance": employee_data.get('lieu_naissance'),"nationalite": employee_data.get('nationalite'),"adresse": parse_if_json_string(employee_data.get('adresse')),"coordonnees_bancaires": parse_if_json_string(employee_data.get('coordonnees_bancaires')),},
-            "contrat": {"date_entree": employee_data.get('hire_date'),"type_contrat": employee_data.get('contract_type'),"statut": employee_data.get('statut'),"emploi": employee_data.get('job_title'),"periode_essai": parse_if_json_string(employee_data.get('periode_essai')),"temps_travail": {"is_temps_partiel": employee_data.get('is_temps_partiel'), "duree_hebdomadaire": employee_data.get('duree_hebdomadaire')}},
-            "remuneration": {"salaire_de_base": parse_if_json_string(employee_data.get('salaire_de_base')),"classification_conventionnelle": parse_if_json_string(employee_data.get('classification_conventionnelle')),"elements_variables": parse_if_json_string(employee_data.get('elements_variables')),"avantages_en_nature": parse_if_json_string(employee_data.get('avantages_en_nature')),},
-            "specificites_paie": parse_if_json_string(employee_data.get('specificites_paie', {})),
-        }
         write_temp_json(employee_path / "contrat.json", contrat_json_content)
 
         # Récupérer et écrire les fichiers bruts dont le script final pourrait avoir besoin
@@ -115,8 +140,6 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
 
         # Écrire les fichiers calculés et de saisie
         write_temp_json(employee_path / "evenements_paie" / f"{month:02d}.json", payroll_events_json)
-        events_res_M_minus_1 = supabase.table('employee_schedules').select("payroll_events").match({'employee_id': employee_id, 'year': prev_year, 'month': prev_month}).maybe_single().execute()
-        payroll_events_M_minus_1 = (events_res_M_minus_1.data or {}).get('payroll_events') if events_res_M_minus_1 else {}
         write_temp_json(employee_path / "evenements_paie" / f"{prev_month:02d}.json", payroll_events_M_minus_1)
         write_temp_json(employee_path / "saisies" / f"{month:02d}.json", saisies_data)
         write_temp_json(employee_path / "cumuls" / f"{prev_month:02d}.json", previous_cumuls_data)
@@ -125,7 +148,10 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
         # On utilise le nom du script seul, car `cwd` nous place déjà dans le bon dossier.
         script_name = "generateur_fiche_paie.py"
         command = [sys.executable, script_name, employee_folder_name, str(year), str(month)]
-        proc = subprocess.run(command, capture_output=True, text=True, cwd=PATH_TO_PAYROLL_ENGINE, check=False)
+        engine_env = {**os.environ, metrics.ENGINE_METRICS_ENV: "1"} if metrics.ENABLED else None
+        with metrics.stage("engine"):
+            proc = subprocess.run(command, capture_output=True, text=True, cwd=PATH_TO_PAYROLL_ENGINE, check=False, env=engine_env)
+        metrics.record_engine_metrics(metrics.parse_engine_metrics(proc.stderr))
 
 
         if proc.returncode != 0:
@@ -136,6 +162,7 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
 
         new_cumuls_path = employee_path / "cumuls" / f"{month:02d}.json"
         new_cumuls_json = json.loads(new_cumuls_path.read_text(encoding="utf-8")) if new_cumuls_path.exists() else {}
+        metrics.increment("files.bytes_read", len(proc.stdout.encode('utf-8')) + (new_cumuls_path.stat().st_size if new_cumuls_path.exists() else 0))
         files_to_cleanup.append(new_cumuls_path)
 
         pdf_name = f"Bulletin_{employee_folder_name}_{month:02d}-{year}.pdf"
@@ -144,19 +171,16 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
         files_to_cleanup.append(local_pdf_path)
 
         with open(local_pdf_path, 'rb') as f:
-            supabase.storage.from_("payslips").upload(path=storage_path, file=f.read(), file_options={"x-upsert": "true"})
-
-        signed_url_response = supabase.storage.from_("payslips").create_signed_url(storage_path, 3600, options={'download': True})
-        pdf_url = signed_url_response['signedURL']
-
-        supabase.table('payslips').upsert({
-            "employee_id": employee_id, "month": month, "year": year, "name": pdf_name,
-            "payslip_data": payslip_json_data, "pdf_storage_path": storage_path, "url": pdf_url
-        }).execute()
-
-        supabase.table('employee_schedules').update({"cumuls": new_cumuls_json, "payroll_events": payroll_events_json}).match({'employee_id': employee_id, 'year': year, 'month': month}).execute()
-
-        return { "status": "success", "message": "Bulletin généré avec succès.", "download_url": pdf_url }
+            pdf_bytes = f.read()
+        metrics.increment("files.bytes_read", len(pdf_bytes))
+        metrics.increment("pdf.bytes", len(pdf_bytes))
+        metrics.increment("pdf.count")
+
+        return {
+            "employee_id": employee_id, "year": year, "month": month, "up_to_date": False, "input_hash": inputs_hash,
+            "pdf_name": pdf_name, "storage_path": storage_path, "pdf_bytes": pdf_bytes,
+            "payslip_data": payslip_json_data, "cumuls": new_cumuls_json, "payroll_events": payroll_events_json,
+        }
 
     except Exception as e:
         traceback.print_exc()
@@ -167,3 +191,105 @@ def process_payslip_generation(employee_id: str, year: int, month: int):
                 if path.exists(): path.unlink()
             except Exception as e:
                 print(f"Erreur lors du nettoyage du fichier {path}: {e}", file=sys.stderr)
+
+
+def upload_payslip(rendered: Dict[str, Any]) -> str:
+    """ Envoie le PDF rendu dans le stockage et retourne son lien signé. """
+    storage_path = rendered["storage_path"]
+    supabase.storage.from_("payslips").upload(path=storage_path, file=rendered["pdf_bytes"], file_options={"x-upsert": "true"})
+    signed_urls.record_upload("payslips", storage_path)
+    # Lien de la réponse ; la colonne `url` n'est qu'indicative, les routes de lecture re-signent via le cache.
+    return signed_urls.sign_one("payslips", storage_path, download=True)
+
+
+def record_payslip(rendered: Dict[str, Any], pdf_url: Optional[str] = None) -> None:
+    """
+    Enregistre en BDD le bulletin (données, chemin du PDF), les cumuls et les événements du mois.
+    L'empreinte des entrées n'est écrite qu'avec le lien, une fois le PDF stocké : un bulletin
+    n'est jamais considéré à jour (render_if_changed) avant que son PDF soit dans le stockage.
+    """
+    employee_id, year, month = rendered["employee_id"], rendered["year"], rendered["month"]
+    row = {
+        "employee_id": employee_id, "month": month, "year": year, "name": rendered["pdf_name"],
+        "payslip_data": rendered["payslip_data"], "pdf_storage_path": rendered["storage_path"],
+    }
+    if pdf_url is not None:
+        row.update({"url": pdf_url, "input_hash": rendered["input_hash"]})
+    supabase.table('payslips').upsert(row).execute()
+
+    supabase.table('employee_schedules').update({"cumuls": rendered["cumuls"], "payroll_events": rendered["payroll_events"]}).match({'employee_id': employee_id, 'year': year, 'month': month}).execute()
+    employee_overview.invalidate(employee_id)
+
+
+def store_payslip(rendered: Dict[str, Any]) -> str:
+    """ Envoie le PDF rendu dans le stockage, enregistre le bulletin et les cumuls, retourne le lien signé. """
+    pdf_url = upload_payslip(rendered)
+    record_payslip(rendered, pdf_url)
+    return pdf_url
+
+
+def _upload_quietly(rendered: Dict[str, Any]) -> None:
+    employee_id, year, month = rendered["employee_id"], rendered["year"], rendered["month"]
+    try:
+        pdf_url = upload_payslip(rendered)
+        supabase.table('payslips').update({"url": pdf_url, "input_hash": rendered["input_hash"]}) \
+            .match({'employee_id': employee_id, 'year': year, 'month': month}) \
+            .execute()
+        employee_overview.invalidate(employee_id)
+        print(f"INFO: PDF {rendered['storage_path']} envoyé dans le stockage en arrière-plan.", file=sys.stderr)
+    except Exception:
+        # Sans empreinte enregistrée, le prochain appel recalcule et renvoie le bulletin.
+        print(f"ERREUR: Envoi en arrière-plan du PDF {rendered['storage_path']} échoué :", file=sys.stderr)
+        traceback.print_exc()
+
+
+def store_payslip_upload_later(rendered: Dict[str, Any]) -> Future:
+    """
+    Pour un PDF servi directement au client : le bulletin, les cumuls et les événements sont
+    enregistrés en BDD tout de suite (avant la réponse) ; seul l'envoi du PDF dans le stockage
+    se poursuit en arrière-plan.
+    """
+    record_payslip(rendered)
+    return _storage_executor.submit(_upload_quietly, rendered)
+
+
+def stored_payslip(employee_id: str, year: int, month: int) -> Optional[Dict[str, Any]]:
+    """ Empreinte et chemin du bulletin déjà enregistré pour ce mois (None s'il n'y en a pas). """
+    res = supabase.table('payslips').select("input_hash, pdf_storage_path").match({'employee_id': employee_id, 'year': year, 'month': month}).maybe_single().execute()
+    return res.data if res else None
+
+
+def render_if_changed(employee_id: str, year: int, month: int, force: bool = False) -> Dict[str, Any]:
+    """
+    Comme render_payslip, mais sans relancer le moteur si les entrées du bulletin enregistré sont
+    inchangées (sauf `force`). Un bulletin à jour porte le chemin du PDF déjà stocké.
+    """
+    stored = None if force else stored_payslip(employee_id, year, month)
+    known_hash = stored.get('input_hash') if stored and stored.get('pdf_storage_path') else None
+    rendered = render_payslip(employee_id, year, month, skip_if_hash=known_hash)
+    if rendered["up_to_date"]:
+        rendered["storage_path"] = stored['pdf_storage_path']
+        rendered["pdf_name"] = stored['pdf_storage_path'].split('/')[-1]
+    return rendered
+
+
+def stored_pdf_bytes(rendered: Dict[str, Any]) -> bytes:
+    """ PDF déjà stocké d'un bulletin à jour. """
+    return supabase.storage.from_("payslips").download(rendered["storage_path"])
+
+
+def process_payslip_generation(employee_id: str, year: int, month: int, force: bool = False):
+    """
+    Génère le bulletin, l'enregistre et retourne son lien de téléchargement. Un bulletin dont les
+    entrées n'ont pas changé n'est pas recalculé (statut "up_to_date"), sauf `force`.
+    """
+    rendered = render_if_changed(employee_id, year, month, force)
+    try:
+        if rendered["up_to_date"]:
+            pdf_url = signed_urls.sign_one("payslips", rendered["storage_path"], download=True)
+            return { "status": "up_to_date", "message": "Bulletin déjà à jour : entrées inchangées depuis la dernière génération.", "download_url": pdf_url, "storage_path": rendered["storage_path"] }
+        pdf_url = store_payslip(rendered)
+        return { "status": "success", "message": "Bulletin généré avec succès.", "download_url": pdf_url, "storage_path": rendered["storage_path"] }
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,64 @@
+# backend_api/services/payslip_hash.py
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import PATH_TO_PAYROLL_ENGINE
+
+# Empreinte des entrées d'un bulletin.
+#
+# Un bulletin ne dépend que de ce que le générateur écrit pour le moteur (contrat, calendriers,
+# saisies, cumuls et événements du mois précédent) et de la version du moteur et de ses barèmes.
+# L'empreinte est le SHA-256 de ces entrées sérialisées de façon canonique (clés triées, séparateurs
+# fixes) : si elle est identique à celle du bulletin enregistré, le recalcul est inutile.
+
+# Fichiers dont dépend le résultat du moteur, hors données du salarié (motifs relatifs à PATH_TO_PAYROLL_ENGINE)
+ENGINE_SOURCES = (
+    "data/*.json",
+    "data/historique/**/*.json",
+    "moteur_paie/**/*.py",
+    "generateur_fiche_paie.py",
+    "templates/*",
+)
+
+_version: Optional[Tuple[Tuple, str]] = None
+_lock = threading.Lock()
+
+
+def _engine_files() -> List[Path]:
+    files = set()
+    for pattern in ENGINE_SOURCES:
+        files.update(p for p in PATH_TO_PAYROLL_ENGINE.glob(pattern) if p.is_file())
+    return sorted(files)
+
+
+def engine_version() -> str:
+    """
+    Empreinte des barèmes, du code du moteur et du gabarit du bulletin. Recalculée seulement
+    quand l'un des fichiers change de (mtime, taille), par exemple après une réconciliation.
+    """
+    global _version
+    files = _engine_files()
+    signature = tuple((str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+    current = _version
+    if current is not None and current[0] == signature:
+        return current[1]
+    with _lock:
+        digest = hashlib.sha256()
+        for p in files:
+            digest.update(str(p.relative_to(PATH_TO_PAYROLL_ENGINE)).encode("utf-8") + b"\0")
+            digest.update(p.read_bytes())
+        _version = (signature, digest.hexdigest())
+        return _version[1]
+
+
+def canonical_json(data: Any) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def input_hash(inputs: Dict[str, Any]) -> str:
+    """ Empreinte des entrées d'un bulletin, version du moteur et des barèmes comprise. """
+    return hashlib.sha256(canonical_json({"inputs": inputs, "engine": engine_version()})).hexdigest()
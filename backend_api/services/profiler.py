@@ -0,0 +1,149 @@
+# backend_api/services/profiler.py
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Profilage par échantillonnage des requêtes lentes.
+#
+# Quand PAYROLL_PROFILE_THRESHOLD_MS est défini, les routes qui s'enveloppent dans
+# `profile_if_slow(nom)` sont échantillonnées pendant leur exécution : un thread relève la pile
+# du thread de la requête toutes les PAYROLL_PROFILE_INTERVAL_MS millisecondes (sys._current_frames,
+# sans dépendance externe). Si la requête dépasse le seuil, les piles agrégées sont écrites sous
+# l'identifiant de requête (en-tête X-Request-ID) : format "collapsed" (flamegraph.pl, speedscope)
+# et fichier speedscope. Sinon les échantillons sont jetés. Le moteur de paie tourne dans un
+# sous-processus : il apparaît comme l'attente de subprocess.run, son détail est dans les métriques.
+
+THRESHOLD_MS = float(os.getenv("PAYROLL_PROFILE_THRESHOLD_MS", "0") or 0)
+INTERVAL_MS = float(os.getenv("PAYROLL_PROFILE_INTERVAL_MS", "5") or 5)
+PROFILE_DIR = Path(os.getenv("PAYROLL_PROFILE_DIR", Path(__file__).resolve().parent.parent / "profiles"))
+MAX_DEPTH = 128
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("payroll_request_id", default=None)
+
+
+def new_request_id(incoming: Optional[str] = None) -> contextvars.Token:
+    """Fixe l'identifiant de la requête en cours (celui du client s'il est fourni et raisonnable)."""
+    if not incoming or len(incoming) > 64 or not all(c.isalnum() or c in "-_" for c in incoming):
+        incoming = uuid.uuid4().hex
+    return _request_id.set(incoming)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id.reset(token)
+
+
+def _frame_label(frame) -> Tuple[str, str, int]:
+    code = frame.f_code
+    return code.co_name, code.co_filename, code.co_firstlineno
+
+
+class _Sampler(threading.Thread):
+    """Relève périodiquement la pile d'un thread et compte les piles identiques."""
+
+    def __init__(self, thread_ident: int, interval: float):
+        super().__init__(name="payroll-profiler", daemon=True)
+        self.thread_ident = thread_ident
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_ident)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+def collapsed_stacks(samples: Counter) -> str:
+    """Format "collapsed" : une pile par ligne, cadres séparés par ';', suivie du nombre d'échantillons."""
+    lines = []
+    for stack, count in samples.most_common():
+        frames = ";".join(f"{name} ({Path(filename).name}:{line})" for name, filename, line in stack)
+        lines.append(f"{frames} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def speedscope_profile(samples: Counter, name: str, interval_ms: float) -> Dict:
+    """Profil échantillonné au format de fichier speedscope (https://www.speedscope.app)."""
+    frames: List[Dict] = []
+    index: Dict[Tuple[str, str, int], int] = {}
+    stacks, weights = [], []
+    for stack, count in samples.most_common():
+        ids = []
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            ids.append(index[frame])
+        stacks.append(ids)
+        weights.append(round(count * interval_ms, 3))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "backend_api/services/profiler.py",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "milliseconds",
+            "startValue": 0, "endValue": round(sum(weights), 3),
+            "samples": stacks, "weights": weights,
+        }],
+    }
+
+
+def _write_profile(samples: Counter, route: str, elapsed_ms: float) -> Optional[Path]:
+    request_id = current_request_id() or uuid.uuid4().hex
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    base = PROFILE_DIR / f"{request_id}_{route}"
+    title = f"{route} {request_id} ({elapsed_ms:.0f} ms)"
+    Path(f"{base}.collapsed.txt").write_text(collapsed_stacks(samples), encoding="utf-8")
+    Path(f"{base}.speedscope.json").write_text(json.dumps(speedscope_profile(samples, title, INTERVAL_MS)), encoding="utf-8")
+    return base
+
+
+@contextmanager
+def profile_if_slow(route: str, threshold_ms: Optional[float] = None):
+    """
+    Échantillonne le bloc ; au-delà du seuil, écrit le profil dans PROFILE_DIR
+    (<request_id>_<route>.collapsed.txt et .speedscope.json).
+    """
+    threshold = THRESHOLD_MS if threshold_ms is None else threshold_ms
+    if threshold <= 0:
+        yield
+        return
+
+    sampler = _Sampler(threading.get_ident(), INTERVAL_MS / 1000.0)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples = sampler.stop()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= threshold and samples:
+            try:
+                base = _write_profile(samples, route, elapsed_ms)
+                print(f"INFO: Requête lente {route} ({elapsed_ms:.0f} ms > {threshold:.0f} ms), profil écrit : {base}.*", file=sys.stderr)
+            except OSError as e:
+                print(f"AVERTISSEMENT: Profil de {route} non écrit : {e}", file=sys.stderr)
@@ -0,0 +1,124 @@
+# backend_api/services/reference_data.py
+
+import gzip
+import json
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+
+# Cache mémoire des données de référence (barèmes, catalogue de primes...).
+#
+# Chaque ressource déclare les fichiers dont elle dépend : tant que leur (mtime, taille) ne
+# change pas, la réponse JSON, sa version gzip et son ETag sont servis tels quels, sans relire
+# ni re-sérialiser quoi que ce soit. Une réécriture du barème par la réconciliation invalide
+# donc l'entrée au prochain appel.
+
+GZIP_MIN_BYTES = 1024
+
+
+class _Entry:
+    __slots__ = ("signature", "expires_at", "data", "body", "body_gzip", "etag")
+
+    def __init__(self, signature, expires_at, data, body, body_gzip, etag):
+        self.signature = signature
+        self.expires_at = expires_at
+        self.data = data
+        self.body = body
+        self.body_gzip = body_gzip
+        self.etag = etag
+
+
+_registry: Dict[str, Tuple[Callable[[], List[Path]], Callable[[], Any], Optional[float]]] = {}
+_entries: Dict[str, _Entry] = {}
+_lock = threading.Lock()
+
+
+def register(name: str, sources: Callable[[], List[Path]], builder: Callable[[], Any], ttl: Optional[float] = None) -> None:
+    """
+    Déclare une ressource. `builder` produit la donnée (sérialisable JSON) à partir des fichiers
+    `sources()`. `ttl` (secondes) borne la durée de vie d'une entrée dont le contenu dépend
+    aussi de l'heure (ex: statuts de fraîcheur).
+    """
+    _registry[name] = (sources, builder, ttl)
+    _entries.pop(name, None)
+
+
+def _signature(paths: List[Path]) -> Tuple:
+    sig = []
+    for p in paths:
+        try:
+            st = p.stat()
+            sig.append((str(p), st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append((str(p), None, None))
+    return tuple(sig)
+
+
+def _build(name: str, signature: Tuple) -> _Entry:
+    _, builder, ttl = _registry[name]
+    data = builder()
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body_gzip = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    expires_at = time.monotonic() + ttl if ttl else None
+    return _Entry(signature, expires_at, data, body, body_gzip, etag)
+
+
+def get(name: str) -> _Entry:
+    """Retourne l'entrée à jour pour `name`, en la reconstruisant si ses sources ont changé."""
+    sources, _, _ = _registry[name]
+    signature = _signature(sources())
+    entry = _entries.get(name)
+    if entry is not None and entry.signature == signature and (entry.expires_at is None or time.monotonic() < entry.expires_at):
+        return entry
+    with _lock:
+        entry = _entries.get(name)
+        if entry is None or entry.signature != signature or (entry.expires_at is not None and time.monotonic() >= entry.expires_at):
+            entry = _build(name, signature)
+            _entries[name] = entry
+        return entry
+
+
+def get_data(name: str) -> Any:
+    """Donnée désérialisée de la ressource (pour un usage interne, ex: validation)."""
+    return get(name).data
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    with _lock:
+        if name is None:
+            _entries.clear()
+        else:
+            _entries.pop(name, None)
+
+
+def _etag_matches(if_none_match: Optional[str], etags: List[str]) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return any(e in candidates for e in etags)
+
+
+def respond(request: Request, name: str) -> Response:
+    """
+    Réponse HTTP précalculée : 304 si le client possède déjà la version courante (If-None-Match),
+    sinon le corps JSON, compressé en gzip quand le client l'accepte.
+    """
+    entry = get(name)
+    use_gzip = entry.body_gzip is not None and "gzip" in request.headers.get("accept-encoding", "")
+    # Une représentation gzip est une autre suite d'octets : elle a son propre ETag fort.
+    etag = entry.etag[:-1] + '-gz"' if use_gzip else entry.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if _etag_matches(request.headers.get("if-none-match"), [entry.etag, entry.etag[:-1] + '-gz"']):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.body_gzip, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
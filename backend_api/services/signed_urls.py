@@ -0,0 +1,107 @@
+# backend_api/services/signed_urls.py
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config import supabase
+
+# URLs signées des fichiers du stockage (bulletins, contrats), en cache.
+#
+# Une URL est signée pour SIGNED_URL_SECONDS et resservie tant qu'il lui reste au moins
+# SAFETY_MARGIN_SECONDS de validité : un lien affiché reste ainsi utilisable un bon moment
+# après le chargement de la page. Les chemins manquants sont signés en un seul appel par bucket
+# (par paquets de BATCH_SIZE), quel que soit le nombre de salariés concernés.
+#
+# L'existence des objets n'est plus vérifiée en listant les dossiers du stockage :
+#   - les fichiers que l'API écrit ou supprime sont notés par record_upload / record_removal ;
+#   - un chemin inconnu est simplement signé : le stockage refuse de signer un objet absent,
+#     et ce refus est gardé MISSING_TTL_SECONDS (les contrats sont déposés hors de l'API).
+
+SIGNED_URL_SECONDS = int(os.getenv("SIGNED_URL_SECONDS", "3600"))
+SAFETY_MARGIN_SECONDS = int(os.getenv("SIGNED_URL_SAFETY_MARGIN_SECONDS", "600"))
+MISSING_TTL_SECONDS = int(os.getenv("SIGNED_URL_MISSING_TTL_SECONDS", "60"))
+BATCH_SIZE = 100
+
+_Key = Tuple[str, str, bool]
+
+# (bucket, chemin, téléchargement) -> (url, instant d'expiration en time.monotonic())
+_urls: Dict[_Key, Tuple[str, float]] = {}
+# (bucket, chemin) -> instant jusqu'auquel l'objet est tenu pour absent
+_missing: Dict[Tuple[str, str], float] = {}
+_lock = threading.Lock()
+
+
+def record_upload(bucket: str, path: str) -> None:
+    """ L'API vient d'écrire l'objet : une URL signée avant l'écriture reste valable, l'absence ne l'est plus. """
+    with _lock:
+        _missing.pop((bucket, path), None)
+
+
+def record_removal(bucket: str, path: str) -> None:
+    """ L'API vient de supprimer l'objet : ses URLs en cache sont oubliées. """
+    with _lock:
+        for download in (False, True):
+            _urls.pop((bucket, path, download), None)
+        _missing[(bucket, path)] = time.monotonic() + MISSING_TTL_SECONDS
+
+
+def _cached(bucket: str, paths: Iterable[str], download: bool, now: float) -> Tuple[Dict[str, Optional[str]], List[str]]:
+    found: Dict[str, Optional[str]] = {}
+    to_sign: List[str] = []
+    with _lock:
+        for path in paths:
+            if path in found or path in to_sign:
+                continue
+            entry = _urls.get((bucket, path, download))
+            if entry is not None and entry[1] - now >= SAFETY_MARGIN_SECONDS:
+                found[path] = entry[0]
+            elif _missing.get((bucket, path), 0) > now:
+                found[path] = None
+            else:
+                to_sign.append(path)
+    return found, to_sign
+
+
+def sign(bucket: str, paths: Iterable[str], download: bool = False) -> Dict[str, Optional[str]]:
+    """
+    URLs signées de `paths` dans `bucket` ({chemin: url}, None pour un objet absent).
+    Seuls les chemins sans URL en cache suffisamment longue sont envoyés au stockage.
+    """
+    now = time.monotonic()
+    result, to_sign = _cached(bucket, paths, download, now)
+    options = {'download': True} if download else {}
+    for start in range(0, len(to_sign), BATCH_SIZE):
+        batch = to_sign[start:start + BATCH_SIZE]
+        response = supabase.storage.from_(bucket).create_signed_urls(batch, SIGNED_URL_SECONDS, options=options)
+        if isinstance(response, dict) and response.get('error'):
+            raise Exception(f"Erreur Supabase Storage: {response.get('message')}")
+        # Expiration comptée depuis l'envoi de la demande, pour ne jamais la surestimer.
+        expires_at = now + SIGNED_URL_SECONDS
+        signed = {item.get('path'): item.get('signedURL') for item in response if item.get('path')}
+        if not signed:
+            # Anciennes versions du client : réponses dans l'ordre des chemins, sans le chemin.
+            signed = {path: item.get('signedURL') for path, item in zip(batch, response)}
+        with _lock:
+            for path in batch:
+                url = signed.get(path)
+                if url:
+                    _urls[(bucket, path, download)] = (url, expires_at)
+                else:
+                    _missing[(bucket, path)] = now + MISSING_TTL_SECONDS
+                result[path] = url or None
+    if to_sign:
+        print(f"DEBUG: {len(to_sign)} URL(s) signée(s) dans '{bucket}', {len(result) - len(to_sign)} servie(s) depuis le cache.", file=sys.stderr)
+    return result
+
+
+def sign_one(bucket: str, path: str, download: bool = False) -> Optional[str]:
+    return sign(bucket, [path], download)[path]
+
+
+def clear() -> None:
+    with _lock:
+        _urls.clear()
+        _missing.clear()
@@ -0,0 +1,42 @@
+# backend_api/utils/zip_stream.py
+
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+
+class _ChunkBuffer:
+    """ Flux d'écriture non positionnable : zipfile y écrit, on récupère les octets au fil de l'eau. """
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Archive ZIP produite à la volée : chaque (nom, contenu) est compressé puis émis dès qu'il
+    est disponible, sans attendre les suivants ni garder l'archive entière en mémoire.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            archive.writestr(name, content)
+            yield buffer.drain()
+    # Répertoire central, écrit à la fermeture de l'archive
+    yield buffer.drain()
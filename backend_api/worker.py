@@ -0,0 +1,136 @@
+# backend_api/worker.py
+#
+# Processus d'exécution de la file de travaux (services/job_queue.py) : génération de bulletins,
+# recalcul des événements de paie. Chaque processus prend un travail à la fois ; la limite de
+# travaux simultanés par client est appliquée par la file, quel que soit le nombre de processus.
+#
+#   python worker.py                  # JOBS_WORKER_PROCESSES processus, jusqu'à SIGINT / SIGTERM
+#   python worker.py --processes 4
+#   python worker.py --once           # traite les travaux exécutables puis s'arrête (un processus)
+
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from services import job_queue
+
+PROCESSES = int(os.getenv("JOBS_WORKER_PROCESSES", "2"))
+POLL_SECONDS = float(os.getenv("JOBS_POLL_SECONDS", "1"))
+PURGE_INTERVAL_SECONDS = 3600
+SUPERVISE_SECONDS = 5
+
+_stop = threading.Event()
+
+
+def _heartbeat(job_id: str, name: str, done: threading.Event) -> None:
+    while not done.wait(job_queue.LEASE_SECONDS / 3):
+        try:
+            job_queue.heartbeat(job_id, name)
+        except Exception as e:
+            print(f"AVERTISSEMENT: [{name}] Prolongation du bail de {job_id} impossible : {e}", file=sys.stderr)
+
+
+def execute(job: dict, name: str) -> None:
+    """ Exécute un travail pris et enregistre son résultat ou son échec. """
+    fn = job_queue.HANDLERS.get(job["kind"])
+    if fn is None:
+        job_queue.fail(job["id"], name, f"type de travail inconnu : {job['kind']}", retry=False)
+        return
+    print(f"INFO: [{name}] {job['kind']} {job['id']} (tentative {job['attempts']}/{job['max_attempts']}, client {job['tenant']})", file=sys.stderr)
+    done = threading.Event()
+    threading.Thread(target=_heartbeat, args=(job["id"], name, done), daemon=True).start()
+    start = time.perf_counter()
+    try:
+        result = fn(job["payload"])
+    except job_queue.PermanentJobError as e:
+        job_queue.fail(job["id"], name, str(e), retry=False)
+        print(f"ERREUR: [{name}] {job['kind']} {job['id']} en échec définitif : {e}", file=sys.stderr)
+        return
+    except Exception as e:
+        traceback.print_exc()
+        status = job_queue.fail(job["id"], name, f"{type(e).__name__}: {e}")
+        print(f"ERREUR: [{name}] {job['kind']} {job['id']} en échec ({'relancé plus tard' if status == 'queued' else 'tentatives épuisées'}).", file=sys.stderr)
+        return
+    finally:
+        done.set()
+    job_queue.complete(job["id"], name, result)
+    print(f"INFO: [{name}] {job['kind']} {job['id']} terminé en {time.perf_counter() - start:.2f} s.", file=sys.stderr)
+
+
+def run(name: str, once: bool = False) -> None:
+    """ Boucle d'un processus : prend et exécute les travaux jusqu'à SIGINT / SIGTERM (ou file vide avec `once`). """
+    # Arrêt propre : le travail en cours se termine avant la sortie.
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    from services import job_handlers  # enregistre les HANDLERS (importe le client Supabase)
+    # Identifiant unique du processus : un worker relancé ne peut pas clore un travail repris par un autre.
+    name = f"{name}/{os.getpid()}"
+
+    print(f"--- Worker {name} démarré ---", file=sys.stderr)
+    while not stop.is_set():
+        try:
+            job = job_queue.claim(name)
+        except Exception as e:
+            print(f"AVERTISSEMENT: [{name}] File de travaux indisponible : {e}", file=sys.stderr)
+            job = None
+        if job is None:
+            if once:
+                break
+            stop.wait(POLL_SECONDS)
+            continue
+        execute(job, name)
+    print(f"--- Worker {name} arrêté ---", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
+    processes = int(args[args.index("--processes") + 1]) if "--processes" in args else PROCESSES
+
+    if "--once" in args:
+        run("worker-1", once=True)
+        return
+
+    # "spawn" : chaque processus ouvre ses propres connexions (Supabase, SQLite).
+    context = multiprocessing.get_context("spawn")
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: _stop.set())
+    workers = {}
+    for i in range(processes):
+        name = f"worker-{i + 1}"
+        workers[name] = context.Process(target=run, args=(name,), name=name)
+        workers[name].start()
+
+    print(f"--- File de travaux : {processes} processus, {job_queue.MAX_RUNNING_PER_TENANT} travaux simultanés max par client ---", file=sys.stderr)
+    next_purge = 0.0
+    while not _stop.is_set():
+        # Un processus mort (erreur fatale, OOM) est relancé ; son travail revient en file à l'expiration du bail.
+        for name, process in list(workers.items()):
+            if not process.is_alive() and not _stop.is_set():
+                print(f"AVERTISSEMENT: {name} arrêté (code {process.exitcode}), relance.", file=sys.stderr)
+                workers[name] = context.Process(target=run, args=(name,), name=name)
+                workers[name].start()
+        if time.monotonic() >= next_purge:
+            next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+            try:
+                purged = job_queue.purge()
+                if purged:
+                    print(f"INFO: {purged} travail(aux) terminé(s) purgé(s).", file=sys.stderr)
+            except Exception as e:
+                print(f"AVERTISSEMENT: Purge de la file impossible : {e}", file=sys.stderr)
+        _stop.wait(SUPERVISE_SECONDS)
+    # SIGTERM : chaque processus termine son travail en cours puis s'arrête.
+    for process in workers.values():
+        if process.is_alive():
+            process.terminate()
+    for process in workers.values():
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# benchmark/bench_paie.py
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from generateur_fiche_paie import calculer_bulletin, generer_pdf
+from moteur_paie.analyser_horaires import analyser_horaires_du_mois
+from moteur_paie.baremes_timeline import charger_baremes
+from moteur_paie.calcul_reduction_generale import calculer_reduction_generale, calculer_reduction_generale_lot
+from moteur_paie.calendrier import fin_du_mois, mois_couverts, periode_de_paie, regle_entreprise
+from moteur_paie.contexte import ContextePaie
+from moteur_paie.metriques import Chronometre
+from benchmark.population import PROFILS, ecrire_salarie, generer_salarie
+
+# Benchmark de bout en bout de la chaîne de paie.
+#
+# Pour chaque taille de population, des salariés fictifs (benchmark/population.py) sont écrits
+# un par un dans un dossier temporaire puis passés dans la chaîne réelle : analyse des horaires,
+# contexte, brut, cotisations, réduction générale, net, assemblage du bulletin et PDF (sur un
+# échantillon, le rendu étant de loin l'étape la plus lente). Chaque étape est chronométrée par
+# salarié ; les moyennes sont comparées aux références enregistrées dans references.json et le
+# script sort en erreur (code 1) si une étape régresse au-delà de la tolérance.
+#
+# Les références ne sont pas des millisecondes : chaque exécution chronomètre d'abord une boucle
+# d'étalonnage fixe (Python pur, dictionnaires, flottants, JSON, comme la chaîne de paie) et les
+# durées sont exprimées en multiples de cette boucle. Une machine deux fois plus lente mesure des
+# étapes et une boucle deux fois plus longues : la comparaison ne dépend pas de la machine.
+#
+# Le calcul en lot de la réduction générale (calculer_reduction_generale_lot) est aussi vérifié
+# à chaque exécution contre le calcul mensuel chaîné par les cumuls, au centime près.
+#
+# À lancer depuis backend_calculs/ :
+#   python -m benchmark.bench_paie --tailles 1 100 10000
+#   python -m benchmark.bench_paie --tailles 100 --enregistrer   (met à jour les références)
+
+ETAPES = ("analyse", "contexte", "brut", "cotisations", "reduction", "net", "bulletin", "pdf")
+TAILLES_PAR_DEFAUT = (1, 100)
+FICHIER_REFERENCES = Path(__file__).parent / 'references.json'
+TOLERANCE_PAR_DEFAUT = 0.25
+# En dessous de cet écart absolu (ms par salarié), une hausse est considérée comme du bruit.
+PLANCHER_MS = 0.05
+REPETITIONS_ETALON = 7
+
+
+def _boucle_etalon() -> float:
+    """Charge de référence : accès dictionnaire, arrondis de flottants et aller-retour JSON."""
+    lignes: Dict[str, float] = {}
+    total = 0.0
+    for i in range(20000):
+        cle = f"ligne_{i % 500}"
+        lignes[cle] = lignes.get(cle, 0.0) + i * 1.0001
+        total += round(lignes[cle] * 0.0755, 2)
+    json.loads(json.dumps(lignes))
+    return total
+
+
+def mesurer_etalon(repetitions: int = REPETITIONS_ETALON) -> float:
+    """Durée de la boucle d'étalonnage en ms (la plus courte des répétitions, après un tour à vide)."""
+    _boucle_etalon()
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        _boucle_etalon()
+        durees.append((time.perf_counter() - debut) * 1000)
+    return min(durees)
+
+
+def _analyser(chemin_employe: Path, annee: int, mois: int, duree_hebdo: float, chrono: Chronometre, mois_a_analyser) -> None:
+    """Analyse des horaires de chaque mois de la période, comme le fait analyser_horaires.py."""
+    with chrono.etape("analyse"):
+        for a, m in mois_a_analyser:
+            evenements = analyser_horaires_du_mois(chemin_employe, a, m, duree_hebdo)
+            sortie = {"periode": {"annee": a, "mois": m}, "calendrier_analyse": evenements}
+            (chemin_employe / 'evenements_paie' / f'{m:02d}.json').write_text(json.dumps(sortie, ensure_ascii=False), encoding='utf-8')
+
+
+def executer(taille: int, annee: int, mois: int, graine: int = 0, echantillon_pdf: int = 5) -> Dict[str, Any]:
+    """Passe `taille` salariés fictifs dans la chaîne et retourne les statistiques par étape."""
+    chrono = Chronometre()
+    entreprise = json.loads(Path('data/entreprise.json').read_text(encoding='utf-8')).get('entreprise', {})
+    debut_periode, fin_periode = periode_de_paie(annee, mois, *regle_entreprise(entreprise))
+    mois_a_analyser = mois_couverts(debut_periode, fin_periode)
+    pdf_disponible = echantillon_pdf > 0
+    etalon_ms = mesurer_etalon()
+
+    debut = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="bench_paie_") as racine, \
+            open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        for i in range(taille):
+            nom, fichiers = generer_salarie(i, annee, mois, graine)
+            chemin_employe = ecrire_salarie(Path(racine) / nom, fichiers)
+            duree_hebdo = fichiers['contrat.json']['contrat']['temps_travail']['duree_hebdomadaire']
+
+            _analyser(chemin_employe, annee, mois, duree_hebdo, chrono, mois_a_analyser)
+            calcul = calculer_bulletin(chemin_employe, annee, mois, chrono.etape)
+            if pdf_disponible and i < echantillon_pdf:
+                try:
+                    with chrono.etape("pdf"):
+                        generer_pdf(calcul["bulletin"])
+                except OSError as e:
+                    # WeasyPrint sans ses bibliothèques système : on mesure le reste de la chaîne.
+                    print(f"AVERTISSEMENT: Étape PDF ignorée ({e}).", file=sys.__stderr__)
+                    chrono.durees.pop("pdf", None)
+                    pdf_disponible = False
+            # Un dossier à la fois : l'espace disque reste borné même à 100 000 salariés.
+            shutil.rmtree(chemin_employe)
+    duree_totale = time.perf_counter() - debut
+
+    return {
+        "taille": taille,
+        "periode": f"{mois:02d}/{annee}",
+        "duree_totale_s": round(duree_totale, 3),
+        "salaries_par_seconde": round(taille / duree_totale, 1) if duree_totale > 0 else None,
+        "etalon_ms": round(etalon_ms, 4),
+        "etapes": chrono.statistiques(ETAPES),
+    }
+
+
+def verifier_reduction_lot(taille: int, annee: int, graine: int = 0) -> List[str]:
+    """
+    Écarts entre calculer_reduction_generale_lot et calculer_reduction_generale enchaîné mois
+    par mois via les cumuls, sur `taille` salariés fictifs de janvier à décembre.
+    """
+    rng = random.Random(graine)
+    entreprise = json.loads(Path('data/entreprise.json').read_text(encoding='utf-8')).get('entreprise', {})
+    baremes_par_mois = [charger_baremes('data', fin_du_mois(annee, m)) for m in range(1, 13)]
+    # Revalorisation fictive du SMIC au 1er juillet : le cas où le SMIC de référence cumulé diffère
+    # selon qu'on l'applique aux heures cumulées ou mois par mois.
+    for m in range(6, 12):
+        b = baremes_par_mois[m]
+        baremes_par_mois[m] = {**b, 'smic': {**b.get('smic', {}), 'cas_general': round(b.get('smic', {}).get('cas_general', 0.0) * 1.02, 2)}}
+    bruts, heures = [], []
+    for _ in range(taille):
+        _, _, _, durees, salaire_min, salaire_max = rng.choices(PROFILS, weights=[p[1] for p in PROFILS])[0]
+        heures_mois = round(rng.choice(durees) * 52 / 12, 2)
+        # Variations du mois (heures supplémentaires, absences, primes), et quelques mois sans paie.
+        bruts.append([0.0 if rng.random() < 0.05 else round(rng.uniform(salaire_min, salaire_max) * rng.uniform(0.8, 1.3), 2) for _ in range(12)])
+        heures.append([round(heures_mois * rng.uniform(0.9, 1.1), 2) for _ in range(12)])
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        lot = calculer_reduction_generale_lot(bruts, heures, baremes_par_mois, entreprise)
+        ecarts = []
+        for s, (ligne_bruts, ligne_heures) in enumerate(zip(bruts, heures)):
+            cumuls = {"brut_total": 0.0, "heures_remunerees": 0.0, "reduction_generale_patronale": 0.0}
+            for m in range(12):
+                contexte = ContextePaie.depuis_donnees({}, entreprise, baremes_par_mois[m], {"cumuls": dict(cumuls)})
+                ligne = calculer_reduction_generale(contexte, ligne_bruts[m], ligne_heures[m])
+                montant = ligne.montant_patronal if ligne else 0.0
+                # Mise à jour des cumuls comme generateur_fiche_paie.py
+                cumuls["brut_total"] += ligne_bruts[m]
+                cumuls["heures_remunerees"] += ligne_heures[m]
+                if ligne:
+                    cumuls["reduction_generale_patronale"] = -(ligne.cumul or 0.0)
+                attendu = (montant, abs(cumuls["reduction_generale_patronale"]))
+                obtenu = (lot["montants"][s][m], lot["cumuls"][s][m])
+                if any(abs(a - b) > 0.005 for a, b in zip(attendu, obtenu)):
+                    ecarts.append(f"salarié {s}, mois {m + 1} : lot {obtenu} / mensuel {attendu}")
+    return ecarts
+
+
+def comparer(resultat: Dict[str, Any], references: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Régressions d'une exécution par rapport aux références de la même taille, exprimées en
+    multiples de la boucle d'étalonnage mesurée pendant cette même exécution.
+    """
+    reference = references.get('tailles', {}).get(str(resultat['taille']))
+    if not reference:
+        return []
+    etalon_ms = resultat['etalon_ms']
+    regressions = []
+    for nom, stats in resultat['etapes'].items():
+        attendu = reference.get(nom)
+        if attendu is None:
+            continue
+        mesure = stats['moyenne_ms'] / etalon_ms
+        if mesure > attendu * (1 + tolerance) and (mesure - attendu) * etalon_ms > PLANCHER_MS:
+            regressions.append(
+                f"{resultat['taille']} salarié(s) - {nom} : {mesure:.4f} étalon/salarié, soit {stats['moyenne_ms']:.3f} ms "
+                f"(référence {attendu:.4f}, soit {attendu * etalon_ms:.3f} ms sur cette machine, +{(mesure / attendu - 1) * 100:.0f} %)"
+            )
+    return regressions
+
+
+def charger_references(chemin: Path) -> Dict[str, Any]:
+    if not chemin.exists():
+        return {"tailles": {}}
+    return json.loads(chemin.read_text(encoding='utf-8'))
+
+
+def enregistrer_references(chemin: Path, references: Dict[str, Any], resultats: List[Dict[str, Any]]) -> None:
+    references.setdefault('tailles', {})
+    for resultat in resultats:
+        references['tailles'][str(resultat['taille'])] = {
+            nom: round(s['moyenne_ms'] / resultat['etalon_ms'], 4) for nom, s in resultat['etapes'].items()
+        }
+    references['etalon_ms'] = resultats[-1]['etalon_ms'] if resultats else references.get('etalon_ms')
+    references['machine'] = f"{platform.python_implementation()} {platform.python_version()} / {platform.machine()} / {os.cpu_count()} CPU"
+    references['periode'] = resultats[-1]['periode'] if resultats else references.get('periode')
+    chemin.write_text(json.dumps(references, ensure_ascii=False, indent=2) + "\n", encoding='utf-8')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chronomètre la chaîne de paie sur des populations fictives et détecte les régressions.")
+    parser.add_argument("--tailles", type=int, nargs="+", default=list(TAILLES_PAR_DEFAUT), help="Nombres de salariés (ex: 1 100 10000 100000).")
+    parser.add_argument("--annee", type=int, default=2025)
+    parser.add_argument("--mois", type=int, default=7)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--pdf", type=int, default=5, help="Nombre de bulletins rendus en PDF par taille (0 pour ignorer).")
+    parser.add_argument("--references", type=Path, default=FICHIER_REFERENCES)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_PAR_DEFAUT, help="Hausse relative tolérée (0.25 = +25 %).")
+    parser.add_argument("--enregistrer", action="store_true", help="Enregistre les mesures comme nouvelles références.")
+    parser.add_argument("--sortie", type=Path, default=None, help="Écrit aussi les résultats détaillés dans ce fichier JSON.")
+    args = parser.parse_args()
+
+    references = charger_references(args.references)
+    resultats = []
+    for taille in args.tailles:
+        print(f"INFO: Benchmark sur {taille} salarié(s)...", file=sys.stderr)
+        resultat = executer(taille, args.annee, args.mois, args.graine, args.pdf)
+        resultats.append(resultat)
+        for nom, s in resultat['etapes'].items():
+            print(f"  {nom:<12} {s['moyenne_ms']:>10.3f} ms/salarié   p95 {s['p95_ms']:>10.3f} ms   ({s['mesures']} mesures)", file=sys.stderr)
+        print(f"  {'total':<12} {resultat['duree_totale_s']:>10.3f} s   ({resultat['salaries_par_seconde']} salariés/s)", file=sys.stderr)
+        print(f"  {'étalon':<12} {resultat['etalon_ms']:>10.3f} ms", file=sys.stderr)
+
+    print(json.dumps(resultats, ensure_ascii=False, indent=2))
+    if args.sortie:
+        args.sortie.write_text(json.dumps(resultats, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    if args.enregistrer:
+        enregistrer_references(args.references, references, resultats)
+        print(f"✅ Références enregistrées dans {args.references}", file=sys.stderr)
+        sys.exit(0)
+
+    ecarts = verifier_reduction_lot(max(args.tailles), args.annee, args.graine)
+    if ecarts:
+        print("\nERREUR : le calcul en lot de la réduction générale diverge du calcul mensuel :", file=sys.stderr)
+        for e in ecarts[:20]:
+            print(f"  - {e}", file=sys.stderr)
+        sys.exit(1)
+
+    regressions = [r for resultat in resultats for r in comparer(resultat, references, args.tolerance)]
+    if regressions:
+        print("\nERREUR : régression(s) de performance :", file=sys.stderr)
+        for r in regressions:
+            print(f"  - {r}", file=sys.stderr)
+        sys.exit(1)
+    print("✅ Aucune régression par rapport aux références.", file=sys.stderr)
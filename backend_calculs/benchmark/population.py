@@ -0,0 +1,160 @@
+# benchmark/population.py
+
+import argparse
+import json
+import random
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from moteur_paie.calendrier import jours_du_mois, mois_precedent, mois_suivant
+
+# Générateur de salariés fictifs pour le benchmark.
+#
+# Chaque salarié est un dossier au format de data/employes/<nom> : contrat.json, calendriers
+# (mois précédent, courant et suivant, pour les semaines à cheval), horaires réels, saisies du
+# mois et cumuls du mois précédent. Le tirage est déterministe pour une graine donnée, et le
+# mélange de profils reprend la population réelle : temps partiels, 39 h avec heures
+# structurelles, cadres, heures supplémentaires, absences injustifiées et congés payés.
+
+# (nom du profil, poids, statut, durées hebdomadaires possibles, salaire mensuel min, max)
+PROFILS = (
+    ("temps_plein_35", 40, "Non-Cadre", (35.0,), 1850.0, 2600.0),
+    ("temps_plein_39", 20, "Non-Cadre", (39.0,), 2100.0, 2900.0),
+    ("temps_partiel", 15, "Non-Cadre", (24.0, 28.0, 30.0), 1300.0, 1750.0),
+    ("cadre", 25, "Cadre", (35.0, 39.0), 3000.0, 6500.0),
+)
+# Probabilités des événements du mois
+PROBA_HS = 0.35
+PROBA_ABSENCE = 0.15
+PROBA_CONGES = 0.30
+PROBA_PRIME = 0.25
+PROBA_MUTUELLE = 0.5
+
+
+def _choisir_profil(rng: random.Random) -> Tuple:
+    return rng.choices(PROFILS, weights=[p[1] for p in PROFILS])[0]
+
+
+def _contrat(rng: random.Random, i: int, profil: Tuple, annee: int) -> Dict[str, Any]:
+    nom_profil, _, statut, durees, salaire_min, salaire_max = profil
+    duree = rng.choice(durees)
+    entree = date(rng.randint(annee - 20, annee), rng.randint(1, 12), 1)
+    return {
+        "salarie": {
+            "nom": f"BENCH{i:06d}", "prenom": nom_profil,
+            "nir": f"1{rng.randint(60, 99):02d}{rng.randint(1, 12):02d}01{rng.randint(0, 99999999):08d}",
+            "adresse": {"rue": "1 rue du Test", "code_postal": "01300", "ville": "Belley"},
+        },
+        "contrat": {
+            "date_entree": entree.isoformat(),
+            "type_contrat": "CDI",
+            "statut": statut,
+            "emploi": nom_profil.replace("_", " "),
+            "temps_travail": {"is_temps_partiel": duree < 35, "duree_hebdomadaire": duree},
+        },
+        "remuneration": {
+            "salaire_de_base": {"type": "mensuel", "valeur": round(rng.uniform(salaire_min, salaire_max), 2)},
+            "convention_collective": {"idcc": "0292", "nom": "Plasturgie"},
+            "classification_conventionnelle": {"coefficient": rng.choice((700, 710, 720))},
+            "avantages_en_nature": {"repas": {"nombre_par_mois": 0}, "logement": {"beneficie": False}},
+        },
+        "specificites_paie": {
+            "is_alsace_moselle": False,
+            "prelevement_a_la_source": {"type_taux": "personnalise", "taux": round(rng.uniform(0.0, 12.0), 1)},
+            "transport": {"abonnement_mensuel_total": rng.choice((0, 0, 75.2))},
+            "mutuelle": {"adhesion": rng.random() < PROBA_MUTUELLE, "ayants_droit": 0, "montant_salarial": 31.58, "montant_patronal": 31.57},
+            "prevoyance": {"adhesion": statut == "Cadre"},
+        },
+    }
+
+
+def _calendriers(rng: random.Random, annee: int, mois: int, duree: float) -> Tuple[List[Dict], List[Dict]]:
+    """Calendrier prévu et heures réelles d'un mois, avec congés, absences et heures sup. tirés au sort."""
+    heures_jour = round(duree / 5, 2)
+    prevu, reel = [], []
+    conges = set()
+    if rng.random() < PROBA_CONGES:
+        debut = rng.randint(1, 24)
+        conges = set(range(debut, debut + rng.randint(1, 5)))
+    absences = {rng.randint(1, 28)} if rng.random() < PROBA_ABSENCE else set()
+    hs = rng.random() < PROBA_HS
+
+    for j in jours_du_mois(annee, mois):
+        jour = j["jour"]
+        if j["jour_semaine"] >= 5:
+            prevu.append({"jour": jour, "type": "weekend"})
+            reel.append({"jour": jour, "heures_faites": 0})
+        elif j["ferie"]:
+            prevu.append({"jour": jour, "type": "ferie", "heures_prevues": heures_jour})
+            reel.append({"jour": jour, "heures_faites": 0})
+        elif jour in conges:
+            prevu.append({"jour": jour, "type": "conges_payes", "heures_prevues": heures_jour})
+            reel.append({"jour": jour, "heures_faites": 0.0})
+        else:
+            prevu.append({"jour": jour, "type": "travail", "heures_prevues": heures_jour})
+            faites = 0.0 if jour in absences else heures_jour
+            if hs and faites and rng.random() < 0.4:
+                faites += rng.choice((0.5, 1.0, 2.0, 3.0))
+            reel.append({"jour": jour, "heures_faites": faites})
+    return prevu, reel
+
+
+def generer_salarie(i: int, annee: int, mois: int, graine: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """Salarié n° i : (nom du dossier, {chemin relatif: contenu JSON})."""
+    rng = random.Random(graine * 1_000_003 + i)
+    profil = _choisir_profil(rng)
+    contrat = _contrat(rng, i, profil, annee)
+    duree = contrat["contrat"]["temps_travail"]["duree_hebdomadaire"]
+    fichiers: Dict[str, Any] = {"contrat.json": contrat}
+
+    for a, m in (mois_precedent(annee, mois), (annee, mois), mois_suivant(annee, mois)):
+        prevu, reel = _calendriers(rng, a, m, duree)
+        fichiers[f"calendriers/{m:02d}.json"] = {"periode": {"mois": m, "annee": a}, "calendrier_prevu": prevu}
+        fichiers[f"horaires/{m:02d}.json"] = {"periode": {"mois": m, "annee": a}, "calendrier_reel": reel}
+
+    primes = []
+    if rng.random() < PROBA_PRIME:
+        primes.append({"prime_id": "prime_exceptionnelle", "montant": float(rng.choice((50, 100, 250, 500)))})
+    fichiers[f"saisies/{mois:02d}.json"] = {"periode": {"mois": mois, "annee": annee}, "primes": primes, "notes_de_frais": []}
+
+    mois_ecoules = mois - 1
+    brut_moyen = contrat["remuneration"]["salaire_de_base"]["valeur"]
+    _, mois_prec = mois_precedent(annee, mois)
+    fichiers[f"cumuls/{mois_prec:02d}.json"] = {
+        "periode": {"annee_en_cours": annee, "dernier_mois_calcule": mois_ecoules},
+        "cumuls": {
+            "brut_total": round(brut_moyen * mois_ecoules, 2),
+            "heures_remunerees": round(duree * 52 / 12 * mois_ecoules, 2),
+            "reduction_generale_patronale": 0.0,
+            "net_imposable": round(brut_moyen * 0.78 * mois_ecoules, 2),
+            "impot_preleve_a_la_source": 0.0,
+        },
+    }
+    return f"BENCH_{i:06d}_{profil[0]}", fichiers
+
+
+def ecrire_salarie(dossier: Path, fichiers: Dict[str, Any]) -> Path:
+    """Écrit les fichiers d'un salarié fictif ; les sous-dossiers de sortie sont créés vides."""
+    for sous_dossier in ("calendriers", "horaires", "saisies", "cumuls", "evenements_paie", "bulletins"):
+        (dossier / sous_dossier).mkdir(parents=True, exist_ok=True)
+    for chemin_relatif, contenu in fichiers.items():
+        (dossier / chemin_relatif).write_text(json.dumps(contenu, ensure_ascii=False), encoding='utf-8')
+    return dossier
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère une population de salariés fictifs au format data/employes.")
+    parser.add_argument("nombre", type=int)
+    parser.add_argument("dossier", type=str, help="Dossier de sortie (un sous-dossier par salarié).")
+    parser.add_argument("--annee", type=int, default=date.today().year)
+    parser.add_argument("--mois", type=int, default=date.today().month)
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+
+    racine = Path(args.dossier)
+    for i in range(args.nombre):
+        nom, fichiers = generer_salarie(i, args.annee, args.mois, args.graine)
+        ecrire_salarie(racine / nom, fichiers)
+    print(f"✅ {args.nombre} salarié(s) fictif(s) écrit(s) dans {racine} ({args.mois:02d}/{args.annee}).", file=sys.stderr)
@@ -1,12 +1,12 @@
 # generateur_fiche_paie.py
 
+import contextlib
 import json
 import sys
 import traceback
 from pathlib import Path
-from datetime import date, timedelta  
-import calendar
-from typing import Dict, Any, List
+from datetime import date
+from typing import Any, Callable, ContextManager, Dict, List
 
 # Imports pour la génération PDF
 from jinja2 import Environment, FileSystemLoader
@@ -19,74 +19,19 @@ from moteur_paie.calcul_cotisations import calculer_cotisations
 from moteur_paie.calcul_reduction_generale import calculer_reduction_generale
 from moteur_paie.calcul_net import calculer_net_et_impot
 from moteur_paie.bulletin import creer_bulletin_final
+from moteur_paie.lignes import LigneCotisation
+from moteur_paie.metriques import Chronometre, metriques_actives
+from moteur_paie.calendrier import regle_entreprise, periode_de_paie, mois_couverts, nombre_de_jours, mois_precedent
 
 
-
-
-def _get_end_date_for_month(target_annee: int, target_mois: int, jour_cible: int, occurrence_cible: int) -> date:
-    """
-    Trouve une date en se basant sur un jour de la semaine et son occurrence dans le mois.
-    jour_cible: 0 pour Lundi, ..., 6 pour Dimanche.
-    occurrence_cible: 1 pour le premier, -1 pour le dernier.
-    """
-    _, num_days = calendar.monthrange(target_annee, target_mois)
-    
-    jours_trouves = [
-        date(target_annee, target_mois, day)
-        for day in range(1, num_days + 1)
-        if date(target_annee, target_mois, day).weekday() == jour_cible
-    ]
-    
-    if not jours_trouves:
-        raise ValueError(f"Aucun jour correspondant au jour {jour_cible} trouvé pour {target_mois}/{target_annee}.")
-
-    try:
-        if occurrence_cible > 0:
-            return jours_trouves[occurrence_cible - 1]
-        else:
-            return jours_trouves[occurrence_cible]
-    except IndexError:
-        raise ValueError(f"L'occurrence {occurrence_cible} est invalide pour le mois de {target_mois}/{target_annee}.")
-
-# Fichier : generateur_fiche_paie.py
-
-# Fichier : generateur_fiche_paie.py
-
 def definir_periode_de_paie(contexte: ContextePaie, annee: int, mois: int) -> tuple[date, date]:
     """
     Détermine la période de paie en lisant les règles depuis la configuration de l'entreprise.
-    La période de travail s'arrête le dimanche de la semaine du jour de référence.
+    La période de travail s'arrête le dimanche de la semaine du jour de référence
+    (ex: l'avant-dernier vendredi). Les périodes sont précalculées par moteur_paie/calendrier.py.
     """
-    regles_paie = contexte.entreprise.get('parametres_paie', {}).get('periode_de_paie', {})
-    jour_reference = regles_paie.get('jour_de_fin', 4)  # Vendredi par défaut
-    occurrence_reference = regles_paie.get('occurrence', -2) # Avant-dernier par défaut
-
-    # On trouve le jour de référence (ex: l'avant-dernier vendredi)
-    date_de_reference = _get_end_date_for_month(annee, mois, jour_reference, occurrence_reference)
-    
-    # --- CORRECTION APPLIQUÉE ICI ---
-    # La date de fin de la période est le dimanche de la semaine de référence.
-    # On calcule le décalage pour aller de notre jour de référence (ex: vendredi=4) au dimanche (jour=6).
-    decalage_vers_dimanche = 6 - date_de_reference.weekday()
-    date_fin_periode = date_de_reference + timedelta(days=decalage_vers_dimanche)
-    # --- FIN DE LA CORRECTION ---
-    
-    # On fait de même pour le mois précédent afin de trouver notre date de début
-    mois_precedent = mois - 1
-    annee_precedente = annee
-    if mois_precedent == 0:
-        mois_precedent = 12
-        annee_precedente -= 1
-        
-    date_de_reference_precedente = _get_end_date_for_month(annee_precedente, mois_precedent, jour_reference, occurrence_reference)
-    
-    # On applique la même correction pour la période précédente
-    decalage_vers_dimanche_precedent = 6 - date_de_reference_precedente.weekday()
-    date_fin_periode_precedente = date_de_reference_precedente + timedelta(days=decalage_vers_dimanche_precedent)
-
-    date_debut_periode = date_fin_periode_precedente + timedelta(days=1)
-    
-    return date_debut_periode, date_fin_periode
+    jour_reference, occurrence_reference = regle_entreprise(contexte.entreprise)
+    return periode_de_paie(annee, mois, jour_reference, occurrence_reference)
 
 
 # Dans generateur_fiche_paie.py
@@ -96,7 +41,7 @@ def mettre_a_jour_cumuls(
     salaire_brut_mois: float,
     remuneration_hs_mois: float,
     resultats_nets_mois: dict,
-    reduction_generale_mois: dict,
+    reduction_generale_mois: LigneCotisation | None,
     mois: int,
     smic_mois: float,
     pss_mois: float,
@@ -131,7 +76,7 @@ def mettre_a_jour_cumuls(
     cumuls.setdefault('heures_remunerees', 0.0)
     
     if reduction_generale_mois:
-        nouveau_total_annuel_reduction = reduction_generale_mois.get('valeur_cumulative_a_enregistrer', 0.0)
+        nouveau_total_annuel_reduction = reduction_generale_mois.cumul or 0.0
         cumuls['reduction_generale_patronale'] = -nouveau_total_annuel_reduction
 
     with open(nouveau_fichier_path, 'w', encoding='utf-8') as f:
@@ -146,14 +91,7 @@ def creer_calendrier_etendu(chemin_employe: Path, date_debut_periode: date, date
     calendrier_final = []
     
     # On identifie les mois concernés par la période de paie (ex: Juin et Juillet)
-    mois_a_charger = set()
-    current_date = date_debut_periode
-    while current_date <= date_fin_periode:
-        mois_a_charger.add((current_date.year, current_date.month))
-        # Avance au mois suivant
-        current_date = (current_date.replace(day=28) + timedelta(days=4)).replace(day=1)
-
-    for annee, mois in mois_a_charger:
+    for annee, mois in mois_couverts(date_debut_periode, date_fin_periode):
         # On lit le fichier d'événements généré par l'analyseur
         nom_fichier = f"{mois:02d}.json"
         chemin_fichier = chemin_employe / 'evenements_paie' / nom_fichier
@@ -191,7 +129,7 @@ def preparer_calendrier_enrichi(chemin_employe: Path, annee: int, mois: int) ->
     reels_par_jour = {j['jour']: j for j in horaires_reels_data.get('calendrier', [])}
     
     calendrier_final_mois = []
-    _, num_days = calendar.monthrange(annee, mois)
+    num_days = nombre_de_jours(annee, mois)
 
     for day_num in range(1, num_days + 1):
         jour_prevu = prevu_par_jour.get(day_num, {})
@@ -220,23 +158,17 @@ def preparer_calendrier_enrichi(chemin_employe: Path, annee: int, mois: int) ->
     return calendrier_final_mois
 
 
-def generer_une_fiche_de_paie():
+def calculer_bulletin(chemin_employe: Path, annee: int, mois: int, etape: Callable[[str], ContextManager] | None = None) -> Dict[str, Any]:
     """
-    Fonction principale qui orchestre la génération complète d'une fiche de paie.
+    Calcule le bulletin d'un salarié sans rien écrire (ni PDF, ni cumuls).
+    `etape(nom)` encadre chaque étape (contexte, brut, cotisations, reduction, net, bulletin) ;
+    le benchmark s'en sert pour les chronométrer.
     """
-    try:
-        # --- BLOC DE CONFIGURATION ET CHARGEMENT INITIAL ---
-        if len(sys.argv) != 4:
-            print("Erreur: Usage: python generateur_fiche_paie.py <nom_dossier_employe> <annee> <mois>", file=sys.stderr)
-            sys.exit(1)
-
-        nom_dossier_employe = sys.argv[1]
-        annee = int(sys.argv[2])
-        mois = int(sys.argv[3])
-
-        chemin_employe = Path('data/employes') / nom_dossier_employe
-        print(f"\n--- Calcul du bulletin pour {nom_dossier_employe} - Période: {mois:02d}/{annee} ---", file=sys.stderr)
+    if etape is None:
+        etape = lambda nom: contextlib.nullcontext()
+    print(f"\n--- Calcul du bulletin pour {chemin_employe.name} - Période: {mois:02d}/{annee} ---", file=sys.stderr)
 
+    with etape("contexte"):
         # On charge le fichier de saisie correspondant au mois demandé
         chemin_saisie = chemin_employe / 'saisies' / f'{mois:02d}.json'
         if not chemin_saisie.exists():
@@ -248,9 +180,9 @@ def generer_une_fiche_de_paie():
         # --- NOUVELLE LOGIQUE DE PRÉPARATION ---
         # 1. On prépare le calendrier du mois en comparant prévisionnel et réel
         calendrier_du_mois_enrichi = preparer_calendrier_enrichi(chemin_employe, annee, mois)
-        mois_precedent = mois - 1 if mois > 1 else 12
-        chemin_fichier_cumuls = chemin_employe / 'cumuls' / f'{mois_precedent:02d}.json'
-        
+        _, mois_prec = mois_precedent(annee, mois)
+        chemin_fichier_cumuls = chemin_employe / 'cumuls' / f'{mois_prec:02d}.json'
+
         # 2. On charge le contexte (nécessaire pour définir la période de paie)
         contexte = ContextePaie(
             chemin_contrat=chemin_employe / 'contrat.json',
@@ -261,11 +193,13 @@ def generer_une_fiche_de_paie():
         # 3. On définit la période de paie
         date_debut_periode, date_fin_periode = definir_periode_de_paie(contexte, annee, mois)
         print(f"INFO: Période de paie calculée : du {date_debut_periode.strftime('%d/%m/%Y')} au {date_fin_periode.strftime('%d/%m/%Y')}", file=sys.stderr)
+        # Les barèmes appliqués sont ceux en vigueur à la fin de la période, pas les derniers connus
+        contexte.resoudre_baremes(date_fin_periode)
 
         # 4. On crée le calendrier étendu (pour les semaines à cheval)
         # Note : creer_calendrier_etendu doit être adapté pour utiliser le calendrier déjà préparé
         calendrier_etendu = creer_calendrier_etendu(chemin_employe, date_debut_periode, date_fin_periode)
-        
+
         # On lit le fichier d'horaires dans le nouveau sous-dossier "horaires"
         chemin_fichier_horaires = chemin_employe / 'horaires' / f'{mois:02d}.json'
         saisie_horaires_mois_courant = json.loads(chemin_fichier_horaires.read_text(encoding='utf-8'))
@@ -303,7 +237,8 @@ def generer_une_fiche_de_paie():
             else:
                 primes_non_soumises.append(prime_calculee)
 
-        # --- ÉTAPE 2 : CALCULER LE SALAIRE BRUT ---
+    # --- ÉTAPE 2 : CALCULER LE SALAIRE BRUT ---
+    with etape("brut"):
         resultat_brut = calculer_salaire_brut(
             contexte,
             calendrier_saisie=calendrier_etendu,
@@ -311,19 +246,20 @@ def generer_une_fiche_de_paie():
             date_fin_periode=date_fin_periode,
             primes_saisies=primes_soumises
         )
-        
-        salaire_brut_calcule = resultat_brut['salaire_brut_total']
-        details_brut = resultat_brut['lignes_composants_brut']
-        remuneration_hs = resultat_brut['remuneration_brute_heures_supp']
-        total_heures_supp = resultat_brut['total_heures_supp']
-        print(f"INFO [generateur]: Salaire brut calculé = {salaire_brut_calcule} €", file=sys.stderr)
 
-        # --- ÉTAPE 3 : CALCULER LES COTISATIONS ---
-        lignes_cotisations, total_salarial = calculer_cotisations(contexte, salaire_brut_calcule, remuneration_hs, total_heures_supp)
-        print(f"INFO [generateur]: Total cotisations salariales (avant réductions) = {total_salarial} €", file=sys.stderr)
+    salaire_brut_calcule = resultat_brut['salaire_brut_total']
+    details_brut = resultat_brut['lignes_composants_brut']
+    remuneration_hs = resultat_brut['remuneration_brute_heures_supp']
+    total_heures_supp = resultat_brut['total_heures_supp']
+    print(f"INFO [generateur]: Salaire brut calculé = {salaire_brut_calcule} €", file=sys.stderr)
 
-        # --- ÉTAPE 3.5 : CALCULER LA RÉDUCTION GÉNÉRALE ---
+    # --- ÉTAPE 3 : CALCULER LES COTISATIONS ---
+    with etape("cotisations"):
+        lignes_cotisations, total_salarial = calculer_cotisations(contexte, salaire_brut_calcule, remuneration_hs, total_heures_supp)
+    print(f"INFO [generateur]: Total cotisations salariales (avant réductions) = {total_salarial} €", file=sys.stderr)
 
+    # --- ÉTAPE 3.5 : CALCULER LA RÉDUCTION GÉNÉRALE ---
+    with etape("reduction"):
         duree_contrat_hebdo = contexte.duree_hebdo_contrat
         jours_ouvrables_du_mois = sum(1 for jour in calendrier_du_mois if jour.get('type') not in ['weekend'])
         heures_theoriques_du_mois = jours_ouvrables_du_mois * (duree_contrat_hebdo / 5)
@@ -335,43 +271,88 @@ def generer_une_fiche_de_paie():
         total_heures_mois = heures_contractuelles_mois + heures_sup_conjoncturelles_mois
 
         ligne_reduction_generale = calculer_reduction_generale(
-            contexte, 
+            contexte,
             salaire_brut_calcule,
             total_heures_mois # Utilisation de la variable déjà calculée
         )
         if ligne_reduction_generale:
             lignes_cotisations.append(ligne_reduction_generale)
-        # --- ÉTAPE 4 : CALCULER LES VALEURS NETTES ET L'IMPÔT ---
+
+    # --- ÉTAPE 4 : CALCULER LES VALEURS NETTES ET L'IMPÔT ---
+    with etape("net"):
         resultats_nets = calculer_net_et_impot(
-            contexte, 
-            salaire_brut_calcule, 
-            lignes_cotisations, 
-            total_salarial, 
-            primes_non_soumises, 
+            contexte,
+            salaire_brut_calcule,
+            lignes_cotisations,
+            total_salarial,
+            primes_non_soumises,
             remuneration_hs,
-            montant_acompte 
+            montant_acompte
         )
-        print(f"INFO [generateur]: Net à payer calculé = {resultats_nets['net_a_payer']} €", file=sys.stderr)
+    print(f"INFO [generateur]: Net à payer calculé = {resultats_nets['net_a_payer']} €", file=sys.stderr)
 
-        # --- ÉTAPE 5 : ASSEMBLER LE BULLETIN ---
+    # --- ÉTAPE 5 : ASSEMBLER LE BULLETIN ---
+    with etape("bulletin"):
         bulletin_final = creer_bulletin_final(contexte, salaire_brut_calcule, details_brut, lignes_cotisations, resultats_nets, primes_non_soumises)
-        
-        # print("\n--- DÉBOGAGE : Données finales envoyées au template ---", file=sys.stderr)
-        # print(json.dumps(bulletin_final, indent=2, ensure_ascii=False), file=sys.stderr)
-        # print("--- FIN DÉBOGAGE ---\n", file=sys.stderr)
+
+    # print("\n--- DÉBOGAGE : Données finales envoyées au template ---", file=sys.stderr)
+    # print(json.dumps(bulletin_final, indent=2, ensure_ascii=False), file=sys.stderr)
+    # print("--- FIN DÉBOGAGE ---\n", file=sys.stderr)
+
+    return {
+        "contexte": contexte,
+        "bulletin": bulletin_final,
+        "salaire_brut": salaire_brut_calcule,
+        "remuneration_hs": remuneration_hs,
+        "resultats_nets": resultats_nets,
+        "ligne_reduction_generale": ligne_reduction_generale,
+        "total_heures_mois": total_heures_mois,
+    }
+
+
+def generer_pdf(bulletin_final: Dict[str, Any], chemin_pdf: Path | None = None) -> bytes | None:
+    """Rend le template du bulletin en PDF ; sans chemin, retourne les octets du PDF."""
+    env = Environment(loader=FileSystemLoader('templates/'))
+    template = env.get_template('template_bulletin.html')
+    html_genere = template.render(bulletin_final)
+    return HTML(string=html_genere, base_url='.').write_pdf(chemin_pdf)
+
+
+def generer_une_fiche_de_paie():
+    """
+    Fonction principale qui orchestre la génération complète d'une fiche de paie.
+    """
+    try:
+        # --- BLOC DE CONFIGURATION ET CHARGEMENT INITIAL ---
+        if len(sys.argv) != 4:
+            print("Erreur: Usage: python generateur_fiche_paie.py <nom_dossier_employe> <annee> <mois>", file=sys.stderr)
+            sys.exit(1)
+
+        nom_dossier_employe = sys.argv[1]
+        annee = int(sys.argv[2])
+        mois = int(sys.argv[3])
+
+        chemin_employe = Path('data/employes') / nom_dossier_employe
+        # Chronométrage des étapes, relu par l'API quand elle le demande (PAIE_METRIQUES)
+        chrono = Chronometre() if metriques_actives() else None
+        calcul = calculer_bulletin(chemin_employe, annee, mois, chrono.etape if chrono else None)
+        contexte = calcul["contexte"]
+        bulletin_final = calcul["bulletin"]
+        total_heures_mois = calcul["total_heures_mois"]
 
         # --- ÉTAPE FINALE : GÉNÉRATION DU PDF ---
         print("\nINFO: Génération du PDF...", file=sys.stderr)
-        env = Environment(loader=FileSystemLoader('templates/'))
-        template = env.get_template('template_bulletin.html')
-        html_genere = template.render(bulletin_final)
-        
         nom_salarie = nom_dossier_employe 
         mois_annee = f"{mois:02d}-{annee}"
         
         pdf_filename = chemin_employe / 'bulletins' / f"Bulletin_{nom_salarie}_{mois_annee}.pdf"
         
-        HTML(string=html_genere, base_url='.').write_pdf(pdf_filename)
+        if chrono:
+            with chrono.etape("pdf"):
+                generer_pdf(bulletin_final, pdf_filename)
+            chrono.compter("pdf_octets", pdf_filename.stat().st_size if pdf_filename.exists() else 0)
+        else:
+            generer_pdf(bulletin_final, pdf_filename)
 
         print(f"✅ Bulletin de paie généré avec succès : {pdf_filename}", file=sys.stderr)
 
@@ -382,12 +363,14 @@ def generer_une_fiche_de_paie():
         pss_du_mois = contexte.baremes.get('pss', {}).get('mensuel', 0.0)
 
         mettre_a_jour_cumuls(
-            contexte, salaire_brut_calcule, remuneration_hs, resultats_nets,
-            ligne_reduction_generale, mois, smic_calcule_mois, pss_du_mois,
+            contexte, calcul["salaire_brut"], calcul["remuneration_hs"], calcul["resultats_nets"],
+            calcul["ligne_reduction_generale"], mois, smic_calcule_mois, pss_du_mois,
             chemin_employe
         )
         
         print(json.dumps(bulletin_final, ensure_ascii=False))
+        if chrono:
+            chrono.emettre()
         
     except Exception as e:
         print(f"\nERREUR FATALE LORS DE LA GÉNÉRATION : {e}", file=sys.stderr)
@@ -395,4 +378,4 @@ def generer_une_fiche_de_paie():
         sys.exit(1)
 
 if __name__ == "__main__":
-    generer_une_fiche_de_paie()
\ No newline at end of file
+    generer_une_fiche_de_paie()
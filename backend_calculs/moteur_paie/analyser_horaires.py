@@ -1,7 +1,6 @@
 # moteur_paie/analyser_horaires.py
 import json
 import sys
-import calendar
 from pathlib import Path
 from datetime import date
 from typing import Dict, Any, List
@@ -9,14 +8,14 @@ import argparse
 from collections import defaultdict
 import traceback
 
+from moteur_paie.calendrier import cle_semaine, mois_precedent, mois_suivant
+
 def analyser_horaires_du_mois(chemin_employe: Path, annee: int, mois: int, duree_hebdo_contrat: float) -> List[Dict[str, Any]]:
     print(f"INFO: Analyse des horaires pour {chemin_employe.name} - {mois:02d}/{annee}...", file=sys.stderr)
 
     # --- NOUVEAU : charger mois précédent et suivant aussi ---
-    mois_prec = mois - 1 or 12
-    annee_prec = annee - 1 if mois == 1 else annee
-    mois_suiv = mois + 1 if mois < 12 else 1
-    annee_suiv = annee + 1 if mois == 12 else annee
+    annee_prec, mois_prec = mois_precedent(annee, mois)
+    annee_suiv, mois_suiv = mois_suivant(annee, mois)
 
     fichiers = [
         (annee_prec, mois_prec),
@@ -46,20 +45,19 @@ def analyser_horaires_du_mois(chemin_employe: Path, annee: int, mois: int, duree
     semaines = defaultdict(lambda: {"prevu": [], "reel": [], "jours_non_travailles": []})
     for j in prevu_data:
         jour_date = date(j['annee'], j['mois'], j['jour'])
-        cle_semaine = jour_date.isocalendar()[:2]
+        semaine = cle_semaine(jour_date)
         if j.get('type') == 'travail':
-            semaines[cle_semaine]["prevu"].append(j)
+            semaines[semaine]["prevu"].append(j)
         else:
-            semaines[cle_semaine]["jours_non_travailles"].append(j)
+            semaines[semaine]["jours_non_travailles"].append(j)
     for j in reel_data:
         jour_date = date(j['annee'], j['mois'], j['jour'])
-        cle_semaine = jour_date.isocalendar()[:2]
-        semaines[cle_semaine]["reel"].append(j)
+        semaines[cle_semaine(jour_date)]["reel"].append(j)
 
     # Étape 2 : Analyser chaque semaine
     evenements_finaux = []
-    for cle_semaine, data in semaines.items():
-        print(f"\n=== DEBUG: Semaine {cle_semaine} ===", file=sys.stderr)
+    for semaine, data in semaines.items():
+        print(f"\n=== DEBUG: Semaine {semaine} ===", file=sys.stderr)
         print(f"DEBUG: prevu={[(j['jour'], j.get('heures_prevues')) for j in data['prevu']]}", file=sys.stderr)
         print(f"DEBUG: reel={[(j['jour'], j.get('heures_faites')) for j in data['reel']]}", file=sys.stderr)
 
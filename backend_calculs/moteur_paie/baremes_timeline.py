@@ -0,0 +1,147 @@
+# moteur_paie/baremes_timeline.py
+
+import json
+import os
+import sys
+from bisect import bisect_right
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Historique des barèmes, par date d'effet.
+#
+# Pour chaque fichier de data/, les versions passées sont archivées (par la réconciliation)
+# dans data/historique/<nom_du_fichier_sans_extension>/<AAAA-MM-JJ>.json, la date étant celle
+# à partir de laquelle la version s'appliquait. Le fichier courant s'applique à partir de
+# meta.date_effet. On retrouve donc la version en vigueur à une date par bisection sur les
+# dates d'effet, et chaque combinaison de versions n'est chargée qu'une fois par processus :
+# un recalcul de plusieurs années de bulletins réutilise les mêmes snapshots.
+
+DOSSIER_HISTORIQUE = "historique"
+
+# clé dans contexte.baremes -> (fichier de data/, clé extraite du JSON ou None pour le document entier, défaut)
+FICHIERS_BAREMES: Dict[str, Tuple[str, Optional[str], Any]] = {
+    "cotisations": ("cotisations.json", None, None),
+    "heures_supp": ("heuresupp.json", None, None),
+    "pas": ("pas.json", "baremes", []),
+    "smic": ("smic.json", "smic_horaire", {}),
+    "pss": ("plafonds.json", "pss", {}),
+    "frais_pro": ("frais_pro.json", None, None),
+    "primes": ("primes.json", "primes", []),
+    "conventions_collectives": ("conventions_collectives.json", None, None),
+}
+
+# Caches de processus : JSON parsés (par chemin et mtime), timelines, snapshots assemblés.
+_json_cache: Dict[str, Tuple[int, Any]] = {}
+_timelines: Dict[str, "TimelineFichier"] = {}
+_snapshots: Dict[Tuple, Dict[str, Any]] = {}
+
+
+def _lire_json(chemin: Path) -> Any:
+    """Charge un JSON en le gardant en cache tant que le fichier n'a pas changé sur disque."""
+    try:
+        mtime = chemin.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Erreur critique : Le fichier de données '{chemin}' est introuvable.")
+    cle = str(chemin)
+    en_cache = _json_cache.get(cle)
+    if en_cache is not None and en_cache[0] == mtime:
+        return en_cache[1]
+    try:
+        data = json.loads(chemin.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Erreur critique : Le fichier JSON '{chemin}' est mal formaté. Détails: {e}")
+    _json_cache[cle] = (mtime, data)
+    return data
+
+
+def _date_effet(data: Any) -> Optional[date]:
+    valeur = data.get("meta", {}).get("date_effet") if isinstance(data, dict) else None
+    return date.fromisoformat(valeur) if valeur else None
+
+
+class TimelineFichier:
+    """Versions successives d'un fichier de barème, triées par date d'effet."""
+
+    def __init__(self, chemin_courant: Path, dossier_historique: Path):
+        self.chemin_courant = chemin_courant
+        self.dossier_historique = dossier_historique
+        self.signature = self._signature()
+
+        versions: List[Tuple[date, Path]] = []
+        if dossier_historique.is_dir():
+            for entree in dossier_historique.iterdir():
+                if entree.suffix == ".json":
+                    try:
+                        versions.append((date.fromisoformat(entree.stem), entree))
+                    except ValueError:
+                        print(f"AVERTISSEMENT: Version ignorée (nom de fichier non daté) : {entree}", file=sys.stderr)
+        versions.sort()
+
+        # Le fichier courant prend effet à meta.date_effet ; à défaut, juste après la dernière archive.
+        debut_courant = _date_effet(_lire_json(chemin_courant))
+        if debut_courant is None:
+            debut_courant = versions[-1][0] + timedelta(days=1) if versions else date.min
+        versions = [v for v in versions if v[0] < debut_courant]
+        versions.append((debut_courant, chemin_courant))
+
+        self._dates = [d for d, _ in versions]
+        self._chemins = [p for _, p in versions]
+
+    def _signature(self) -> Tuple:
+        try:
+            hist = self.dossier_historique.stat().st_mtime_ns
+        except FileNotFoundError:
+            hist = None
+        return (self.chemin_courant.stat().st_mtime_ns, hist)
+
+    def est_a_jour(self) -> bool:
+        try:
+            return self._signature() == self.signature
+        except FileNotFoundError:
+            return False
+
+    def version_courante(self) -> Tuple[date, Path]:
+        return self._dates[-1], self._chemins[-1]
+
+    def version_pour(self, jour: date) -> Tuple[date, Path]:
+        """Version en vigueur au jour donné (O(log n)). Avant la première version connue, on prend la plus ancienne."""
+        i = bisect_right(self._dates, jour) - 1
+        if i < 0:
+            print(f"AVERTISSEMENT: Aucune version de '{self.chemin_courant.name}' avant le {jour} ; la plus ancienne est utilisée.", file=sys.stderr)
+            i = 0
+        return self._dates[i], self._chemins[i]
+
+
+def timeline(data_dir: Path, nom_fichier: str) -> TimelineFichier:
+    chemin = data_dir / nom_fichier
+    cle = str(chemin.resolve())
+    tl = _timelines.get(cle)
+    if tl is None or not tl.est_a_jour():
+        tl = TimelineFichier(chemin, data_dir / DOSSIER_HISTORIQUE / Path(nom_fichier).stem)
+        _timelines[cle] = tl
+    return tl
+
+
+def charger_baremes(data_dir: Path | str, date_reference: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Retourne les barèmes en vigueur à `date_reference` (les versions courantes si None),
+    sous la forme attendue par ContextePaie.baremes. Le dictionnaire retourné est partagé
+    entre tous les contextes résolus sur les mêmes versions : il ne doit pas être modifié.
+    """
+    data_dir = Path(data_dir)
+    versions = []
+    for cle, (nom_fichier, _, _) in FICHIERS_BAREMES.items():
+        tl = timeline(data_dir, nom_fichier)
+        _, chemin = tl.version_courante() if date_reference is None else tl.version_pour(date_reference)
+        versions.append((cle, str(chemin), os.stat(chemin).st_mtime_ns))
+
+    cle_snapshot = tuple(versions)
+    snapshot = _snapshots.get(cle_snapshot)
+    if snapshot is None:
+        snapshot = {}
+        for (cle, chemin, _), (_, sous_cle, defaut) in zip(versions, FICHIERS_BAREMES.values()):
+            data = _lire_json(Path(chemin))
+            snapshot[cle] = data.get(sous_cle, defaut) if sous_cle else data
+        _snapshots[cle_snapshot] = snapshot
+    return snapshot
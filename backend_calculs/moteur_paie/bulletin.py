@@ -3,19 +3,21 @@
 import sys
 from datetime import datetime
 from .contexte import ContextePaie
+from .lignes import Categorie, LigneBrut, LigneCotisation, CATEGORIES_CONGES, CATEGORIES_ABSENCES, CATEGORIES_CSG_NON_DEDUCTIBLE
 from typing import Dict, Any, List
 
 def creer_bulletin_final(
     contexte: ContextePaie,
     salaire_brut: float,
-    details_brut: List[Dict[str, Any]],
-    lignes_cotisations: List[Dict[str, Any]],
+    details_brut: List[LigneBrut],
+    lignes_cotisations: List[LigneCotisation],
     resultats_nets: Dict[str, float],
     primes_non_soumises: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
     """
     Assemble tous les éléments calculés en une structure de données finale
     qui respecte l'ordre d'affichage désiré sur le bulletin.
+    Les lignes typées sont réparties par catégorie puis converties en dictionnaires (template, JSON).
     """
     print("INFO: Assemblage et tri du bulletin de paie final...", file=sys.stderr)
     
@@ -27,17 +29,16 @@ def creer_bulletin_final(
     retenue_conges = 0.0
 
     for ligne in details_brut:
-        libelle = ligne.get('libelle', '').lower()
-        if 'conges payes' in libelle.replace('é', 'e'):
-            lignes_conges.append(ligne)
-            if 'indemnité' in libelle:
-                indemnite_conges = ligne.get('gain', 0.0)
-            if 'absence' in libelle:
-                retenue_conges = ligne.get('perte', 0.0)
-        elif 'absence' in libelle and 'congés payés' not in libelle:
-            lignes_absences.append(ligne)
+        if ligne.categorie in CATEGORIES_CONGES:
+            lignes_conges.append(ligne.en_dict())
+            if ligne.categorie == Categorie.CONGES_INDEMNITE:
+                indemnite_conges = ligne.gain or 0.0
+            else:
+                retenue_conges = ligne.perte or 0.0
+        elif ligne.categorie in CATEGORIES_ABSENCES:
+            lignes_absences.append(ligne.en_dict())
         else:
-            autres_lignes_brut.append(ligne)
+            autres_lignes_brut.append(ligne.en_dict())
     
     # Préparation du texte pour l'arbitrage des congés payés
     texte_arbitrage = None
@@ -53,28 +54,23 @@ def creer_bulletin_final(
     bloc_autres_contributions = []
     bloc_csg_non_deductible = []
 
-    AUTRES_CONTRIBUTIONS_KEYWORDS = ['fnal', 'formation', 'apprentissage', 'solidarité', 'dialogue', 'mobilité']
-    ALLEGEMENTS_KEYWORDS = ['réduction générale', 'réduction de cotisations sur heures sup', 'déduction forfaitaire']
-    
     for ligne in lignes_cotisations:
-        libelle = ligne.get('libelle', '').lower()
-        
-        if "csg/crds sur hs" in libelle or "csg/crds non déductible" in libelle :
+        if ligne.categorie in CATEGORIES_CSG_NON_DEDUCTIBLE:
             bloc_csg_non_deductible.append(ligne)
-        elif any(keyword in libelle for keyword in ALLEGEMENTS_KEYWORDS):
+        elif ligne.categorie == Categorie.ALLEGEMENT:
             bloc_allegements.append(ligne)
-        elif any(keyword in libelle for keyword in AUTRES_CONTRIBUTIONS_KEYWORDS):
+        elif ligne.categorie == Categorie.AUTRE_CONTRIBUTION:
             bloc_autres_contributions.append(ligne)
         else:
             bloc_principales.append(ligne)
             
     # Calcul des totaux
-    total_autres_contributions = sum(l.get('montant_patronal', 0.0) or 0.0 for l in bloc_autres_contributions)
-    total_cotisations_salariales = sum(l.get('montant_salarial', 0.0) or 0.0 for l in lignes_cotisations)
-    total_cotisations_patronales = sum(l.get('montant_patronal', 0.0) or 0.0 for l in lignes_cotisations)
+    total_autres_contributions = sum(l.montant_patronal or 0.0 for l in bloc_autres_contributions)
+    total_cotisations_salariales = sum(l.montant_salarial or 0.0 for l in lignes_cotisations)
+    total_cotisations_patronales = sum(l.montant_patronal or 0.0 for l in lignes_cotisations)
     
-    total_retenues_avant_csg_nd = sum(l.get('montant_salarial', 0.0) or 0.0 for l in bloc_principales + bloc_allegements)
-    total_patronal_avant_csg_nd = sum(l.get('montant_patronal', 0.0) or 0.0 for l in bloc_principales + bloc_allegements)
+    total_retenues_avant_csg_nd = sum(l.montant_salarial or 0.0 for l in bloc_principales + bloc_allegements)
+    total_patronal_avant_csg_nd = sum(l.montant_patronal or 0.0 for l in bloc_principales + bloc_allegements)
     
     total_primes_non_soumises = sum(p.get('montant', 0.0) or 0.0 for p in primes_non_soumises)
 
@@ -102,10 +98,10 @@ def creer_bulletin_final(
         
         "salaire_brut": salaire_brut,
         "structure_cotisations": {
-            "bloc_principales": bloc_principales,
-            "bloc_allegements": bloc_allegements,
+            "bloc_principales": [l.en_dict() for l in bloc_principales],
+            "bloc_allegements": [l.en_dict() for l in bloc_allegements],
             "bloc_autres_contributions": {
-                "lignes": bloc_autres_contributions,
+                "lignes": [l.en_dict() for l in bloc_autres_contributions],
                 "total": round(total_autres_contributions, 2)
             },
             "total_avant_csg_crds": {
@@ -113,7 +109,7 @@ def creer_bulletin_final(
                 "montant_salarial": round(total_retenues_avant_csg_nd, 2),
                 "montant_patronal": round(total_patronal_avant_csg_nd, 2)
             },
-            "bloc_csg_non_deductible": bloc_csg_non_deductible,
+            "bloc_csg_non_deductible": [l.en_dict() for l in bloc_csg_non_deductible],
             "total_salarial": round(total_cotisations_salariales, 2),
             "total_patronal": round(total_cotisations_patronales, 2)
         },
@@ -122,7 +118,7 @@ def creer_bulletin_final(
             "net_imposable": resultats_nets.get('net_imposable'),
             "impot_prelevement_a_la_source": {
                 "base": resultats_nets.get('net_imposable'),
-                "taux": contexte.contrat.get('specificites_paie', {}).get('prelevement_a_la_source', {}).get('taux', 0.0),
+                "taux": resultats_nets.get('taux_pas', contexte.contrat.get('specificites_paie', {}).get('prelevement_a_la_source', {}).get('taux', 0.0)),
                 "montant": resultats_nets.get('montant_impot_pas')
             },
             "remboursement_transport": resultats_nets.get('remboursement_transport'),
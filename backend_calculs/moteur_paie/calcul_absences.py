@@ -2,6 +2,7 @@ import sys
 from datetime import date, timedelta
 from typing import Dict, Any
 from .contexte import ContextePaie
+from .lignes import Categorie, LigneBrut
 
 def _compter_heures_absence(
     contexte: ContextePaie, 
@@ -25,7 +26,7 @@ def calculer_deduction_absence(
     contexte: ContextePaie, 
     absence: Dict[str, Any],
     taux_horaire: float
-) -> Dict[str, Any]:
+) -> LigneBrut | None:
     """
     Calcule la déduction sur salaire pour une absence non rémunérée.
     La méthode est celle du taux horaire réel.
@@ -44,10 +45,10 @@ def calculer_deduction_absence(
     
     libelle_final = f"{absence.get('libelle', 'Absence')} du {date_debut.strftime('%d/%m')} au {date_fin.strftime('%d/%m')}"
     
-    return {
-        "libelle": libelle_final,
-        "quantite": nombre_heures_absence,
-        "taux": round(taux_horaire, 4),
-        "gain": None,
-        "perte": montant_deduction
-    }
\ No newline at end of file
+    return LigneBrut(
+        Categorie.ABSENCE,
+        libelle_final,
+        quantite=nombre_heures_absence,
+        taux=round(taux_horaire, 4),
+        perte=montant_deduction
+    )
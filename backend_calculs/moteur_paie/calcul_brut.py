@@ -2,9 +2,11 @@
 
 import sys
 from .contexte import ContextePaie
-from datetime import datetime, date, timedelta
+from datetime import date
 from typing import Dict, Any, List
 from .calcul_conges import calculer_indemnite_conges
+from .lignes import Categorie, LigneBrut
+from .conventions import index_conventions, anciennete_en_annees
 
 
 def _get_salaire_horaire_base(contexte: ContextePaie, duree_hebdo_reelle: float) -> float:
@@ -20,7 +22,7 @@ def _get_salaire_horaire_base(contexte: ContextePaie, duree_hebdo_reelle: float)
     heures_equivalentes_majorees = heures_mensuelles_legales + (heures_sup_structurelles_mensuelles * (1 + majoration_hs))
     return salaire_mensuel / heures_equivalentes_majorees if heures_equivalentes_majorees > 0 else 0.0
 
-def _construire_ligne_avantages_en_nature(contexte: ContextePaie) -> Dict[str, Any] | None:
+def _construire_ligne_avantages_en_nature(contexte: ContextePaie) -> LigneBrut | None:
     # Cette fonction reste inchangée
     total_avantages = 0.0
     regles_aen = contexte.entreprise.get('parametres_paie', {}).get('avantages_en_nature', {})
@@ -41,42 +43,32 @@ def _construire_ligne_avantages_en_nature(contexte: ContextePaie) -> Dict[str, A
                 total_avantages += valeur
                 break
     if total_avantages > 0:
-        return {"libelle": "Avantages en nature", "quantite": None, "taux": None, "gain": round(total_avantages, 2), "perte": None}
+        return LigneBrut(Categorie.AVANTAGE_NATURE, "Avantages en nature", gain=round(total_avantages, 2))
     return None
 
-def _calculer_prime_anciennete(contexte: ContextePaie) -> Dict[str, Any] | None:
-    # Cette fonction reste inchangée
+def _calculer_prime_anciennete(contexte: ContextePaie) -> LigneBrut | None:
+    """Prime d'ancienneté conventionnelle, l'ancienneté étant arrêtée à la fin de la période de paie."""
     date_entree_str = contexte.contrat.get('contrat', {}).get('date_entree')
     if not date_entree_str: return None
-    date_entree = datetime.strptime(date_entree_str, "%Y-%m-%d")
-    anciennete_annees = (datetime.now() - date_entree).days / 365.25
     idcc = contexte.contrat.get('remuneration', {}).get('convention_collective', {}).get('idcc')
     if not idcc: return None
-    regles_cc = contexte.baremes.get('conventions_collectives', {}).get(f"idcc_{idcc}", {})
-    regles_prime = regles_cc.get('prime_anciennete', {})
-    taux_applicable = 0.0
-    for palier in regles_prime.get('bareme', []):
-        if palier['annees_min'] <= anciennete_annees:
-            taux_applicable = palier.get('taux', 0.0)
+    convention = index_conventions(contexte.baremes.get('conventions_collectives', {})).get(idcc)
+    if convention is None: return None
+    # Hors générateur (simulation, contexte construit en mémoire), on retombe sur la date du jour.
+    date_fin = contexte.date_reference or date.today()
+    anciennete_annees = anciennete_en_annees(date.fromisoformat(date_entree_str), date_fin)
+    taux_applicable = convention.taux_prime_anciennete(anciennete_annees)
     if taux_applicable == 0.0: return None
-    base_de_calcul = 0.0
-    regle_base = regles_prime.get('base_de_calcul', {})
-    methode = regle_base.get('methode')
-    if methode == "salaire_minimum_conventionnel":
+    if convention.methode_base == "salaire_minimum_conventionnel":
         coeff_salarie = contexte.contrat.get('remuneration', {}).get('classification_conventionnelle', {}).get('coefficient')
-        for minima in regles_cc.get('salaires_minima', []):
-            if minima.get('coefficient') == coeff_salarie:
-                base_de_calcul = minima.get('valeur', 0.0)
-                break
-    elif methode == "pourcentage_salaire_de_base":
-        pourcentage = regle_base.get('valeur', 0.0)
-        base_de_calcul = contexte.salaire_base_mensuel * pourcentage
+        base_de_calcul = convention.salaire_minimum(coeff_salarie)
+    elif convention.methode_base == "pourcentage_salaire_de_base":
+        base_de_calcul = contexte.salaire_base_mensuel * convention.valeur_base
     else:
         base_de_calcul = contexte.salaire_base_mensuel
     if base_de_calcul == 0.0: return None
     montant_prime = base_de_calcul * taux_applicable
-    return {"libelle": f"Prime d'ancienneté ({anciennete_annees:.0f} ans, {taux_applicable * 100:.0f}%)","quantite": base_de_calcul,"taux": taux_applicable,"gain": round(montant_prime, 2),"perte": None}
-
+    return LigneBrut(Categorie.PRIME, f"Prime d'ancienneté ({anciennete_annees:.0f} ans, {taux_applicable * 100:.0f}%)", quantite=base_de_calcul, taux=taux_applicable, gain=round(montant_prime, 2))
 
 # def _calculer_hs_semaine(heures_travaillees: float, duree_contrat_hebdo: float, regles_majoration: List[Dict]) -> Dict[float, float]:
 #     """
@@ -135,16 +127,16 @@ def calculer_salaire_brut(
     # 1. Décomposition du salaire de base
     if duree_contrat_hebdo < duree_legale_hebdo:
         heures_mensuelles_contrat = round((duree_contrat_hebdo * 52) / 12, 2)
-        lignes_composants_brut.append({
-            "libelle": "Salaire de base", "quantite": heures_mensuelles_contrat,
-            "taux": round(taux_horaire_de_base, 4), "gain": round(salaire_contractuel, 2), "perte": None
-        })
+        lignes_composants_brut.append(LigneBrut(
+            Categorie.SALAIRE_BASE, "Salaire de base", quantite=heures_mensuelles_contrat,
+            taux=round(taux_horaire_de_base, 4), gain=round(salaire_contractuel, 2)
+        ))
         remuneration_hs_structurelles = 0.0
         heures_sup_structurelles_mensuelles = 0.0
     else:
         heures_mensuelles_legales = round((duree_legale_hebdo * 52) / 12, 2)
         salaire_base_35h = heures_mensuelles_legales * taux_horaire_de_base
-        lignes_composants_brut.append({"libelle": "Salaire de base", "quantite": heures_mensuelles_legales, "taux": round(taux_horaire_de_base, 4), "gain": round(salaire_base_35h, 2), "perte": None})
+        lignes_composants_brut.append(LigneBrut(Categorie.SALAIRE_BASE, "Salaire de base", quantite=heures_mensuelles_legales, taux=round(taux_horaire_de_base, 4), gain=round(salaire_base_35h, 2)))
         remuneration_hs_structurelles = 0.0
         heures_sup_structurelles_mensuelles = 0.0
         if duree_contrat_hebdo > duree_legale_hebdo:
@@ -152,8 +144,8 @@ def calculer_salaire_brut(
             heures_sup_structurelles_mensuelles = round(((duree_contrat_hebdo - duree_legale_hebdo) * 52) / 12, 2)
             taux_horaire_majore = remuneration_hs_structurelles / heures_sup_structurelles_mensuelles if heures_sup_structurelles_mensuelles > 0 else 0
             majoration_pct = (taux_horaire_majore / taux_horaire_de_base - 1) * 100 if taux_horaire_de_base > 0 else 0
-            lignes_composants_brut.append({"libelle": f"Heures suppl. structurelles majorées à {majoration_pct:.0f}%", "quantite": heures_sup_structurelles_mensuelles, "taux": round(taux_horaire_majore, 4), "gain": round(remuneration_hs_structurelles, 2), "perte": None})
-            lignes_composants_brut.append({"libelle": "SOUS-TOTAL SALAIRE CONTRACTUEL", "quantite": round(heures_mensuelles_legales + heures_sup_structurelles_mensuelles, 2), "taux": None, "gain": salaire_contractuel, "perte": None, "is_sous_total": True})
+            lignes_composants_brut.append(LigneBrut(Categorie.HS_STRUCTURELLES, f"Heures suppl. structurelles majorées à {majoration_pct:.0f}%", quantite=heures_sup_structurelles_mensuelles, taux=round(taux_horaire_majore, 4), gain=round(remuneration_hs_structurelles, 2)))
+            lignes_composants_brut.append(LigneBrut(Categorie.SOUS_TOTAL, "SOUS-TOTAL SALAIRE CONTRACTUEL", quantite=round(heures_mensuelles_legales + heures_sup_structurelles_mensuelles, 2), gain=salaire_contractuel))
 
     # 2. Préparation des taux et des accumulateurs
     baremes_hs = contexte.baremes.get('heures_supp', {}).get('regles_calcul_communes', {}).get('taux_majoration_par_defaut', {}).get('heures_supplementaires', [{}, {}])
@@ -198,21 +190,22 @@ def calculer_salaire_brut(
             montant_deduction = round(heures * taux_deduction, 2)
             date_absence = date.fromisoformat(evenement['date_complete']).strftime('%d/%m/%y')
             libelle_absence = f"Absence injustifiée du {date_absence} ({type_ev.split('_')[-1]})"
-            lignes_composants_brut.append({
-                "libelle": libelle_absence, "quantite": heures, "taux": round(taux_deduction, 4),
-                "gain": None, "perte": montant_deduction
-            })
+            # Les absences sur des heures sup. (hs25 / hs50) réduisent la rémunération des HS
+            categorie = Categorie.ABSENCE_HS if ("hs25" in type_ev or "hs50" in type_ev) else Categorie.ABSENCE
+            lignes_composants_brut.append(LigneBrut(
+                categorie, libelle_absence, quantite=heures, taux=round(taux_deduction, 4), perte=montant_deduction
+            ))
             
         elif type_ev == 'absence_non_remuneree':
             montant_deduction = round(heures * taux_horaire_de_base, 2)
             date_absence = date.fromisoformat(evenement['date_complete']).strftime('%d/%m/%y')
-            lignes_composants_brut.append({
-                "libelle": f"Absence non rémunérée du {date_absence}",
-                "quantite": heures,
-                "taux": round(taux_horaire_de_base, 4),
-                "gain": None,
-                "perte": montant_deduction
-            })
+            lignes_composants_brut.append(LigneBrut(
+                Categorie.ABSENCE,
+                f"Absence non rémunérée du {date_absence}",
+                quantite=heures,
+                taux=round(taux_horaire_de_base, 4),
+                perte=montant_deduction
+            ))
         elif type_ev == 'conges_payes':
             jours_conges_dans_periode.append(evenement)
             
@@ -221,48 +214,46 @@ def calculer_salaire_brut(
     #     lignes_composants_brut.append({"libelle": "Heures normales travaillées", "quantite": round(heures_travail_base_total, 2), "taux": round(taux_horaire_de_base, 4), "gain": round(heures_travail_base_total * taux_horaire_de_base, 2), "perte": None})
     if heures_travail_hs25_total > 0:
         gain = round(heures_travail_hs25_total * taux_hs25, 2)
-        lignes_composants_brut.append({"libelle": f"Heures suppl. majorées à {majoration_hs25*100:.0f}%", "quantite": round(heures_travail_hs25_total, 2), "taux": round(taux_hs25, 4), "gain": gain, "perte": None})
+        lignes_composants_brut.append(LigneBrut(Categorie.HS_CONJONCTURELLES, f"Heures suppl. majorées à {majoration_hs25*100:.0f}%", quantite=round(heures_travail_hs25_total, 2), taux=round(taux_hs25, 4), gain=gain))
     if heures_travail_hs50_total > 0:
         gain = round(heures_travail_hs50_total * taux_hs50, 2)
-        lignes_composants_brut.append({"libelle": f"Heures suppl. majorées à {majoration_hs50*100:.0f}%", "quantite": round(heures_travail_hs50_total, 2), "taux": round(taux_hs50, 4), "gain": gain, "perte": None})
+        lignes_composants_brut.append(LigneBrut(Categorie.HS_CONJONCTURELLES, f"Heures suppl. majorées à {majoration_hs50*100:.0f}%", quantite=round(heures_travail_hs50_total, 2), taux=round(taux_hs50, 4), gain=gain))
 
     # 5. Calcul final des congés 
     if jours_conges_dans_periode:
         resultat_conges = calculer_indemnite_conges(contexte, len(jours_conges_dans_periode), taux_horaire_de_base)
-        lignes_composants_brut.append({"libelle": f"Absence congés payés ({resultat_conges['nombre_jours']} jours)","quantite": round(resultat_conges['total_heures_absence'], 2), "taux": None, "gain": None, "perte": resultat_conges['montant_retenue']})
+        lignes_composants_brut.append(LigneBrut(Categorie.CONGES_ABSENCE, f"Absence congés payés ({resultat_conges['nombre_jours']} jours)", quantite=round(resultat_conges['total_heures_absence'], 2), perte=resultat_conges['montant_retenue']))
         if resultat_conges["methode_retenue"] == "Maintien":
-            lignes_composants_brut.append({"libelle": "Indemnité de congés payés (partie base)","quantite": round(resultat_conges['heures_base'], 2),"taux": round(taux_horaire_de_base, 4),"gain": resultat_conges['indemnite_maintien_base'], "perte": None})
+            lignes_composants_brut.append(LigneBrut(Categorie.CONGES_INDEMNITE, "Indemnité de congés payés (partie base)", quantite=round(resultat_conges['heures_base'], 2), taux=round(taux_horaire_de_base, 4), gain=resultat_conges['indemnite_maintien_base']))
             if resultat_conges['indemnite_maintien_hs'] > 0:
                 salaire_horaire_majore = taux_horaire_de_base * (1 + majoration_hs25)
-                lignes_composants_brut.append({"libelle": f"Indemnité de congés payés (partie HS {majoration_hs25*100:.0f}%)","quantite": round(resultat_conges['heures_hs'], 2),"taux": round(salaire_horaire_majore, 4),"gain": resultat_conges['indemnite_maintien_hs'], "perte": None})
+                lignes_composants_brut.append(LigneBrut(Categorie.CONGES_INDEMNITE, f"Indemnité de congés payés (partie HS {majoration_hs25*100:.0f}%)", quantite=round(resultat_conges['heures_hs'], 2), taux=round(salaire_horaire_majore, 4), gain=resultat_conges['indemnite_maintien_hs']))
         else:
-            lignes_composants_brut.append({"libelle": "Indemnité de congés payés (règle du 1/10ème)","quantite": None, "taux": None, "gain": resultat_conges['montant_indemnite'], "perte": None})
+            lignes_composants_brut.append(LigneBrut(Categorie.CONGES_INDEMNITE, "Indemnité de congés payés (règle du 1/10ème)", gain=resultat_conges['montant_indemnite']))
 
     # 6. Ajout des primes, avantages et calcul des totaux
     ligne_prime_anciennete = _calculer_prime_anciennete(contexte)
     if ligne_prime_anciennete: lignes_composants_brut.append(ligne_prime_anciennete)
     if primes_saisies:
         for prime in primes_saisies:
-            lignes_composants_brut.append({"libelle": prime.get('libelle', 'Prime'), "quantite": None, "taux": None, "gain": prime.get('montant', 0.0), "perte": None})
+            lignes_composants_brut.append(LigneBrut(Categorie.PRIME, prime.get('libelle', 'Prime'), gain=prime.get('montant', 0.0)))
     ligne_aen = _construire_ligne_avantages_en_nature(contexte)
     if ligne_aen: lignes_composants_brut.append(ligne_aen)
     
     # Le calcul du brut total reste inchangé
-    total_gains = sum(l.get('gain', 0.0) or 0.0 for l in lignes_composants_brut if not l.get('is_sous_total'))
-    total_pertes = sum(l.get('perte', 0.0) or 0.0 for l in lignes_composants_brut)
+    total_gains = sum(l.gain or 0.0 for l in lignes_composants_brut if l.categorie != Categorie.SOUS_TOTAL)
+    total_pertes = sum(l.perte or 0.0 for l in lignes_composants_brut)
     total_brut = total_gains - total_pertes
     
     # Étape 1 : Isoler les gains liés aux HS (structurelles et conjoncturelles)
     # Note: La rémunération des HS structurelles est déjà calculée plus haut.
     remuneration_hs_conjoncturelles = sum(
-        l.get('gain', 0.0) for l in lignes_composants_brut 
-        if l.get('libelle', '').startswith('Heures suppl. majorées')
+        l.gain for l in lignes_composants_brut if l.categorie == Categorie.HS_CONJONCTURELLES
     )
     
     # Étape 2 (NOUVEAU) : Isoler les pertes liées aux HS
     pertes_heures_supp = sum(
-        l.get('perte', 0.0) for l in lignes_composants_brut 
-        if 'absence' in l.get('libelle', '').lower() and ('hs25' in l.get('libelle', '').lower() or 'hs50' in l.get('libelle', '').lower())
+        l.perte for l in lignes_composants_brut if l.categorie == Categorie.ABSENCE_HS
     )
 
     # Étape 3 : Calculer la rémunération NETTE des heures supplémentaires
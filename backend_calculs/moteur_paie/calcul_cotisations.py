@@ -2,7 +2,8 @@
 
 import sys
 from .contexte import ContextePaie
-from typing import Dict, Any, List, Tuple
+from .lignes import Categorie, LigneCotisation, IDS_AUTRES_CONTRIBUTIONS
+from typing import Dict, List, Tuple
 
 # Fichier : moteur_paie/calcul_cotisations.py
 
@@ -72,22 +73,19 @@ def _calculer_assiettes(contexte: ContextePaie, salaire_brut: float, remuneratio
         "csg_crds_base_hs": round(base_csg_hs, 2)
     }
 
-def _calculer_une_ligne(libelle: str, assiette: float, taux_salarial: float, taux_patronal: float) -> Dict[str, Any] | None:
+def _calculer_une_ligne(libelle: str, assiette: float, taux_salarial: float, taux_patronal: float, categorie: Categorie = Categorie.COTISATION) -> LigneCotisation | None:
     if assiette <= 0 and not (taux_salarial is None and taux_patronal is None): return None
     montant_salarial = round(assiette * (taux_salarial or 0.0), 2)
     montant_patronal = round(assiette * (taux_patronal or 0.0), 2)
     if montant_salarial == 0 and montant_patronal == 0: return None
-    return {
-        "libelle": libelle, "base": assiette, "taux_salarial": taux_salarial, 
-        "montant_salarial": montant_salarial, "taux_patronal": taux_patronal, "montant_patronal": montant_patronal
-    }
+    return LigneCotisation(categorie, libelle, assiette, taux_salarial, montant_salarial, taux_patronal, montant_patronal)
 
 def calculer_cotisations(
     contexte: ContextePaie, 
     salaire_brut: float, 
     remuneration_heures_supp: float = 0.0,
     total_heures_supp: float = 0.0
-) -> Tuple[List[Dict[str, Any]], float]:
+) -> Tuple[List[LigneCotisation], float]:
     """
     Calcule toutes les cotisations sociales, salariales et patronales.
     """
@@ -148,9 +146,9 @@ def calculer_cotisations(
              taux_csg_total = taux_csg_deductible + taux_csg_non_deductible
              
              for ligne in [
-                 _calculer_une_ligne("CSG déductible", assiettes['csg_crds_base_normale'], taux_csg_deductible, None),
-                 _calculer_une_ligne("CSG/CRDS non déductible", assiettes['csg_crds_base_normale'], taux_csg_non_deductible, None),
-                 _calculer_une_ligne("CSG/CRDS sur HS non déductible", assiettes['csg_crds_base_hs'], taux_csg_total, None)
+                 _calculer_une_ligne("CSG déductible", assiettes['csg_crds_base_normale'], taux_csg_deductible, None, Categorie.CSG_DEDUCTIBLE),
+                 _calculer_une_ligne("CSG/CRDS non déductible", assiettes['csg_crds_base_normale'], taux_csg_non_deductible, None, Categorie.CSG_NON_DEDUCTIBLE),
+                 _calculer_une_ligne("CSG/CRDS sur HS non déductible", assiettes['csg_crds_base_hs'], taux_csg_total, None, Categorie.CSG_HS)
              ]:
                  if ligne: bulletin_cotisations.append(ligne)
              continue
@@ -158,7 +156,8 @@ def calculer_cotisations(
         if isinstance(taux_patronal_final, str):
             taux_patronal_final = 0.0
 
-        ligne_calculee = _calculer_une_ligne(libelle, assiette, taux_salarial, taux_patronal_final)
+        categorie = Categorie.AUTRE_CONTRIBUTION if coti_id in IDS_AUTRES_CONTRIBUTIONS else Categorie.COTISATION
+        ligne_calculee = _calculer_une_ligne(libelle, assiette, taux_salarial, taux_patronal_final, categorie)
         
         if ligne_calculee:
             bulletin_cotisations.append(ligne_calculee)
@@ -168,14 +167,12 @@ def calculer_cotisations(
     if mutuelle_spec.get('adhesion'):
         lignes_specifiques = mutuelle_spec.get('lignes_specifiques', [])
         for ligne in lignes_specifiques:
-            bulletin_cotisations.append({
-                "libelle": ligne.get('libelle', 'Mutuelle Frais de Santé'),
-                "base": None,
-                "taux_salarial": None, 
-                "montant_salarial": ligne.get('montant_salarial', 0.0),
-                "taux_patronal": None, 
-                "montant_patronal": ligne.get('montant_patronal', 0.0)
-            })
+            bulletin_cotisations.append(LigneCotisation(
+                Categorie.COTISATION,
+                ligne.get('libelle', 'Mutuelle Frais de Santé'),
+                montant_salarial=ligne.get('montant_salarial', 0.0),
+                montant_patronal=ligne.get('montant_patronal', 0.0)
+            ))
 
     prevoyance_spec = contexte.contrat.get('specificites_paie', {}).get('prevoyance', {})
     if prevoyance_spec.get('adhesion'):
@@ -194,8 +191,8 @@ def calculer_cotisations(
                     
                     # --- AJOUT DE LA LOGIQUE FORFAIT SOCIAL ---
                     taux_fs = ligne.get('forfait_social')
-                    if taux_fs and ligne_calculee.get('montant_patronal', 0) > 0:
-                        montant_patronal_prev = ligne_calculee['montant_patronal']
+                    if taux_fs and ligne_calculee.montant_patronal > 0:
+                        montant_patronal_prev = ligne_calculee.montant_patronal
                         ligne_fs = _calculer_une_ligne(
                             f"Forfait social {taux_fs*100:.0f}% sur prévoyance",
                             montant_patronal_prev,
@@ -220,11 +217,10 @@ def calculer_cotisations(
     if remuneration_heures_supp > 0:
         taux_reduction = contexte.baremes.get('heures_supp', {}).get('reduction_salariale', {}).get('taux_reduction', {}).get('plafond_legal', 0.0)
         montant_reduction = round(-remuneration_heures_supp * taux_reduction, 2)
-        bulletin_cotisations.append({
-            "libelle": "Réduction de cotisations sur heures sup.", 
-            "base": remuneration_heures_supp, "taux_salarial": -taux_reduction, 
-            "montant_salarial": montant_reduction, "taux_patronal": None, "montant_patronal": 0.0
-            })
+        bulletin_cotisations.append(LigneCotisation(
+            Categorie.ALLEGEMENT, "Réduction de cotisations sur heures sup.",
+            base=remuneration_heures_supp, taux_salarial=-taux_reduction, montant_salarial=montant_reduction
+        ))
 
     # Ajout de la déduction forfaitaire patronale sur les heures supplémentaires
     regles_deduction = contexte.baremes.get('heures_supp', {}).get('deduction_patronale', {})
@@ -237,15 +233,13 @@ def calculer_cotisations(
         
         if montant_par_heure > 0:
             montant_deduction = round(-total_heures_supp * montant_par_heure, 2)
-            bulletin_cotisations.append({
-                "libelle": "Déduction forfaitaire heures suppl. pat.",
-                "base": total_heures_supp,
-                "taux_salarial": None,
-                "montant_salarial": 0.0,
-                "taux_patronal": None, 
-                "montant_patronal": montant_deduction
-            })
-
-    total_cotisations_salariales = sum(ligne.get('montant_salarial', 0.0) or 0.0 for ligne in bulletin_cotisations)
+            bulletin_cotisations.append(LigneCotisation(
+                Categorie.ALLEGEMENT,
+                "Déduction forfaitaire heures suppl. pat.",
+                base=total_heures_supp,
+                montant_patronal=montant_deduction
+            ))
+
+    total_cotisations_salariales = sum(ligne.montant_salarial or 0.0 for ligne in bulletin_cotisations)
     print("INFO: Calcul des cotisations terminé.", file=sys.stderr)
     return bulletin_cotisations, round(total_cotisations_salariales, 2)
\ No newline at end of file
@@ -1,7 +1,9 @@
 # moteur_paie/calcul_net.py
 import sys
 from .contexte import ContextePaie
-from typing import Dict, Any, List
+from .grille_pas import taux_neutre_contexte
+from .lignes import CATEGORIES_CSG_NON_DEDUCTIBLE, LigneCotisation
+from typing import Dict, Any, List, Tuple
 
 def _get_safe_float(value: Any, default: float = 0.0) -> float:
     if value is None: return default
@@ -15,16 +17,15 @@ def _calculer_net_imposable(
     contexte: ContextePaie, 
     salaire_brut: float, 
     total_cotisations_salariales: float, 
-    lignes_cotisations: List[Dict[str, Any]],
+    lignes_cotisations: List[LigneCotisation],
     remuneration_heures_supp: float # <-- NOUVEAU: On passe le montant des HS
 ) -> float:
     
 
-    montant_csg_non_deductible = 0.0
-    for ligne in lignes_cotisations:
-        libelle = ligne.get('libelle', '').lower()
-        if "csg/crds" in libelle and "non déductible" in libelle:
-            montant_csg_non_deductible += _get_safe_float(ligne.get('montant_salarial'))
+    montant_csg_non_deductible = sum(
+        _get_safe_float(ligne.montant_salarial) for ligne in lignes_cotisations
+        if ligne.categorie in CATEGORIES_CSG_NON_DEDUCTIBLE
+    )
     
     mutuelle_spec = contexte.contrat.get('specificites_paie', {}).get('mutuelle', {})
     part_patronale_mutuelle = 0.0
@@ -58,10 +59,16 @@ def _calculer_net_imposable(
     
     return round(net_imposable_final, 2)
 
-def _calculer_prelevement_a_la_source(contexte: ContextePaie, net_imposable: float ) -> float:
-    taux_pas = _get_safe_float(contexte.contrat.get('specificites_paie', {}).get('prelevement_a_la_source', {}).get('taux'))
+def _calculer_prelevement_a_la_source(contexte: ContextePaie, net_imposable: float ) -> Tuple[float, float]:
+    """Retourne (montant, taux en %). Sans taux personnalisé transmis, on applique la grille du taux neutre."""
+    pas_spec = contexte.contrat.get('specificites_paie', {}).get('prelevement_a_la_source', {})
+    if pas_spec.get('taux') is None or pas_spec.get('type_taux') == 'neutre':
+        taux_pas = round(taux_neutre_contexte(contexte, _get_safe_float(net_imposable)) * 100, 2)
+        print(f"INFO: Taux neutre du PAS appliqué : {taux_pas} %", file=sys.stderr)
+    else:
+        taux_pas = _get_safe_float(pas_spec.get('taux'))
     montant_pas = _get_safe_float(net_imposable) * (taux_pas / 100.0)
-    return round(montant_pas, 2)
+    return round(montant_pas, 2), taux_pas
 
 
 
@@ -123,7 +130,7 @@ def _calculer_net_a_payer(net_social: float, montant_pas: float, contexte: Conte
 def calculer_net_et_impot(
     contexte: ContextePaie,
     salaire_brut: float,
-    lignes_cotisations: List[Dict[str, Any]],
+    lignes_cotisations: List[LigneCotisation],
     total_cotisations_salariales: float,
     primes_non_soumises: List[Dict[str, Any]],
     remuneration_heures_supp: float,
@@ -142,7 +149,7 @@ def calculer_net_et_impot(
         remuneration_heures_supp
     )
     
-    montant_impot = _calculer_prelevement_a_la_source(contexte, net_imposable)
+    montant_impot, taux_pas = _calculer_prelevement_a_la_source(contexte, net_imposable)
     net_a_payer, remboursement_transport = _calculer_net_a_payer(
         net_social, 
         montant_impot, 
@@ -155,6 +162,7 @@ def calculer_net_et_impot(
         "net_social": net_social, 
         "net_imposable": net_imposable, 
         "montant_impot_pas": montant_impot, 
+        "taux_pas": taux_pas,
         "net_a_payer": net_a_payer,
         "remboursement_transport": remboursement_transport,
         "acompte_verse": montant_acompte # <--- AJOUTEZ CETTE LIGNE
@@ -3,19 +3,36 @@
 import sys
 from typing import Dict, Any, List
 
+from .lignes import Categorie, LigneCotisation
+
 # Note: Ce module suppose l'existence d'un objet "contexte" qui contient
 # les informations de l'employé, de l'entreprise et les barèmes/taux.
 
+# Paramètre T déjà calculé, par (version du catalogue de cotisations, effectif, taux AT/MP).
+# Le catalogue est un snapshot partagé (moteur_paie/baremes_timeline.py) : son id identifie la version.
+_cache_parametre_T: Dict[tuple, tuple] = {}
+
+
 def _calculer_parametre_T(contexte: 'ContextePaie') -> float:
+    return calculer_parametre_T(contexte.baremes.get('cotisations', {}), contexte.entreprise)
+
+
+def calculer_parametre_T(cotisations_doc: Dict[str, Any], entreprise: Dict[str, Any]) -> float:
     """
     Calcule dynamiquement le paramètre T en additionnant les taux de cotisations
     patronales concernées par la réduction générale.
     
     Cette méthode est plus robuste qu'un T hardcodé car elle s'adapte
     aux changements de législation si le fichier cotisations.json est à jour.
+    Le résultat est mémorisé par version du catalogue.
     """
+    cle = (id(cotisations_doc), entreprise.get('effectif', 0), entreprise.get('parametres_paie', {}).get('taux_at_mp', 0.0))
+    en_cache = _cache_parametre_T.get(cle)
+    if en_cache is not None and en_cache[0] is cotisations_doc:
+        return en_cache[1]
+
     taux_a_sommer = {}
-    cotisations_data = contexte.baremes.get('cotisations', {}).get('cotisations', [])
+    cotisations_data = cotisations_doc.get('cotisations', [])
     
     # On convertit la liste en dictionnaire pour un accès facile par ID
     catalogue_cotisations = {c['id']: c for c in cotisations_data}
@@ -33,7 +50,7 @@ def _calculer_parametre_T(contexte: 'ContextePaie') -> float:
     taux_a_sommer['ceg_t1'] = catalogue_cotisations.get('ceg_t1', {}).get('patronal', 0.0)
     
     # 3. Taux variables selon l'entreprise
-    effectif = contexte.entreprise.get('effectif', 0)
+    effectif = entreprise.get('effectif', 0)
     fnal_taux = catalogue_cotisations.get('fnal', {}).get('patronal', {})
     if effectif >= 50:
         taux_a_sommer['fnal'] = fnal_taux.get('taux_50_et_plus', 0.0)
@@ -42,7 +59,7 @@ def _calculer_parametre_T(contexte: 'ContextePaie') -> float:
 
     # 4. Taux AT/MP (spécifique à l'entreprise/employé)
     # Il est essentiel que ce taux soit correctement renseigné.
-    taux_at_mp = contexte.entreprise.get('parametres_paie', {}).get('taux_at_mp', 0.0)
+    taux_at_mp = entreprise.get('parametres_paie', {}).get('taux_at_mp', 0.0)
     if not taux_at_mp:
         print("AVERTISSEMENT: Le taux AT/MP n'est pas défini. La réduction générale sera sous-évaluée.", file=sys.stderr)
     taux_a_sommer['at_mp'] = taux_at_mp
@@ -53,6 +70,9 @@ def _calculer_parametre_T(contexte: 'ContextePaie') -> float:
     # On peut ajouter un plafond de sécurité si nécessaire, mais le calcul dynamique est la norme.
     
     print(f"DEBUG [Réduction]: Calcul du paramètre T = {parametre_T:.6f}", file=sys.stderr)
+    if len(_cache_parametre_T) >= 256:
+        _cache_parametre_T.clear()
+    _cache_parametre_T[cle] = (cotisations_doc, parametre_T)
     return parametre_T
 
 # Dans moteur_paie/calcul_reduction_generale.py
@@ -79,7 +99,7 @@ def calculer_reduction_generale(
     contexte: 'ContextePaie',
     salaire_brut_mois: float,
     heures_remunerees_mois: float,
-) -> dict[str, any] | None:
+) -> LigneCotisation | None:
     """
     Calcule le montant de la Réduction Générale avec régularisation progressive.
     C'est la méthode officielle et obligatoire.
@@ -134,13 +154,84 @@ def calculer_reduction_generale(
     print(f"DEBUG [Réduction]: Coeff C cumulé = {coefficient_C:.6f} | Réduction totale due = {reduction_totale_due:.2f} €", file=sys.stderr)
     print(f"DEBUG [Réduction]: Déjà appliqué = {reduction_deja_appliquee_N_1:.2f} € | Montant du mois = {montant_final} €", file=sys.stderr)
 
-    return {
-        "libelle": "Réduction générale de cotisations patronales",
-        "base": salaire_brut_mois,
-        "taux_salarial": None,
-        "montant_salarial": 0.0,
-        "taux_patronal": round(coefficient_C, 6) if coefficient_C > 0 else None,
-        "montant_patronal": montant_final,
+    return LigneCotisation(
+        Categorie.ALLEGEMENT,
+        "Réduction générale de cotisations patronales",
+        base=salaire_brut_mois,
+        taux_patronal=round(coefficient_C, 6) if coefficient_C > 0 else None,
+        montant_patronal=montant_final,
         # Info supplémentaire pour la mise à jour des cumuls
-        "valeur_cumulative_a_enregistrer": round(reduction_totale_due, 2)
-    }
\ No newline at end of file
+        cumul=round(reduction_totale_due, 2)
+    )
+
+
+def calculer_reduction_generale_lot(
+    bruts: List[List[float]],
+    heures: List[List[float]],
+    baremes_par_mois: List[Dict[str, Any]],
+    entreprise: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Réduction générale de toute une population sur l'année, en une passe sur la matrice
+    salariés × mois, avec la même régularisation progressive que `calculer_reduction_generale`.
+
+    Args:
+        bruts: Bruts mensuels, une ligne par salarié, une colonne par mois (depuis janvier).
+        heures: Heures rémunérées retenues pour le SMIC de référence, même forme.
+        baremes_par_mois: Snapshot de barèmes de chaque mois (ex: charger_baremes(data_dir, fin_du_mois)) ;
+                          T et le SMIC sont ceux de la version en vigueur chaque mois, le SMIC
+                          du mois s'appliquant aux heures cumulées depuis janvier.
+        entreprise: Contenu de la clé 'entreprise' d'entreprise.json.
+
+    Returns:
+        coefficients: C cumulé à fin de chaque mois.
+        montants: montant patronal du mois (négatif = réduction, positif = reprise), comme sur le bulletin.
+        cumuls: réduction totale due à fin de chaque mois (valeur enregistrée dans les cumuls).
+        totaux_annuels: réduction de l'année par salarié.
+    """
+    nb_mois = len(baremes_par_mois)
+    parametres_T = [calculer_parametre_T(b.get('cotisations', {}), entreprise) for b in baremes_par_mois]
+    smic_horaires = [b.get('smic', {}).get('cas_general', 0.0) for b in baremes_par_mois]
+    if not all(smic_horaires):
+        raise ValueError("SMIC horaire (cas_general) non trouvé dans les barèmes d'au moins un mois.")
+
+    coefficients, montants, cumuls, totaux_annuels = [], [], [], []
+    for ligne_bruts, ligne_heures in zip(bruts, heures):
+        if len(ligne_bruts) != nb_mois or len(ligne_heures) != nb_mois:
+            raise ValueError(f"Chaque ligne doit couvrir {nb_mois} mois (un snapshot de barèmes par mois).")
+        brut_cumule = heures_cumulees = deja_applique = 0.0
+        ligne_c, ligne_montants, ligne_cumuls = [], [], []
+        for m in range(nb_mois):
+            brut_cumule += ligne_bruts[m]
+            heures_cumulees += ligne_heures[m]
+            # SMIC de référence : SMIC en vigueur ce mois-ci × heures cumulées, comme
+            # _calculer_smic_de_reference_cumule (une revalorisation s'applique à tout le cumul).
+            seuil = 1.6 * smic_horaires[m] * heures_cumulees
+            if brut_cumule >= seuil:
+                coefficient_C = reduction_totale_due = 0.0
+            elif brut_cumule == 0:
+                # Pas de ligne sur le bulletin : les cumuls restent inchangés.
+                ligne_c.append(0.0)
+                ligne_montants.append(0.0)
+                ligne_cumuls.append(deja_applique)
+                continue
+            else:
+                T = parametres_T[m]
+                coefficient_C = min(max(0.0, (T / 0.6) * (seuil / brut_cumule - 1)), T)
+                reduction_totale_due = brut_cumule * coefficient_C
+            ligne_c.append(round(coefficient_C, 6))
+            ligne_montants.append(-round(reduction_totale_due - deja_applique, 2))
+            deja_applique = round(reduction_totale_due, 2)
+            ligne_cumuls.append(deja_applique)
+        coefficients.append(ligne_c)
+        montants.append(ligne_montants)
+        cumuls.append(ligne_cumuls)
+        totaux_annuels.append(deja_applique)
+
+    return {
+        "parametres_T": parametres_T,
+        "coefficients": coefficients,
+        "montants": montants,
+        "cumuls": cumuls,
+        "totaux_annuels": totaux_annuels,
+    }
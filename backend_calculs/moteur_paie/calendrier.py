@@ -0,0 +1,184 @@
+# moteur_paie/calendrier.py
+
+import calendar
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Service de calendrier partagé par tous les modules de calcul.
+#
+# Périodes de paie, jours fériés, clés de semaine ISO et décomptes de jours ne dépendent que
+# de l'année, du mois et de la règle de l'entreprise : ils sont calculés arithmétiquement une
+# seule fois par processus (lru_cache) et réutilisés pour tous les salariés, au lieu de
+# reconstruire des listes de dates à chaque bulletin.
+
+# Règle par défaut (entreprise.json > parametres_paie > periode_de_paie) : avant-dernier vendredi
+JOUR_DE_FIN_PAR_DEFAUT = 4
+OCCURRENCE_PAR_DEFAUT = -2
+
+
+@lru_cache(maxsize=None)
+def nombre_de_jours(annee: int, mois: int) -> int:
+    return calendar.monthrange(annee, mois)[1]
+
+
+def fin_du_mois(annee: int, mois: int) -> date:
+    return date(annee, mois, nombre_de_jours(annee, mois))
+
+
+def mois_precedent(annee: int, mois: int) -> Tuple[int, int]:
+    return (annee - 1, 12) if mois == 1 else (annee, mois - 1)
+
+
+def mois_suivant(annee: int, mois: int) -> Tuple[int, int]:
+    return (annee + 1, 1) if mois == 12 else (annee, mois + 1)
+
+
+@lru_cache(maxsize=None)
+def nieme_jour_semaine(annee: int, mois: int, jour_cible: int, occurrence_cible: int) -> date:
+    """
+    Date du N-ième jour de la semaine du mois, sans énumérer les jours.
+    jour_cible: 0 pour Lundi, ..., 6 pour Dimanche.
+    occurrence_cible: 1 pour le premier, -1 pour le dernier (0 équivaut au premier).
+    """
+    if not 0 <= jour_cible <= 6:
+        raise ValueError(f"Aucun jour correspondant au jour {jour_cible} trouvé pour {mois}/{annee}.")
+    nb_jours = nombre_de_jours(annee, mois)
+    if occurrence_cible >= 0:
+        premier = 1 + (jour_cible - date(annee, mois, 1).weekday()) % 7
+        jour = premier + 7 * (max(occurrence_cible, 1) - 1)
+    else:
+        dernier = nb_jours - (date(annee, mois, nb_jours).weekday() - jour_cible) % 7
+        jour = dernier + 7 * (occurrence_cible + 1)
+    if not 1 <= jour <= nb_jours:
+        raise ValueError(f"L'occurrence {occurrence_cible} est invalide pour le mois de {mois}/{annee}.")
+    return date(annee, mois, jour)
+
+
+@lru_cache(maxsize=None)
+def fin_de_periode(annee: int, mois: int, jour_de_fin: int = JOUR_DE_FIN_PAR_DEFAUT, occurrence: int = OCCURRENCE_PAR_DEFAUT) -> date:
+    """Fin de la période de paie du mois : le dimanche de la semaine du jour de référence."""
+    reference = nieme_jour_semaine(annee, mois, jour_de_fin, occurrence)
+    return reference + timedelta(days=6 - reference.weekday())
+
+
+@lru_cache(maxsize=None)
+def periode_de_paie(annee: int, mois: int, jour_de_fin: int = JOUR_DE_FIN_PAR_DEFAUT, occurrence: int = OCCURRENCE_PAR_DEFAUT) -> Tuple[date, date]:
+    """(début, fin) de la période de paie : du lendemain de la fin de la période précédente à la fin de celle du mois."""
+    fin_precedente = fin_de_periode(*mois_precedent(annee, mois), jour_de_fin, occurrence)
+    return fin_precedente + timedelta(days=1), fin_de_periode(annee, mois, jour_de_fin, occurrence)
+
+
+def regle_entreprise(entreprise: Dict) -> Tuple[int, int]:
+    """(jour_de_fin, occurrence) de la règle de période de paie de l'entreprise."""
+    regles = entreprise.get('parametres_paie', {}).get('periode_de_paie', {})
+    return regles.get('jour_de_fin', JOUR_DE_FIN_PAR_DEFAUT), regles.get('occurrence', OCCURRENCE_PAR_DEFAUT)
+
+
+def precalculer_periodes(annee_debut: int, annee_fin: int, jour_de_fin: int = JOUR_DE_FIN_PAR_DEFAUT, occurrence: int = OCCURRENCE_PAR_DEFAUT) -> Dict[Tuple[int, int], Tuple[date, date]]:
+    """Périodes de paie de chaque mois des années [annee_debut, annee_fin] pour une règle ; remplit le cache."""
+    return {
+        (a, m): periode_de_paie(a, m, jour_de_fin, occurrence)
+        for a in range(annee_debut, annee_fin + 1)
+        for m in range(1, 13)
+    }
+
+
+def mois_couverts(debut: date, fin: date) -> List[Tuple[int, int]]:
+    """Mois (année, mois) touchés par l'intervalle [debut, fin], dans l'ordre."""
+    mois = []
+    a, m = debut.year, debut.month
+    while (a, m) <= (fin.year, fin.month):
+        mois.append((a, m))
+        a, m = mois_suivant(a, m)
+    return mois
+
+
+@lru_cache(maxsize=None)
+def _paques(annee: int) -> date:
+    """Dimanche de Pâques (algorithme de Meeus / Jones / Butcher, calendrier grégorien)."""
+    a, b, c = annee % 19, annee // 100, annee % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mois = (h + l - 7 * m + 114) // 31
+    jour = ((h + l - 7 * m + 114) % 31) + 1
+    return date(annee, mois, jour)
+
+
+@lru_cache(maxsize=None)
+def jours_feries(annee: int, alsace_moselle: bool = False) -> Dict[date, str]:
+    """Jours fériés légaux de l'année (avec le Vendredi saint et la Saint-Étienne en Alsace-Moselle)."""
+    paques = _paques(annee)
+    feries = {
+        date(annee, 1, 1): "Jour de l'an",
+        paques + timedelta(days=1): "Lundi de Pâques",
+        date(annee, 5, 1): "Fête du travail",
+        date(annee, 5, 8): "Victoire 1945",
+        paques + timedelta(days=39): "Ascension",
+        paques + timedelta(days=50): "Lundi de Pentecôte",
+        date(annee, 7, 14): "Fête nationale",
+        date(annee, 8, 15): "Assomption",
+        date(annee, 11, 1): "Toussaint",
+        date(annee, 11, 11): "Armistice 1918",
+        date(annee, 12, 25): "Noël",
+    }
+    if alsace_moselle:
+        feries[paques - timedelta(days=2)] = "Vendredi saint"
+        feries[date(annee, 12, 26)] = "Saint-Étienne"
+    return dict(sorted(feries.items()))
+
+
+def est_ferie(jour: date, alsace_moselle: bool = False) -> bool:
+    return jour in jours_feries(jour.year, alsace_moselle)
+
+
+def cle_semaine(jour: date) -> Tuple[int, int]:
+    """Clé (année ISO, numéro de semaine ISO) utilisée pour le décompte hebdomadaire des heures."""
+    return _cle_semaine(jour.toordinal())
+
+
+@lru_cache(maxsize=4096)
+def _cle_semaine(ordinal: int) -> Tuple[int, int]:
+    return tuple(date.fromordinal(ordinal).isocalendar()[:2])
+
+
+@lru_cache(maxsize=None)
+def jours_du_mois(annee: int, mois: int, alsace_moselle: bool = False) -> Tuple[Dict, ...]:
+    """
+    Description de chaque jour du mois : {date, jour, jour_semaine, semaine_iso, ferie}.
+    Le tuple est partagé entre tous les appelants : ne pas modifier ses éléments.
+    """
+    feries = jours_feries(annee, alsace_moselle)
+    debut = date(annee, mois, 1)
+    jours = []
+    for i in range(nombre_de_jours(annee, mois)):
+        d = debut + timedelta(days=i)
+        jours.append({
+            "date": d,
+            "jour": d.day,
+            "jour_semaine": d.weekday(),
+            "semaine_iso": cle_semaine(d),
+            "ferie": feries.get(d),
+        })
+    return tuple(jours)
+
+
+@lru_cache(maxsize=None)
+def decompte_jours(annee: int, mois: int, alsace_moselle: bool = False) -> Dict[str, int]:
+    """Jours ouvrés (lundi-vendredi), ouvrables (lundi-samedi) et fériés chômables du mois."""
+    ouvres = ouvrables = feries = 0
+    for j in jours_du_mois(annee, mois, alsace_moselle):
+        if j["jour_semaine"] == 6:
+            continue
+        if j["ferie"]:
+            feries += 1
+            continue
+        ouvrables += 1
+        if j["jour_semaine"] < 5:
+            ouvres += 1
+    return {"jours_ouvres": ouvres, "jours_ouvrables": ouvrables, "jours_feries": feries}
@@ -2,11 +2,14 @@
 
 import json
 import sys
+from datetime import date
 from pathlib import Path
 from typing import Any, Dict, List
 
+from .baremes_timeline import charger_baremes
+
 class ContextePaie:
-    def __init__(self, chemin_contrat: str, chemin_entreprise: str, chemin_cumuls: str, chemin_data_dir: str = 'data'):
+    def __init__(self, chemin_contrat: str, chemin_entreprise: str, chemin_cumuls: str, chemin_data_dir: str = 'data', date_reference: date | None = None):
         """
         Initialise le contexte en chargeant tous les fichiers JSON.
         
@@ -15,9 +18,11 @@ class ContextePaie:
             chemin_entreprise (str): Chemin vers le fichier entreprise.json.
             chemin_cumuls (str): Chemin vers le fichier cumuls.json du salarié.
             chemin_data_dir (str): Chemin vers le dossier contenant les barèmes.
+            date_reference (date): Date à laquelle résoudre les barèmes (versions courantes si None).
         """
         print("INFO: Initialisation du contexte de paie...", file=sys.stderr)
-        data_dir = Path(chemin_data_dir)
+        self.data_dir = Path(chemin_data_dir)
+        self.date_reference = date_reference
 
         self.entreprise = self._load_json(chemin_entreprise).get('entreprise', {})
         self.contrat = self._load_json(chemin_contrat)
@@ -25,18 +30,31 @@ class ContextePaie:
         # CORRIGÉ: On charge le fichier de cumuls spécifique à l'employé
         self.cumuls = self._load_json(chemin_cumuls)
         
-        self.baremes = {
-            "cotisations": self._load_json(data_dir / 'cotisations.json'),
-            "heures_supp": self._load_json(data_dir / 'heuresupp.json'),
-            "pas": self._load_json(data_dir / 'pas.json').get('baremes', []),
-            "smic": self._load_json(data_dir / 'smic.json').get('smic_horaire', {}),
-            "pss": self._load_json(data_dir / 'plafonds.json').get('pss', {}),
-            "frais_pro": self._load_json(data_dir / 'frais_pro.json'),
-            "primes": self._load_json(data_dir / 'primes.json').get('primes', []),
-            "conventions_collectives": self._load_json(data_dir / 'conventions_collectives.json')
-        }
+        # Snapshot partagé (moteur_paie/baremes_timeline.py) : ne pas le modifier.
+        self.baremes = charger_baremes(self.data_dir, date_reference)
         print("INFO: Contexte chargé avec succès.", file=sys.stderr)
 
+    def resoudre_baremes(self, date_reference: date) -> None:
+        """Remplace les barèmes par ceux en vigueur à la date donnée (ex: fin de la période de paie)."""
+        self.date_reference = date_reference
+        self.baremes = charger_baremes(self.data_dir, date_reference)
+        print(f"INFO: Barèmes résolus au {date_reference.strftime('%d/%m/%Y')}.", file=sys.stderr)
+
+    @classmethod
+    def depuis_donnees(cls, contrat: Dict[str, Any], entreprise: Dict[str, Any], baremes: Dict[str, Any], cumuls: Dict[str, Any] | None = None) -> "ContextePaie":
+        """
+        Construit un contexte à partir de données déjà en mémoire, sans lecture de fichier
+        (simulations, salariés fictifs). `entreprise` est le contenu de la clé 'entreprise'.
+        """
+        contexte = cls.__new__(cls)
+        contexte.data_dir = None
+        contexte.date_reference = None
+        contexte.entreprise = entreprise
+        contexte.contrat = contrat
+        contexte.cumuls = cumuls if cumuls is not None else {"cumuls": {}}
+        contexte.baremes = baremes
+        return contexte
+
     def _load_json(self, file_path: Path | str) -> Dict[str, Any]:
         """Fonction utilitaire pour charger un fichier JSON en gérant les erreurs."""
         try:
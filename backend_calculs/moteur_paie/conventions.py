@@ -0,0 +1,79 @@
+# moteur_paie/conventions.py
+
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Index des conventions collectives (conventions_collectives.json).
+#
+# Le document est compilé une fois par snapshot de barèmes : une entrée par IDCC, avec les paliers
+# de la prime d'ancienneté triés par années minimales (recherche par bisection) et les salaires
+# minima en dictionnaire coefficient -> valeur. L'ancienneté est calculée à la fin de la période
+# de paie, ce qui rend la prime reproductible d'une exécution à l'autre.
+
+# id(document des conventions) -> (document, index compilé) ; le document est gardé pour que l'id reste valide.
+_index: Dict[int, Tuple[Dict[str, Any], "IndexConventions"]] = {}
+
+
+def normaliser_idcc(idcc: Any) -> str:
+    """IDCC sur 4 chiffres ("292", 292 et "idcc_0292" donnent "0292")."""
+    texte = str(idcc).strip()
+    if texte.lower().startswith("idcc_"):
+        texte = texte[5:]
+    return texte.zfill(4) if texte.isdigit() else texte
+
+
+class ConventionCollective:
+    """Règles compilées d'une convention : paliers d'ancienneté et salaires minima."""
+
+    __slots__ = ("idcc", "seuils_anciennete", "taux_anciennete", "methode_base", "valeur_base", "minima")
+
+    def __init__(self, idcc: str, regles: Dict[str, Any]):
+        self.idcc = idcc
+        regles_prime = regles.get('prime_anciennete', {})
+        paliers = sorted(regles_prime.get('bareme', []), key=lambda p: p['annees_min'])
+        self.seuils_anciennete: List[float] = [float(p['annees_min']) for p in paliers]
+        self.taux_anciennete: List[float] = [p.get('taux', 0.0) for p in paliers]
+        regle_base = regles_prime.get('base_de_calcul', {})
+        self.methode_base: Optional[str] = regle_base.get('methode')
+        self.valeur_base: float = regle_base.get('valeur', 0.0)
+        self.minima: Dict[Any, float] = {m.get('coefficient'): m.get('valeur', 0.0) for m in regles.get('salaires_minima', [])}
+
+    def taux_prime_anciennete(self, anciennete_annees: float) -> float:
+        """Taux du dernier palier atteint (0.0 sous le premier palier)."""
+        i = bisect_right(self.seuils_anciennete, anciennete_annees)
+        return self.taux_anciennete[i - 1] if i else 0.0
+
+    def salaire_minimum(self, coefficient: Any) -> float:
+        return self.minima.get(coefficient, 0.0)
+
+
+class IndexConventions:
+    """Conventions collectives indexées par IDCC normalisé."""
+
+    def __init__(self, document: Dict[str, Any]):
+        self.conventions: Dict[str, ConventionCollective] = {}
+        for cle, regles in document.items():
+            if isinstance(regles, dict):
+                idcc = normaliser_idcc(cle)
+                self.conventions[idcc] = ConventionCollective(idcc, regles)
+
+    def get(self, idcc: Any) -> Optional[ConventionCollective]:
+        return self.conventions.get(normaliser_idcc(idcc))
+
+
+def index_conventions(document: Dict[str, Any]) -> IndexConventions:
+    """Index compilé pour ce document (partagé tant que le snapshot de barèmes l'est)."""
+    en_cache = _index.get(id(document))
+    if en_cache is not None and en_cache[0] is document:
+        return en_cache[1]
+    compilees = IndexConventions(document)
+    _index[id(document)] = (document, compilees)
+    return compilees
+
+
+@lru_cache(maxsize=4096)
+def anciennete_en_annees(date_entree: date, date_fin: date) -> float:
+    """Ancienneté en années (365,25 jours) à la date de fin de période."""
+    return (date_fin - date_entree).days / 365.25
@@ -0,0 +1,140 @@
+# moteur_paie/grille_pas.py
+
+import sys
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from .calendrier import JOUR_DE_FIN_PAR_DEFAUT, OCCURRENCE_PAR_DEFAUT, mois_suivant, periode_de_paie, regle_entreprise
+
+# Grille du taux neutre (non personnalisé) du prélèvement à la source.
+#
+# pas.json contient une liste de barèmes {periode, zone, tranches: [{plafond, taux}]}. On la
+# compile une fois par snapshot de barèmes en un index (periode, zone) -> (plafonds, taux),
+# puis chaque recherche est une bisection sur les plafonds. Une tranche s'applique strictement
+# sous son plafond (BOFiP : "de 1 620 € à moins de 1 683 €") ; le dernier plafond est null.
+
+ZONES = ("metropole", "guadeloupe_reunion_martinique", "guyane_mayotte")
+# Code département (3 premiers chiffres du code postal) -> zone du barème
+ZONES_OUTRE_MER = {
+    "971": "guadeloupe_reunion_martinique",
+    "972": "guadeloupe_reunion_martinique",
+    "974": "guadeloupe_reunion_martinique",
+    "973": "guyane_mayotte",
+    "976": "guyane_mayotte",
+}
+# Contrats courts (CDD de 2 mois au plus) : abattement de 50 % du SMIC mensuel sur la base.
+DUREE_CONTRAT_COURT_MOIS = 2
+ABATTEMENT_CONTRAT_COURT_SMIC = 0.5
+
+# id(liste des barèmes PAS) -> (liste, grille compilée) ; la liste est gardée pour que l'id reste valide.
+_grilles: Dict[int, Tuple[List[Dict[str, Any]], "GrillePAS"]] = {}
+
+
+class GrillePAS:
+    """Barèmes du taux neutre indexés par (période, zone)."""
+
+    def __init__(self, baremes_pas: List[Dict[str, Any]]):
+        self.index: Dict[Tuple[str, str], Tuple[List[float], List[float]]] = {}
+        for bareme in baremes_pas:
+            tranches = bareme.get('tranches') or []
+            plafonds = [float(t['plafond']) for t in tranches if t.get('plafond') is not None]
+            taux = [float(t.get('taux') or 0.0) for t in tranches]
+            if len(taux) != len(plafonds) + 1:
+                print(f"AVERTISSEMENT: Barème PAS {bareme.get('periode')}/{bareme.get('zone')} ignoré (dernière tranche non ouverte).", file=sys.stderr)
+                continue
+            self.index[(bareme.get('periode'), bareme.get('zone'))] = (plafonds, taux)
+        # Périodes "mensuel_AAAA" triées par année, pour choisir celle en vigueur à une date.
+        self.periodes = sorted({p for p, _ in self.index}, key=lambda p: (p.rsplit('_', 1)[-1], p))
+
+    def periode_pour(self, jour: Optional[date] = None) -> str:
+        """Période la plus récente dont l'année ne dépasse pas celle du jour donné (la dernière si None)."""
+        if not self.periodes:
+            raise ValueError("Aucun barème de taux neutre dans pas.json.")
+        if jour is None:
+            return self.periodes[-1]
+        candidates = [p for p in self.periodes if p.rsplit('_', 1)[-1] <= str(jour.year)]
+        return candidates[-1] if candidates else self.periodes[0]
+
+    def taux(self, base: float, zone: str = "metropole", periode: Optional[str] = None, prorata: float = 1.0) -> float:
+        """Taux neutre (fraction) applicable à une base mensuelle ; les plafonds sont multipliés par `prorata`."""
+        plafonds, taux = self.index[(periode or self.periode_pour(), zone)]
+        if prorata != 1.0:
+            base = base / prorata
+        return taux[bisect_right(plafonds, base)]
+
+    def taux_lot(self, bases: List[float], zone: str = "metropole", periode: Optional[str] = None) -> List[float]:
+        """Taux neutres d'une série de bases (ex: tous les nets imposables d'une entreprise)."""
+        plafonds, taux = self.index[(periode or self.periode_pour(), zone)]
+        return [taux[bisect_right(plafonds, b)] for b in bases]
+
+    def montants_lot(self, bases: List[float], zone: str = "metropole", periode: Optional[str] = None) -> List[float]:
+        return [round(b * t, 2) for b, t in zip(bases, self.taux_lot(bases, zone, periode))]
+
+
+def grille(baremes_pas: List[Dict[str, Any]]) -> GrillePAS:
+    """Grille compilée pour cette liste de barèmes (partagée tant que le snapshot de barèmes l'est)."""
+    en_cache = _grilles.get(id(baremes_pas))
+    if en_cache is not None and en_cache[0] is baremes_pas:
+        return en_cache[1]
+    compilee = GrillePAS(baremes_pas)
+    _grilles[id(baremes_pas)] = (baremes_pas, compilee)
+    return compilee
+
+
+def zone_du_salarie(contrat: Dict[str, Any]) -> str:
+    """Zone du barème : indiquée dans le contrat, sinon déduite du code postal du salarié."""
+    zone = contrat.get('specificites_paie', {}).get('prelevement_a_la_source', {}).get('zone')
+    if zone in ZONES:
+        return zone
+    code_postal = str(contrat.get('salarie', {}).get('adresse', {}).get('code_postal', ''))
+    return ZONES_OUTRE_MER.get(code_postal[:3], "metropole")
+
+
+def prorata_du_mois(contrat: Dict[str, Any], jour: Optional[date],
+                    regle: Tuple[int, int] = (JOUR_DE_FIN_PAR_DEFAUT, OCCURRENCE_PAR_DEFAUT)) -> float:
+    """
+    Part de la période de paie contenant `jour` couverte par le contrat, quand il commence ou finit
+    dans cette période. `regle` est la règle (jour_de_fin, occurrence) de l'entreprise.
+    """
+    if jour is None:
+        return 1.0
+    premier, dernier = periode_de_paie(jour.year, jour.month, *regle)
+    if jour > dernier:
+        premier, dernier = periode_de_paie(*mois_suivant(jour.year, jour.month), *regle)
+    infos = contrat.get('contrat', {})
+    try:
+        debut = max(premier, date.fromisoformat(infos['date_entree'])) if infos.get('date_entree') else premier
+        fin = min(dernier, date.fromisoformat(infos['date_sortie'])) if infos.get('date_sortie') else dernier
+    except ValueError:
+        return 1.0
+    if fin < debut:
+        return 1.0
+    return ((fin - debut).days + 1) / ((dernier - premier).days + 1)
+
+
+def est_contrat_court(contrat: Dict[str, Any]) -> bool:
+    infos = contrat.get('contrat', {})
+    if infos.get('type_contrat') != 'CDD' or not infos.get('date_entree') or not infos.get('date_sortie'):
+        return False
+    try:
+        debut, fin = date.fromisoformat(infos['date_entree']), date.fromisoformat(infos['date_sortie'])
+    except ValueError:
+        return False
+    mois = (fin.year - debut.year) * 12 + fin.month - debut.month + (1 if fin.day >= debut.day else 0)
+    return mois <= DUREE_CONTRAT_COURT_MOIS
+
+
+def taux_neutre_contexte(contexte: 'ContextePaie', net_imposable: float) -> float:
+    """Taux neutre (fraction) pour le salarié du contexte, période et zone résolues, contrats courts inclus."""
+    g = grille(contexte.baremes.get('pas', []))
+    base = net_imposable
+    if est_contrat_court(contexte.contrat):
+        smic_mensuel = contexte.baremes.get('smic', {}).get('cas_general', 0.0) * 35 * 52 / 12
+        base = max(0.0, base - ABATTEMENT_CONTRAT_COURT_SMIC * smic_mensuel)
+    return g.taux(
+        base,
+        zone=zone_du_salarie(contexte.contrat),
+        periode=g.periode_pour(contexte.date_reference),
+        prorata=prorata_du_mois(contexte.contrat, contexte.date_reference, regle_entreprise(contexte.entreprise)),
+    )
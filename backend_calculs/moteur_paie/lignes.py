@@ -0,0 +1,117 @@
+# moteur_paie/lignes.py
+
+from enum import IntEnum
+from typing import Any, Dict, Optional, Tuple
+
+# Lignes de bulletin typées.
+#
+# Chaque ligne porte une catégorie explicite (entier) fixée par le module qui la crée : les étapes
+# suivantes (heures sup., CSG non déductible, blocs d'affichage, totaux) lisent ce champ au lieu de
+# re-parcourir les libellés. Les classes utilisent __slots__ (pas de __dict__ par ligne) et se
+# sérialisent en tuple pour le stockage en masse ; en_dict() produit le format historique attendu
+# par le template et la sortie JSON du générateur.
+
+
+class Categorie(IntEnum):
+    # --- Composants du brut ---
+    SALAIRE_BASE = 1
+    HS_STRUCTURELLES = 2
+    SOUS_TOTAL = 3
+    HS_CONJONCTURELLES = 4
+    ABSENCE = 5
+    ABSENCE_HS = 6
+    CONGES_ABSENCE = 7
+    CONGES_INDEMNITE = 8
+    PRIME = 9
+    AVANTAGE_NATURE = 10
+    # --- Cotisations ---
+    COTISATION = 20
+    CSG_DEDUCTIBLE = 21
+    CSG_NON_DEDUCTIBLE = 22
+    CSG_HS = 23
+    AUTRE_CONTRIBUTION = 24
+    ALLEGEMENT = 25
+
+
+CATEGORIES_CONGES = frozenset({Categorie.CONGES_ABSENCE, Categorie.CONGES_INDEMNITE})
+CATEGORIES_ABSENCES = frozenset({Categorie.ABSENCE, Categorie.ABSENCE_HS})
+CATEGORIES_CSG_NON_DEDUCTIBLE = frozenset({Categorie.CSG_NON_DEDUCTIBLE, Categorie.CSG_HS})
+
+# Cotisations du catalogue affichées dans le bloc "autres contributions" de l'employeur.
+IDS_AUTRES_CONTRIBUTIONS = frozenset({
+    'fnal', 'CFP', 'taxe_apprentissage', 'taxe_apprentissage_solde', 'csa', 'dialogue_social', 'versement_mobilite',
+})
+
+
+class LigneBrut:
+    """Composant du salaire brut (gain ou perte)."""
+
+    __slots__ = ("categorie", "libelle", "quantite", "taux", "gain", "perte")
+
+    def __init__(self, categorie: Categorie, libelle: str, quantite: Optional[float] = None,
+                 taux: Optional[float] = None, gain: Optional[float] = None, perte: Optional[float] = None):
+        self.categorie = categorie
+        self.libelle = libelle
+        self.quantite = quantite
+        self.taux = taux
+        self.gain = gain
+        self.perte = perte
+
+    @property
+    def is_sous_total(self) -> bool:
+        return self.categorie == Categorie.SOUS_TOTAL
+
+    def en_tuple(self) -> Tuple:
+        return (int(self.categorie), self.libelle, self.quantite, self.taux, self.gain, self.perte)
+
+    @classmethod
+    def depuis_tuple(cls, t: Tuple) -> "LigneBrut":
+        return cls(Categorie(t[0]), *t[1:])
+
+    def en_dict(self) -> Dict[str, Any]:
+        d = {"libelle": self.libelle, "quantite": self.quantite, "taux": self.taux, "gain": self.gain, "perte": self.perte}
+        if self.is_sous_total:
+            d["is_sous_total"] = True
+        return d
+
+    def __repr__(self) -> str:
+        return f"LigneBrut({self.categorie.name}, {self.libelle!r}, gain={self.gain}, perte={self.perte})"
+
+
+class LigneCotisation:
+    """Ligne de cotisation, contribution ou allègement (parts salariale et patronale)."""
+
+    __slots__ = ("categorie", "libelle", "base", "taux_salarial", "montant_salarial", "taux_patronal", "montant_patronal", "cumul")
+
+    def __init__(self, categorie: Categorie, libelle: str, base: Optional[float] = None,
+                 taux_salarial: Optional[float] = None, montant_salarial: float = 0.0,
+                 taux_patronal: Optional[float] = None, montant_patronal: float = 0.0, cumul: Optional[float] = None):
+        self.categorie = categorie
+        self.libelle = libelle
+        self.base = base
+        self.taux_salarial = taux_salarial
+        self.montant_salarial = montant_salarial
+        self.taux_patronal = taux_patronal
+        self.montant_patronal = montant_patronal
+        # Valeur cumulée à reporter dans les cumuls annuels (réduction générale)
+        self.cumul = cumul
+
+    def en_tuple(self) -> Tuple:
+        return (int(self.categorie), self.libelle, self.base, self.taux_salarial, self.montant_salarial,
+                self.taux_patronal, self.montant_patronal, self.cumul)
+
+    @classmethod
+    def depuis_tuple(cls, t: Tuple) -> "LigneCotisation":
+        return cls(Categorie(t[0]), *t[1:])
+
+    def en_dict(self) -> Dict[str, Any]:
+        d = {
+            "libelle": self.libelle, "base": self.base, "taux_salarial": self.taux_salarial,
+            "montant_salarial": self.montant_salarial, "taux_patronal": self.taux_patronal, "montant_patronal": self.montant_patronal,
+        }
+        if self.cumul is not None:
+            d["valeur_cumulative_a_enregistrer"] = self.cumul
+        return d
+
+    def __repr__(self) -> str:
+        return f"LigneCotisation({self.categorie.name}, {self.libelle!r}, sal={self.montant_salarial}, pat={self.montant_patronal})"
@@ -0,0 +1,66 @@
+# moteur_paie/metriques.py
+
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+# Chronométrage des étapes de la chaîne de paie.
+#
+# Le générateur encadre chacune de ses étapes par `chrono.etape(nom)` (voir calculer_bulletin).
+# Quand la variable d'environnement PAIE_METRIQUES est définie (l'API la positionne en lançant le
+# sous-processus), les durées et la taille du PDF sont émises en une ligne JSON préfixée sur
+# stderr, que l'API relit pour ses propres métriques
+# (backend_api/services/metrics.py, parse_engine_metrics). Le benchmark s'appuie sur la même classe.
+
+PREFIXE = "METRIQUES: "
+VARIABLE_ENVIRONNEMENT = "PAIE_METRIQUES"
+
+
+def metriques_actives() -> bool:
+    return bool(os.environ.get(VARIABLE_ENVIRONNEMENT))
+
+
+class Chronometre:
+    """Durées (secondes) de chaque étape ; une mesure par passage dans l'étape."""
+
+    def __init__(self):
+        self.durees: Dict[str, List[float]] = defaultdict(list)
+        self.compteurs: Dict[str, float] = defaultdict(float)
+
+    @contextlib.contextmanager
+    def etape(self, nom: str):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durees[nom].append(time.perf_counter() - debut)
+
+    def compter(self, nom: str, valeur: float = 1) -> None:
+        self.compteurs[nom] += valeur
+
+    def totaux_ms(self) -> Dict[str, float]:
+        return {nom: round(sum(mesures) * 1000, 3) for nom, mesures in self.durees.items()}
+
+    def statistiques(self, etapes: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Nombre de mesures, total, moyenne et 95e centile de chaque étape."""
+        stats = {}
+        for nom in (etapes if etapes is not None else self.durees):
+            mesures = sorted(self.durees.get(nom, []))
+            if not mesures:
+                continue
+            stats[nom] = {
+                "mesures": len(mesures),
+                "total_s": round(sum(mesures), 4),
+                "moyenne_ms": round(sum(mesures) / len(mesures) * 1000, 4),
+                "p95_ms": round(mesures[min(len(mesures) - 1, int(len(mesures) * 0.95))] * 1000, 4),
+            }
+        return stats
+
+    def emettre(self) -> None:
+        """Écrit la ligne de métriques sur stderr (lue par l'API)."""
+        ligne: Dict[str, Any] = {"etapes_ms": self.totaux_ms(), "compteurs": dict(self.compteurs)}
+        print(PREFIXE + json.dumps(ligne), file=sys.stderr)
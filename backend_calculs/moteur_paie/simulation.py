@@ -0,0 +1,191 @@
+# moteur_paie/simulation.py
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import sys
+import traceback
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .baremes_timeline import charger_baremes
+from .contexte import ContextePaie
+from .solveur_net_brut import evaluer_brut
+
+# Simulation de masse salariale ("what-if") à l'échelle de l'entreprise.
+#
+# Un scénario est un dictionnaire de surcharges appliquées à l'entreprise, aux barèmes ou aux
+# salaires ; chaque salarié de la population est passé dans la chaîne réelle (cotisations,
+# réduction générale, nets) au salaire de base de son contrat, et on retourne les totaux et
+# leurs écarts par rapport à la situation actuelle. Rien n'est écrit : ni cumuls, ni PDF, ni base.
+# La réduction générale est calculée sur un mois isolé (sans les cumuls de l'année).
+#
+# Surcharges reconnues :
+#   augmentation    : hausse des salaires de base (0.03 pour +3 %)
+#   taux_at_mp      : taux AT/MP de l'entreprise, en % (comme dans entreprise.json)
+#   effectif        : effectif de l'entreprise (seuils de 11 et 50 salariés)
+#   smic_horaire    : nouveau SMIC horaire ; les salaires de base inférieurs y sont relevés
+#   pss_mensuel     : nouveau plafond mensuel de la sécurité sociale
+#   cotisations     : {id de cotisation: {champ: valeur}} pour changer un taux du catalogue
+
+SURCHARGES = ("augmentation", "taux_at_mp", "effectif", "smic_horaire", "pss_mensuel", "cotisations")
+INDICATEURS = ("salaire_brut", "net_social", "net_a_payer", "total_patronal", "reduction_generale", "cout_employeur")
+
+
+def charger_population(dossier_employes: Path | str = 'data/employes') -> List[Tuple[str, Dict[str, Any]]]:
+    """Contrats de tous les salariés du dossier, sous la forme [(nom_dossier, contrat)]."""
+    population = []
+    for dossier in sorted(Path(dossier_employes).iterdir()):
+        chemin_contrat = dossier / 'contrat.json'
+        if not chemin_contrat.exists():
+            print(f"AVERTISSEMENT: {dossier.name} ignoré (contrat.json introuvable).", file=sys.stderr)
+            continue
+        population.append((dossier.name, json.loads(chemin_contrat.read_text(encoding='utf-8'))))
+    return population
+
+
+def population_synthetique(profils: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Salariés fictifs à partir de profils simples :
+    {"nom", "salaire", "statut" ('Cadre' / 'Non-Cadre'), "duree_hebdomadaire", "taux_pas", "prevoyance"}.
+    Sans "taux_pas" (en %), le taux neutre du PAS s'applique.
+    """
+    population = []
+    for i, profil in enumerate(profils):
+        contrat = {
+            "contrat": {
+                "statut": profil.get("statut", "Non-Cadre"),
+                "temps_travail": {"duree_hebdomadaire": profil.get("duree_hebdomadaire", 35)},
+            },
+            "remuneration": {"salaire_de_base": {"type": "mensuel", "valeur": profil["salaire"]}},
+            "specificites_paie": {
+                "prelevement_a_la_source": {"taux": profil.get("taux_pas")},
+                "prevoyance": {"adhesion": profil.get("prevoyance", False)},
+            },
+        }
+        population.append((profil.get("nom", f"fictif_{i + 1}"), contrat))
+    return population
+
+
+def _appliquer_scenario(entreprise: Dict[str, Any], baremes: Dict[str, Any], scenario: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Copies de l'entreprise et des barèmes avec les surcharges du scénario (les originaux restent intacts)."""
+    inconnues = set(scenario) - set(SURCHARGES) - {"nom"}
+    if inconnues:
+        raise ValueError(f"Surcharge(s) inconnue(s) : {', '.join(sorted(inconnues))} (attendu : {', '.join(SURCHARGES)}).")
+
+    if "taux_at_mp" in scenario or "effectif" in scenario:
+        entreprise = copy.deepcopy(entreprise)
+        parametres = entreprise.setdefault('parametres_paie', {})
+        if "taux_at_mp" in scenario:
+            # Les cotisations lisent parametres_paie.taux_specifiques.taux_at_mp (en %), le paramètre T
+            # de la réduction générale parametres_paie.taux_at_mp (en taux décimal).
+            parametres.setdefault('taux_specifiques', {})['taux_at_mp'] = scenario["taux_at_mp"]
+            parametres['taux_at_mp'] = scenario["taux_at_mp"] / 100.0
+        if "effectif" in scenario:
+            # Les cotisations lisent parametres_paie.effectif, la réduction générale entreprise.effectif.
+            parametres['effectif'] = scenario["effectif"]
+            entreprise['effectif'] = scenario["effectif"]
+
+    if any(k in scenario for k in ("smic_horaire", "pss_mensuel", "cotisations")):
+        baremes = dict(baremes)
+        if "smic_horaire" in scenario:
+            baremes['smic'] = {**baremes.get('smic', {}), 'cas_general': scenario["smic_horaire"]}
+        if "pss_mensuel" in scenario:
+            baremes['pss'] = {**baremes.get('pss', {}), 'mensuel': scenario["pss_mensuel"]}
+        if scenario.get("cotisations"):
+            doc = copy.deepcopy(baremes['cotisations'])
+            root_key = next((k for k, v in doc.items() if isinstance(v, list)), "cotisations")
+            par_id = {c.get('id'): c for c in doc.get(root_key, [])}
+            for coti_id, champs in scenario["cotisations"].items():
+                if coti_id not in par_id:
+                    raise ValueError(f"Cotisation '{coti_id}' absente du catalogue.")
+                par_id[coti_id].update(champs)
+            baremes['cotisations'] = doc
+
+    return entreprise, baremes
+
+
+def _evaluer_population(
+    population: List[Tuple[str, Dict[str, Any]]], entreprise: Dict[str, Any], baremes: Dict[str, Any], augmentation: float = 0.0
+) -> Dict[str, List[float]]:
+    """Indicateurs de chaque salarié, en colonnes alignées sur la population."""
+    colonnes: Dict[str, List[float]] = {k: [] for k in INDICATEURS}
+    smic_horaire = baremes.get('smic', {}).get('cas_general', 0.0)
+    for _, contrat in population:
+        contexte = ContextePaie.depuis_donnees(contrat, entreprise, baremes)
+        heures_mois = round((contexte.duree_hebdo_contrat * 52) / 12, 2)
+        brut = max(contexte.salaire_base_mensuel * (1 + augmentation), smic_horaire * heures_mois)
+        resultat = evaluer_brut(contexte, round(brut, 2), heures_mois)
+        for k in INDICATEURS:
+            colonnes[k].append(resultat[k])
+    return colonnes
+
+
+def _totaux(colonnes: Dict[str, List[float]]) -> Dict[str, float]:
+    return {k: round(sum(v), 2) for k, v in colonnes.items()}
+
+
+def simuler(
+    population: List[Tuple[str, Dict[str, Any]]],
+    scenarios: List[Dict[str, Any]],
+    entreprise: Dict[str, Any],
+    baremes: Dict[str, Any],
+    detail: bool = False,
+) -> Dict[str, Any]:
+    """
+    Évalue la situation de référence puis chaque scénario sur toute la population.
+    Retourne les totaux de référence et, par scénario, les totaux et leurs écarts ;
+    avec `detail`, les colonnes par salarié (dans l'ordre de `salaries`) sont jointes.
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        reference = _evaluer_population(population, entreprise, baremes)
+        totaux_reference = _totaux(reference)
+
+        resultats = []
+        for i, scenario in enumerate(scenarios):
+            entreprise_s, baremes_s = _appliquer_scenario(entreprise, baremes, scenario)
+            colonnes = _evaluer_population(population, entreprise_s, baremes_s, scenario.get("augmentation", 0.0))
+            totaux = _totaux(colonnes)
+            resultat = {
+                "nom": scenario.get("nom", f"scenario_{i + 1}"),
+                "surcharges": {k: v for k, v in scenario.items() if k != "nom"},
+                "totaux": totaux,
+                "ecarts": {k: round(totaux[k] - totaux_reference[k], 2) for k in INDICATEURS},
+            }
+            if detail:
+                resultat["par_salarie"] = colonnes
+                resultat["ecarts_par_salarie"] = {
+                    k: [round(a - b, 2) for a, b in zip(colonnes[k], reference[k])] for k in INDICATEURS
+                }
+            resultats.append(resultat)
+
+    sortie = {"salaries": [nom for nom, _ in population], "reference": totaux_reference, "scenarios": resultats}
+    if detail:
+        sortie["reference_par_salarie"] = reference
+    return sortie
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simule le coût de la masse salariale sous un ou plusieurs scénarios (aucune écriture).")
+    parser.add_argument("scenarios", type=str, help="Fichier JSON : liste de scénarios (dictionnaires de surcharges).")
+    parser.add_argument("--population", type=str, default=None, help="Fichier JSON de profils fictifs (défaut : tous les salariés de data/employes).")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Date de résolution des barèmes (AAAA-MM-JJ).")
+    parser.add_argument("--detail", action="store_true", help="Inclut les résultats par salarié.")
+    args = parser.parse_args()
+
+    try:
+        scenarios = json.loads(Path(args.scenarios).read_text(encoding='utf-8'))
+        if args.population:
+            population = population_synthetique(json.loads(Path(args.population).read_text(encoding='utf-8')))
+        else:
+            population = charger_population()
+        entreprise = json.loads(Path('data/entreprise.json').read_text(encoding='utf-8')).get('entreprise', {})
+        baremes = charger_baremes('data', args.date)
+        print(json.dumps(simuler(population, scenarios, entreprise, baremes, args.detail), ensure_ascii=False, indent=2))
+    except Exception as e:
+        print(f"\nERREUR : {e}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
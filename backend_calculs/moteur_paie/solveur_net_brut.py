@@ -0,0 +1,207 @@
+# moteur_paie/solveur_net_brut.py
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .contexte import ContextePaie
+from .baremes_timeline import charger_baremes
+from .calendrier import fin_du_mois
+from .calcul_cotisations import calculer_cotisations
+from .calcul_reduction_generale import calculer_reduction_generale
+from .calcul_net import calculer_net_et_impot
+
+# Solveur "net -> brut" : quel brut mensuel donne X € net ?
+#
+# Pour un contexte donné (contrat, entreprise, barèmes), le net est une fonction affine par
+# morceaux du brut : les taux ne changent qu'aux seuils du PSS, de 4 PSS (abattement CSG/CRDS),
+# de 8 PSS et des SMIC de référence (1,6 / 2,5 / 3,5 SMIC). On évalue donc la chaîne réelle
+# (cotisations, réduction générale, net) à ces points de rupture, on repère le segment qui
+# encadre la cible, puis une interpolation linéaire donne le brut exact à l'arrondi près ;
+# quelques pas de fausse position (Illinois) absorbent les arrondis au centime. Les points de
+# rupture sont partagés par toutes les cibles d'un même appel.
+#
+# Le calcul porte sur un mois isolé, sans les cumuls de l'année (comme moteur_paie/simulation.py) :
+# avec les cumuls, la régularisation progressive de la réduction générale ferait dépendre le brut
+# trouvé des mois déjà payés. Le net à payer (après PAS) n'est pas monotone aux changements de
+# tranche de la grille de taux neutre : le segment retenu est le premier qui encadre vraiment la
+# cible.
+
+CIBLES = ("net_social", "net_imposable", "net_a_payer")
+PRECISION = 0.005
+MAX_ITERATIONS = 30
+
+
+def points_de_rupture(contexte: ContextePaie) -> List[float]:
+    """Seuils de brut mensuel où l'un des taux de la chaîne change de valeur."""
+    pss = contexte.baremes.get('pss', {}).get('mensuel', 0.0)
+    temps_travail = contexte.contrat.get('contrat', {}).get('temps_travail', {})
+    if temps_travail.get('proratiser_plafond_ss', False) and contexte.duree_hebdo_contrat < 35.0:
+        pss = pss * contexte.duree_hebdo_contrat / 35.0
+    smic_mensuel = contexte.baremes.get('smic', {}).get('cas_general', 0.0) * 35 * 52 / 12
+    seuils = {round(s, 2) for s in (pss, 4 * pss, 8 * pss, 1.6 * smic_mensuel, 2.5 * smic_mensuel, 3.5 * smic_mensuel) if s > 0}
+    return sorted(seuils)
+
+
+def mois_isole(contexte: ContextePaie) -> ContextePaie:
+    """Copie du contexte sans cumuls (mois isolé), résolue à la même date et sur les mêmes barèmes."""
+    isole = ContextePaie.depuis_donnees(contexte.contrat, contexte.entreprise, contexte.baremes)
+    isole.data_dir = contexte.data_dir
+    isole.date_reference = contexte.date_reference
+    return isole
+
+
+def evaluer_brut(contexte: ContextePaie, salaire_brut: float, heures_mois: Optional[float] = None) -> Dict[str, float]:
+    """
+    Passe un brut mensuel (sans heures supplémentaires ni primes) dans la chaîne de calcul
+    et retourne les nets, les charges patronales et le coût employeur. N'écrit rien.
+    Les cumuls du contexte sont ignorés : le mois est calculé isolément.
+    """
+    if contexte.cumuls.get('cumuls'):
+        contexte = mois_isole(contexte)
+    if heures_mois is None:
+        heures_mois = round((contexte.duree_hebdo_contrat * 52) / 12, 2)
+
+    lignes, total_salarial = calculer_cotisations(contexte, salaire_brut)
+    ligne_reduction = calculer_reduction_generale(contexte, salaire_brut, heures_mois) if salaire_brut > 0 else None
+    if ligne_reduction:
+        lignes.append(ligne_reduction)
+    nets = calculer_net_et_impot(contexte, salaire_brut, lignes, total_salarial, [], 0.0)
+
+    total_patronal = sum(l.montant_patronal or 0.0 for l in lignes)
+    return {
+        "salaire_brut": round(salaire_brut, 2),
+        "net_social": nets['net_social'],
+        "net_imposable": nets['net_imposable'],
+        "net_a_payer": nets['net_a_payer'],
+        "total_salarial": total_salarial,
+        "total_patronal": round(total_patronal, 2),
+        "reduction_generale": ligne_reduction.montant_patronal if ligne_reduction else 0.0,
+        "cout_employeur": round(salaire_brut + total_patronal, 2),
+    }
+
+
+class _Modele:
+    """Évaluations mémorisées de la chaîne pour un contexte (les logs du moteur sont coupés)."""
+
+    def __init__(self, contexte: ContextePaie, cible: str):
+        self.contexte = contexte
+        self.cible = cible
+        self.evaluations: Dict[float, Dict[str, float]] = {}
+
+    def resultat(self, brut: float) -> Dict[str, float]:
+        brut = round(brut, 2)
+        if brut not in self.evaluations:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+                self.evaluations[brut] = evaluer_brut(self.contexte, brut)
+        return self.evaluations[brut]
+
+    def net(self, brut: float) -> float:
+        return self.resultat(brut)[self.cible]
+
+
+def _noeuds(modele: _Modele, net_max: float) -> Tuple[List[float], List[float]]:
+    """Points de rupture évalués, prolongés vers le haut jusqu'à encadrer le plus grand net visé."""
+    bruts = [0.0] + points_de_rupture(modele.contexte)
+    haut = max(bruts[-1] * 2, 1000.0)
+    while modele.net(haut) < net_max:
+        haut *= 2
+        if haut > 1e8:
+            raise ValueError(f"Net cible {net_max:.2f} € hors d'atteinte.")
+    bruts.append(haut)
+    return bruts, [modele.net(b) for b in bruts]
+
+
+def _segment(nets: List[float], net_cible: float) -> int:
+    """Indice i du premier segment [i-1, i] dont les nets encadrent la cible."""
+    for i in range(1, len(nets)):
+        if min(nets[i - 1], nets[i]) <= net_cible <= max(nets[i - 1], nets[i]):
+            return i
+    raise ValueError(f"Net cible {net_cible:.2f} € hors d'atteinte.")
+
+
+def _resoudre_segment(modele: _Modele, cible: float, a: float, b: float) -> float:
+    """Fausse position (variante Illinois) sur [a, b], qui encadre la cible."""
+    fa, fb = modele.net(a) - cible, modele.net(b) - cible
+    x = a
+    for _ in range(MAX_ITERATIONS):
+        if fb == fa:
+            break
+        x = round(b - fb * (b - a) / (fb - fa), 2)
+        fx = modele.net(x) - cible
+        if abs(fx) <= PRECISION or b - a <= 0.01:
+            break
+        if (fx < 0) == (fa < 0):
+            a, fa = x, fx
+            fb /= 2
+        else:
+            b, fb = x, fx
+            fa /= 2
+    # Les arrondis au centime rendent le net localement en escalier : on garde le meilleur voisin.
+    return min((x - 0.01, x, x + 0.01), key=lambda v: (abs(modele.net(v) - cible), v))
+
+
+def brut_pour_net(contexte: ContextePaie, nets_cibles: List[float], cible: str = "net_social") -> List[Dict[str, Any]]:
+    """
+    Pour chaque net mensuel visé, retourne le brut au centime qui le produit, avec le détail
+    de la chaîne (nets, charges, coût employeur) et le nombre d'évaluations consommées.
+    """
+    if cible not in CIBLES:
+        raise ValueError(f"Cible inconnue '{cible}' (attendu : {', '.join(CIBLES)}).")
+    if not nets_cibles:
+        return []
+
+    modele = _Modele(mois_isole(contexte), cible)
+    bruts, nets = _noeuds(modele, max(nets_cibles))
+    evaluations_communes = len(modele.evaluations)
+
+    resultats = []
+    for net_cible in nets_cibles:
+        if net_cible < nets[0]:
+            raise ValueError(f"Net cible {net_cible:.2f} € inférieur au net d'un brut nul ({nets[0]:.2f} €).")
+        avant = len(modele.evaluations)
+        i = _segment(nets, net_cible)
+        brut = _resoudre_segment(modele, net_cible, bruts[i - 1], bruts[i])
+        detail = modele.resultat(brut)
+        resultats.append({
+            "net_cible": net_cible,
+            "cible": cible,
+            "ecart": round(detail[cible] - net_cible, 2),
+            "evaluations": len(modele.evaluations) - avant,
+            **detail,
+        })
+
+    print(f"INFO: {len(nets_cibles)} cible(s) résolue(s) en {len(modele.evaluations)} évaluations "
+          f"dont {evaluations_communes} communes (points de rupture).", file=sys.stderr)
+    return resultats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calcule le salaire brut mensuel correspondant à un ou plusieurs nets visés.")
+    parser.add_argument("nom_employe", type=str, help="Le nom du dossier de l'employé (contrat utilisé).")
+    parser.add_argument("annee", type=int)
+    parser.add_argument("mois", type=int)
+    parser.add_argument("nets", type=float, nargs="+", help="Net(s) mensuel(s) visé(s), en euros.")
+    parser.add_argument("--cible", choices=CIBLES, default="net_social")
+    args = parser.parse_args()
+
+    try:
+        # Mois isolé : les cumuls du salarié ne sont pas lus (le fichier de M-1 peut ne pas exister).
+        with open(Path('data/employes') / args.nom_employe / 'contrat.json', 'r', encoding='utf-8') as f:
+            contrat = json.load(f)
+        with open('data/entreprise.json', 'r', encoding='utf-8') as f:
+            entreprise = json.load(f).get('entreprise', {})
+        date_reference = fin_du_mois(args.annee, args.mois)
+        contexte = ContextePaie.depuis_donnees(contrat, entreprise, charger_baremes('data', date_reference))
+        contexte.data_dir = Path('data')
+        contexte.date_reference = date_reference
+        print(json.dumps(brut_pour_net(contexte, args.nets, args.cible), ensure_ascii=False, indent=2))
+    except Exception as e:
+        print(f"\nERREUR : {e}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        sys.exit(1)
@@ -6,12 +6,15 @@ import sys
 import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
-from openai import OpenAI
 from dotenv import load_dotenv
 from typing import Dict, Optional
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "agirc-arrco calcul des cotisations de retraite complémentaire 2025"
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
 
@@ -62,25 +65,11 @@ def _percent_to_rate(v: Optional[float]) -> Optional[float]:
         return None
 
 def _ask_ai(page_text: str) -> Optional[Dict[str, float]]:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("[IA] OPENAI_API_KEY manquant.", file=sys.stderr)
-        return None
     try:
-        client = OpenAI()
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction. Réponds en JSON strict."},
-                {"role": "user", "content": PROMPT_TEMPLATE + page_text[:12000]}
-            ],
-            temperature=0
-        )
-        raw = resp.choices[0].message.content.strip()
-        data = json.loads(raw)
+        data = extract_json_cached(page_text, PROMPT_TEMPLATE + page_text[:12000],
+                                   system="Assistant d'extraction. Réponds en JSON strict.")
         # Validation des clés
-        if not all(k in data for k in EXPECTED_KEYS):
+        if not data or not all(k in data for k in EXPECTED_KEYS):
             return None
         # Conversion % -> taux réels
         return {k: _percent_to_rate(data[k]) for k in EXPECTED_KEYS}
@@ -7,11 +7,14 @@ import sys
 import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 FICHIER_ENTREPRISE = os.path.join(REPO_ROOT, "config", "parametres_entreprise.json")
 
@@ -43,12 +46,6 @@ def _extract_json_with_gpt(page_text: str) -> dict | None:
     }
     (valeurs en POURCENT, pas en taux)
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-
-    client = OpenAI()
-
     prompt = """
 Tu es un extracteur. Lis le texte suivant (copie brute d'une page web française sur les cotisations).
 Si tu trouves le taux de la "Cotisation AGS" (employeurs), renvoie un JSON STRICT du format :
@@ -67,20 +64,8 @@ Texte :
 ---
 """ + page_text
 
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4.1",
-            response_format={"type": "json_object"},
-            temperature=0,
-            messages=[
-                {"role": "system", "content": "Tu rends uniquement du JSON valide."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        content = resp.choices[0].message.content.strip()
-        return json.loads(content)
-    except Exception:
-        return None
+    # Réponses mises en cache (voir scripts/llm_cache.py)
+    return extract_json_cached(page_text, prompt, system="Tu rends uniquement du JSON valide.", model="gpt-4.1")
 
 
 def _get_page_text(url: str) -> str | None:
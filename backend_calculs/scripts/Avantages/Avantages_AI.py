@@ -6,11 +6,14 @@ import sys
 import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "barème avantages en nature actuel"
 UA = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
 
@@ -30,23 +33,7 @@ def make_payload(repas, titre_restaurant, logement_bareme, source_url=None):
     }
 
 def extract_json_with_gpt(page_text: str, prompt: str):
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-    try:
-        client = OpenAI(api_key=api_key)
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un expert en extraction de données qui répond en JSON strict."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0,
-        )
-        return json.loads(resp.choices[0].message.content.strip())
-    except Exception:
-        return None
+    return extract_json_cached(page_text, prompt, system="Tu es un expert en extraction de données qui répond en JSON strict.")
 
 def normalize_number(v):
     if v is None:
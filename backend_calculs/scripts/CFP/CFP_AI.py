@@ -10,7 +10,6 @@ from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -18,6 +17,10 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "taux contribution formation professionnelle 2025 moins de 11 salariés 11 et plus"
 
 # --- UTILITAIRES ---
@@ -51,12 +54,6 @@ def _fetch_text_with_selenium(url: str) -> str | None:
 
 def _extract_rates_with_gpt(page_text: str) -> dict | None:
     """Demande au modèle d'extraire les deux taux CFP."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("ERREUR: La clé API OpenAI est manquante.", file=sys.stderr)
-        return None
-    
-    client = OpenAI(api_key=api_key)
     current_year = datetime.now().year
 
     prompt = (
@@ -71,24 +68,8 @@ def _extract_rates_with_gpt(page_text: str) -> dict | None:
         + page_text[:15000]
     )
     
-    try:
-        print("   - Appel à l'API GPT-4o-mini...", file=sys.stderr)
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            temperature=0,
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction. Ne renvoie que du JSON valide."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        raw = resp.choices[0].message.content.strip()
-        print(f"   - Réponse brute de l'IA: {raw}", file=sys.stderr)
-        return json.loads(raw)
-
-    except Exception as e:
-        print(f"   - ERREUR d'extraction IA: {e}", file=sys.stderr)
-        return None
+    # Réponses mises en cache (voir scripts/llm_cache.py)
+    return extract_json_cached(page_text, prompt, system="Assistant d'extraction. Ne renvoie que du JSON valide.")
 
 def build_payload(rates: dict, source_url: str | None) -> dict:
     """Construit la charge utile JSON finale pour l'orchestrateur."""
@@ -8,11 +8,14 @@ from datetime import datetime, timezone
 import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "taux Contribution solidarité autonomie CSA employeur actuel"
 RAW_OUT = "staging/cotisations.csa.raw.json"
 
@@ -33,12 +36,7 @@ def fetch_text(url: str) -> str | None:
 
 
 def extract_percent_with_gpt(page_text: str) -> float | None:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("ERR: OPENAI_API_KEY absente.", file=sys.stderr)
-        return None
     try:
-        client = OpenAI(api_key=api_key)
         prompt = (
             "Tu lis un texte en français. Trouve le taux patronal de la "
             '"Contribution Solidarité Autonomie (CSA)" appliqué aux employeurs. '
@@ -48,24 +46,15 @@ def extract_percent_with_gpt(page_text: str) -> float | None:
             "- Si absent, réponds {\"csa_percent\": null}.\n\n"
             "Texte à analyser:\n---\n" + page_text[:15000] + "\n---"
         )
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction de données, sortie JSON stricte."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
-        raw = resp.choices[0].message.content.strip()
-        data = json.loads(raw)
+        # Réponses mises en cache (voir scripts/llm_cache.py)
+        data = extract_json_cached(page_text, prompt, system="Assistant d'extraction de données, sortie JSON stricte.") or {}
         val = data.get("csa_percent", None)
         if val is None:
             return None
         # convert pourcentage -> taux
         return round(float(val) / 100.0, 6)
     except Exception as e:
-        print(f"ERR OpenAI: {e}", file=sys.stderr)
+        print(f"ERR extraction IA: {e}", file=sys.stderr)
         return None
 
 
@@ -2,15 +2,19 @@
 
 import json
 import os
+import sys
 import requests
 from bs4 import BeautifulSoup
-from openai import OpenAI
 from googlesearch import search
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 # --- Config ---
 SEARCH_QUERY = "taux csg crds salarié urssaf 2025"
 
@@ -21,25 +25,10 @@ def iso_now() -> str:
 
 def extract_json_with_gpt(page_text: str, prompt: str) -> dict | None:
     """
-    Interroge GPT-4o-mini et s'attend à recevoir une chaîne JSON valide.
+    Interroge GPT-4o-mini (via le cache LLM) et s'attend à recevoir une chaîne JSON valide.
     Aucune sortie annexe. Retourne un dict ou None.
     """
-    if not os.getenv("OPENAI_API_KEY"):
-        return None
-    try:
-        client = OpenAI()
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un expert en extraction de données qui répond au format JSON."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
-        return json.loads(resp.choices[0].message.content.strip())
-    except Exception:
-        return None
+    return extract_json_cached(page_text, prompt)
 
 
 def get_taux_csg_crds_via_ai() -> tuple[dict | None, str | None]:
@@ -9,7 +9,6 @@ from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -17,6 +16,10 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "taux cotisation FNAL URSSAF 2025 moins de 50 salariés 50 salariés et plus"
 
 def iso_now() -> str:
@@ -49,12 +52,6 @@ def _fetch_text_with_selenium(url: str) -> str | None:
 
 def _extract_rates_with_gpt(page_text: str) -> dict[str, float | None]:
     """Demande au modèle d'extraire les deux taux FNAL."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("ERREUR: La clé API OpenAI est manquante.", file=sys.stderr)
-        return {"patronal_moins_50": None, "patronal_50_et_plus": None}
-    
-    client = OpenAI(api_key=api_key)
     current_year = datetime.now().year
 
     prompt = (
@@ -70,20 +67,9 @@ def _extract_rates_with_gpt(page_text: str) -> dict[str, float | None]:
     )
     
     try:
-        print("   - Appel à l'API GPT-4o-mini...", file=sys.stderr)
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            temperature=0,
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction. Ne renvoie que du JSON valide."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        raw = resp.choices[0].message.content.strip()
-        print(f"   - Réponse brute de l'IA: {raw}", file=sys.stderr)
-        data = json.loads(raw)
-        
+        # Réponses mises en cache (voir scripts/llm_cache.py)
+        data = extract_json_cached(page_text, prompt, system="Assistant d'extraction. Ne renvoie que du JSON valide.") or {}
+
         def _to_rate(key: str) -> float | None:
             val = data.get(key)
             if val is None: return None
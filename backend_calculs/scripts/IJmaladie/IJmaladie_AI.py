@@ -1,26 +1,27 @@
 # scripts/IJmaladie/IJmaladie_AI.py
 import json
 import os
+import sys
 from datetime import datetime, timezone
 
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "montants maximum indemnités journalières ameli 2025"
 
 def iso_now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 def extract_json_with_gpt(page_text: str) -> dict | None:
-    """Interroge GPT-4o-mini et renvoie un objet dict avec les 4 plafonds."""
-    if not os.getenv("OPENAI_API_KEY"):
-        return None
-    client = OpenAI()
+    """Interroge GPT-4o-mini (via le cache LLM) et renvoie un objet dict avec les 4 plafonds."""
     prompt = (
         "Analyse le texte suivant et extrais les 4 montants maximums des indemnités journalières pour 2025.\n"
         'Les clés doivent être "maladie", "maternite_paternite", "at_mp", et "at_mp_majoree".\n'
@@ -29,20 +30,7 @@ def extract_json_with_gpt(page_text: str) -> dict | None:
         'Exemple de format attendu : {"maladie":41.47,"maternite_paternite":101.94,"at_mp":235.69,"at_mp_majoree":314.25}\n\n'
         "Voici le texte :\n---\n" + page_text[:12000]
     )
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un expert en extraction de données qui répond au format JSON."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
-        extracted = resp.choices[0].message.content.strip()
-        return json.loads(extracted)
-    except Exception:
-        return None
+    return extract_json_cached(page_text, prompt)
 
 def get_all_plafonds_ij_via_ai() -> tuple[dict | None, str | None]:
     """Cherche sur Google et renvoie (data_dict, source_url) si JSON complet trouvé."""
@@ -1,16 +1,20 @@
 # scripts/MMIDpatronal/MMIDpatronal_AI.py
 import json
 import os
+import sys
 from datetime import datetime, timezone
 
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "taux cotisation assurance maladie urssaf actuel taux plein taux réduit "
 
 def iso_now() -> str:
@@ -38,11 +42,6 @@ def _extract_two_rates_with_gpt(page_text: str) -> dict[str, float | None]:
     Retourne en taux décimaux:
       {"patronal_plein": <float|None>, "patronal_reduit": <float|None>}
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return {"patronal_plein": None, "patronal_reduit": None}
-
-    client = OpenAI(api_key=api_key)
     prompt = (
         "À partir du texte, extrait UNIQUEMENT les pourcentages de la cotisation patronale « Assurance maladie » (France, 2025):\n"
         "- plein_percent : taux plein (droit commun)\n"
@@ -52,16 +51,8 @@ def _extract_two_rates_with_gpt(page_text: str) -> dict[str, float | None]:
         "Texte:\n---\n" + page_text[:15000] + "\n---"
     )
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            temperature=0,
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction. Ne renvoie que du JSON valide."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        data = json.loads(resp.choices[0].message.content.strip())
+        # Réponses mises en cache (voir scripts/llm_cache.py)
+        data = extract_json_cached(page_text, prompt, system="Assistant d'extraction. Ne renvoie que du JSON valide.") or {}
         return {
             "patronal_plein": _pct_to_rate(data.get("plein_percent")),
             "patronal_reduit": _pct_to_rate(data.get("reduit_percent")),
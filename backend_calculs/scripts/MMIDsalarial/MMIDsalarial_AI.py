@@ -7,11 +7,14 @@ from datetime import datetime, timezone
 
 import requests
 from bs4 import BeautifulSoup
-from openai import OpenAI
 from googlesearch import search
 from dotenv import load_dotenv
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "taux cotisation salariale maladie supplémentaire Alsace-Moselle URSSAF 2025"
 
 # --- FONCTIONS UTILITAIRES ---
@@ -22,29 +25,13 @@ def iso_now() -> str:
 
 def extract_value_with_gpt(page_text: str, prompt: str) -> str | None:
     """
-    Interroge GPT-4o-mini pour extraire une valeur.
+    Interroge GPT-4o-mini pour extraire une valeur (réponse JSON {"taux": ...}).
+    Les réponses sont mises en cache (voir scripts/llm_cache.py).
     """
-    if not os.getenv("OPENAI_API_KEY"):
-        print("ERREUR : La variable d'environnement OPENAI_API_KEY n'est pas définie.", file=sys.stderr)
-        return None
-    try:
-        client = OpenAI()
-        print("   - Envoi de la requête à l'API GPT-4o-mini pour extraction...", file=sys.stderr)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "Tu es un expert en extraction de données."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0,
-            max_tokens=10
-        )
-        extracted_text = response.choices[0].message.content.strip()
-        print(f"   - Réponse brute de l'API : '{extracted_text}'", file=sys.stderr)
-        return extracted_text
-    except Exception as e:
-        print(f"   - ERREUR : L'appel à l'API OpenAI a échoué. Raison : {e}", file=sys.stderr)
+    data = extract_json_cached(page_text, prompt)
+    if not data or data.get("taux") is None:
         return None
+    return str(data["taux"])
 
 # --- FONCTION DE SCRAPING VIA IA ---
 
@@ -55,9 +42,9 @@ def get_taux_alsace_moselle_via_ai() -> float | None:
     prompt_template = """
     Analyse le texte suivant et trouve le taux de la "Cotisation salariale maladie supplémentaire" applicable en Alsace-Moselle.
     Attention, on parle bien du taux salarial, et pas patronal.
-    Réponds UNIQUEMENT avec le taux en pourcentage sous forme de nombre à virgule, en utilisant un point comme séparateur décimal.
-    Exemple de réponse attendue : 1.30
-    Si tu ne trouves pas la valeur, réponds "None".
+    Réponds UNIQUEMENT en JSON avec le taux en pourcentage, en utilisant un point comme séparateur décimal.
+    Exemple de réponse attendue : {"taux": 1.30}
+    Si tu ne trouves pas la valeur, réponds {"taux": null}.
     Voici le texte :
     ---
     """
@@ -11,10 +11,13 @@ import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 # --- Constantes ---
 PREFERRED_URL = "https://bofip.impots.gouv.fr/bofip/11255-PGP.html/identifiant%3DBOI-BAREME-000037-20250410"
 SEARCH_QUERIES = [
@@ -45,27 +48,7 @@ def _download(url: str) -> str:
     return r.text
 
 def extract_json_with_gpt(page_text: str, prompt: str) -> Optional[Dict[str, Any]]:
-    if not os.getenv("OPENAI_API_KEY"):
-        print("ERREUR : OPENAI_API_KEY manquant.", file=sys.stderr)
-        return None
-    try:
-        client = OpenAI()
-        print("   - Appel GPT-4o-mini pour extraction JSON…", file=sys.stderr)
-        resp = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un extracteur de données réglementaires. Réponds en JSON STRICT et valide."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0
-        )
-        raw = resp.choices[0].message.content.strip()
-        print(f"   - Réponse brute : {raw[:220]}{'…' if len(raw)>220 else ''}", file=sys.stderr)
-        return json.loads(raw)
-    except Exception as e:
-        print(f"   - ERREUR OpenAI/JSON : {e}", file=sys.stderr)
-        return None
+    return extract_json_cached(page_text, prompt, system="Tu es un extracteur de données réglementaires. Réponds en JSON STRICT et valide.")
 
 # ---------- Core ----------
 def get_pas_baremes_via_ai() -> Optional[Dict[str, List[Dict[str, any]]]]:
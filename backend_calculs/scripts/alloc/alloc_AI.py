@@ -2,17 +2,21 @@
 
 import json
 import os
+import sys
 import re
 import time
 import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
-from openai import OpenAI
 from dotenv import load_dotenv
 from typing import Optional, Dict, Any, List, Tuple
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERIES = [
     "site:urssaf.fr allocations familiales taux plein taux réduit actuel",
     "site:urssaf.fr Taux de cotisations employeur allocations familiales actuel",
@@ -29,10 +33,7 @@ def ask_ai_for_both(page_text: str) -> Optional[Dict[str, Any]]:
     Demande à l'IA d'extraire les 2 taux (plein et réduit) en POURCENT (ex: 3.45).
     Renvoie {"plein": float|None, "reduit": float|None} ou None en cas d'échec.
     """
-    if not os.getenv("OPENAI_API_KEY"):
-        return None
     try:
-        client = OpenAI()
         prompt = (
             "Tu extrais UNIQUEMENT les DEUX taux patronaux d'allocations familiales (France) depuis ce texte :\n"
             '- "taux plein" (aussi appelé "droit commun")\n'
@@ -47,17 +48,10 @@ def ask_ai_for_both(page_text: str) -> Optional[Dict[str, Any]]:
             "Texte:\n---\n"
             + page_text[:12000]
         )
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction de données, sortie JSON stricte."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
-        raw = resp.choices[0].message.content.strip()
-        data = json.loads(raw)
+        # Réponses mises en cache (voir scripts/llm_cache.py)
+        data = extract_json_cached(page_text, prompt, system="Assistant d'extraction de données, sortie JSON stricte.")
+        if data is None:
+            return None
         return {"plein": data.get("plein"), "reduit": data.get("reduit")}
     except Exception:
         return None
@@ -9,10 +9,13 @@ import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 # Requête de recherche plus directe et précise
 SEARCH_QUERY = "taux cotisation chômage employeur 2025"
 GENERATOR = "scripts/assurancechomage/assurancechomage_AI.py"
@@ -46,13 +49,7 @@ def extract_with_gpt(page_text: str, current_year: str):
     """
     Demande à l'IA d'extraire le taux employeur avec un prompt simple et direct.
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("ERREUR: La clé API OpenAI est manquante.", file=sys.stderr)
-        return None
-
     try:
-        client = OpenAI()
         # --- PROMPT SIMPLE ET ROBUSTE ---
         prompt = f"""
 Tu es un expert de la paie en France. Pour l'année {current_year}, trouve le taux de la "Contribution d'assurance chômage" pour l'employeur.
@@ -69,21 +66,10 @@ TEXTE :
 {page_text[:12000]}
 ---
 """
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Assistant d'extraction de données, sortie JSON stricte."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
-        raw = resp.choices[0].message.content.strip()
-        print(f"   - Réponse brute de l'IA : {raw}", file=sys.stderr)
-        data = json.loads(raw)
-        return data
+        # Réponses mises en cache (voir scripts/llm_cache.py)
+        return extract_json_cached(page_text, prompt, system="Assistant d'extraction de données, sortie JSON stricte.")
     except Exception as e:
-        print(f"   - ERREUR lors de l'appel à l'API OpenAI : {e}", file=sys.stderr)
+        print(f"   - ERREUR lors de l'extraction IA : {e}", file=sys.stderr)
         return None
 
 def get_taux_chomage_via_ai():
@@ -2,13 +2,17 @@
 
 import json
 import os
+import sys
 from datetime import datetime, timezone
 
-from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 
 def iso_now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -116,23 +120,11 @@ def validate_payload(data: dict) -> bool:
 
 def get_baremes_via_ai() -> dict | None:
     """Interroge directement l'API pour obtenir le JSON des barèmes, sans navigation web."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
     try:
-        client = OpenAI(api_key=api_key)
-        prompt = build_prompt()
-        resp = client.chat.completions.create(
-            model="gpt-4.1",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un extracteur de données. Réponds en JSON STRICT valide uniquement."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-        )
-        data = json.loads(resp.choices[0].message.content.strip())
-        if not validate_payload(data):
+        # Sans page analysée, la réponse est mise en cache sur le prompt seul (voir scripts/llm_cache.py).
+        data = extract_json_cached("", build_prompt(),
+                                   system="Tu es un extracteur de données. Réponds en JSON STRICT valide uniquement.", model="gpt-4.1")
+        if not data or not validate_payload(data):
             return None
         # Arrondis légers si nombres présents
         for bloc in ("voitures", "motocyclettes", "cyclomoteurs"):
@@ -0,0 +1,215 @@
+# scripts/baremes_schemas.py
+#
+# Schémas déclaratifs des barèmes réconciliés par scripts/reconciliation.py.
+#
+# Chaque entrée décrit :
+#   - dossier / scripts : les scrapers à lancer (chemins relatifs à scripts/<dossier>/)
+#   - fichier           : le fichier de data/ à mettre à jour
+#   - champs            : {chemin dans le fichier cible: chemin dans le payload du scraper}
+#                         un segment "liste[cle=valeur]" sélectionne un élément de liste par clé
+#   - tolerance         : écart absolu admis entre deux valeurs numériques (1e-6 par défaut)
+#   - quorum            : nombre minimal de sources concordantes par champ (2 par défaut)
+#   - tri               : clés de tri des listes d'objets, pour comparer indépendamment de l'ordre
+#   - gabarits          : contenu d'un élément de liste à créer s'il n'existe pas encore
+#   - cadence_heures    : fréquence de rafraîchissement par scripts/scheduler.py (24 h par défaut),
+#                         qui sert aussi de SLO de fraîcheur sur le dashboard
+#   - date_effet        : échéance légale annuelle "MM-JJ" des nouvelles valeurs (meta.date_effet du
+#                         fichier cible), si les scrapers ne la donnent pas ; à défaut, date du scraping
+#
+# Ajouter un barème revient à ajouter une entrée ici.
+
+from typing import Any, Dict
+
+BAREMES: Dict[str, Dict[str, Any]] = {
+    # --- Fichiers dédiés ---
+    "smic": {
+        "dossier": "SMIC",
+        # La source LegiSocial est incomplète, désactivée par défaut.
+        "scripts": ["SMIC.py", "SMIC_AI.py"],
+        "fichier": "smic.json",
+        "champs": {"smic_horaire": "sections"},
+    },
+    "pss": {
+        "dossier": "PSS",
+        "scripts": ["PSS.py", "PSS_LegiSocial.py", "PSS_AI.py"],
+        "fichier": "secu.json",
+        # Fixé par arrêté pour l'année civile
+        "date_effet": "01-01",
+        "champs": {"pss": "sections"},
+    },
+    "ij_maladie": {
+        "dossier": "IJmaladie",
+        "scripts": ["IJmaladie.py", "IJmaladie_LegiSocial.py", "IJmaladie_AI.py"],
+        "fichier": "secu.json",
+        "tolerance": 0.01,
+        "champs": {
+            f"plafonds_indemnites_journalieres.{k}": f"valeurs.{k}"
+            for k in ("maladie", "maternite_paternite", "at_mp", "at_mp_majoree")
+        },
+    },
+    "pas": {
+        "dossier": "PAS",
+        "scripts": ["PAS.py", "PAS_AI.py"],
+        "fichier": "pas.json",
+        # Grille revalorisée par la loi de finances, applicable au 1er janvier
+        "date_effet": "01-01",
+        "cadence_heures": 168,
+        "tri": ["plafond"],
+        "champs": {
+            f"baremes[zone={zone}].tranches": f"sections.{zone}"
+            for zone in ("metropole", "guadeloupe_reunion_martinique", "guyane_mayotte")
+        },
+        "gabarits": {
+            f"baremes[zone={zone}]": {"periode": "mensuel_2025"}
+            for zone in ("metropole", "guadeloupe_reunion_martinique", "guyane_mayotte")
+        },
+    },
+    "frais_pro": {
+        "dossier": "fraispro",
+        # Seule la source URSSAF est active pour l'instant : le quorum est donc ramené à 1.
+        "scripts": ["fraispro.py"],
+        "quorum": 1,
+        "fichier": "frais_pro.json",
+        "cadence_heures": 168,
+        "tri": ["km_min", "periode_sejour", "jours_utilises"],
+        "champs": {"FRAIS_PRO[id=frais_pro].sections": "sections"},
+        "gabarits": {"FRAIS_PRO[id=frais_pro]": {"libelle": "Frais professionnels"}},
+    },
+    "bareme_km": {
+        "dossier": "bareme-indemnite-kilometrique",
+        "scripts": ["bareme-indemnite-kilometrique.py", "bareme-indemnite-kilometrique_LegiSocial.py"],
+        "fichier": "bareme_km.json",
+        # Publié en cours d'année, applicable aux frais de toute l'année
+        "date_effet": "01-01",
+        "cadence_heures": 168,
+        "tolerance": 5e-4,
+        "tri": ["cv_min", "segment"],
+        "champs": {
+            "BAREME_KM[id=baremes_km].annee": "annee",
+            "BAREME_KM[id=baremes_km].vehicules": "vehicules",
+        },
+        "gabarits": {"BAREME_KM[id=baremes_km]": {"libelle": "Barème kilométrique"}},
+    },
+
+    # --- cotisations.json ---
+    "securite_sociale_maladie_patronal": {
+        "dossier": "MMIDpatronal",
+        "scripts": ["MMIDpatronal.py", "MMIDpatronal_AI.py", "MMIDpatronal_LegiSocial.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=securite_sociale_maladie].patronal_plein": "valeurs.patronal_plein",
+            "cotisations[id=securite_sociale_maladie].patronal_reduit": "valeurs.patronal_reduit",
+        },
+    },
+    "securite_sociale_maladie_salarial": {
+        "dossier": "MMIDsalarial",
+        "scripts": ["MMIDsalarial.py", "MMIDsalarial_LegiSocial.py", "MMIDsalarial_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=securite_sociale_maladie].salarial_Alsace_Moselle": "sections.alsace_moselle.taux_salarial",
+        },
+    },
+    "vieillesse_patronal": {
+        "dossier": "vieillessepatronal",
+        "scripts": ["vieillessepatronal.py", "vieillessepatronal_LegiSocial.py", "vieillessepatronal_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=retraite_secu_plafond].patronal": "sections.plafonne",
+            "cotisations[id=retraite_secu_deplafond].patronal": "sections.deplafonne",
+        },
+    },
+    "vieillesse_salarial": {
+        "dossier": "vieillessesalarial",
+        "scripts": ["vieillessesalarial.py", "vieillessesalarial_LegiSocial.py", "vieillessesalarial_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=retraite_secu_plafond].salarial": "sections.plafonne",
+            "cotisations[id=retraite_secu_deplafond].salarial": "sections.deplafonne",
+        },
+    },
+    "agirc_arrco": {
+        "dossier": "AGIRC-ARRCO",
+        "scripts": ["AGIRC-ARRCO.py", "AGIRC-ARRCO_LegiSocial.py", "AGIRC-ARRCO_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            f"cotisations[id={cid}].{part}": f"items[id={cid}].valeurs.{part}"
+            for cid in ("retraite_comp_t1", "retraite_comp_t2", "ceg_t1", "ceg_t2", "cet", "apec")
+            for part in ("salarial", "patronal")
+        },
+    },
+    "allocations_familiales": {
+        "dossier": "alloc",
+        "scripts": ["alloc.py", "alloc_AI.py", "alloc_LegiSocial.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=allocations_familiales].patronal_plein": "valeurs.patronal_plein",
+            "cotisations[id=allocations_familiales].patronal_reduit": "valeurs.patronal_reduit",
+        },
+    },
+    "assurance_chomage": {
+        "dossier": "assurancechomage",
+        "scripts": ["assurancechomage.py", "assurancechomage_AI.py", "assurancechomage_LegiSocial.py"],
+        "fichier": "cotisations.json",
+        "champs": {"cotisations[id=assurance_chomage].patronal": "valeurs.patronal"},
+    },
+    "ags": {
+        "dossier": "AGS",
+        "scripts": ["AGS.py", "AGS_AI.py", "AGS_LegiSocial.py"],
+        "fichier": "cotisations.json",
+        "champs": {"cotisations[id=ags].patronal": "valeurs.patronal"},
+    },
+    "csa": {
+        "dossier": "CSA",
+        "scripts": ["CSA.py", "CSA_AI.py", "CSA_LegiSocial.py"],
+        "fichier": "cotisations.json",
+        "champs": {"cotisations[id=csa].patronal": "valeurs.patronal"},
+    },
+    "fnal": {
+        "dossier": "FNAL",
+        "scripts": ["FNAL.py", "FNAL_AI.py", "FNAL_LegiSocial.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=fnal].patronal.taux_moins_50": "sections.patronal_moins_50",
+            "cotisations[id=fnal].patronal.taux_50_et_plus": "sections.patronal_50_et_plus",
+        },
+    },
+    "cfp": {
+        "dossier": "CFP",
+        "scripts": ["CFP.py", "CFP_LegiSocial.py", "CFP_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=CFP].patronal.taux_moins_11": "sections.patronal_moins_11",
+            "cotisations[id=CFP].patronal.taux_11_et_plus": "sections.patronal_11_et_plus",
+        },
+    },
+    "taxe_apprentissage": {
+        "dossier": "taxeapprentissage",
+        "scripts": ["taxeapprentissage.py", "taxeapprentissage_LegiSocial.py", "taxeapprentissage_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=taxe_apprentissage].patronal": "sections.part_principale",
+            "cotisations[id=taxe_apprentissage_solde].patronal": "sections.solde",
+        },
+        "gabarits": {
+            "cotisations[id=taxe_apprentissage_solde]": {
+                "libelle": "Taxe d'Apprentissage (solde)", "base": "brut", "salarial": None, "patronal": None,
+            },
+        },
+    },
+    "dialogue_social": {
+        "dossier": "dialoguesocial",
+        # Le scraper LegiSocial n'existe pas pour cette contribution.
+        "scripts": ["dialoguesocial.py", "dialoguesocial_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {"cotisations[id=dialogue_social].patronal": "sections.patronal"},
+    },
+    "csg": {
+        "dossier": "CSG",
+        "scripts": ["CSG.py", "CSG_LegiSocial.py", "CSG_AI.py"],
+        "fichier": "cotisations.json",
+        "champs": {
+            "cotisations[id=csg].salarial.deductible": "valeurs.salarial.deductible",
+            "cotisations[id=csg].salarial.non_deductible": "valeurs.salarial.non_deductible",
+        },
+    },
+}
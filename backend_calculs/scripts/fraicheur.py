@@ -0,0 +1,172 @@
+# scripts/fraicheur.py
+#
+# Petite base de séries temporelles (SQLite) sur la fraîcheur des barèmes :
+#   - passes   : une ligne par barème et par passe de réconciliation (succès, durée, nb de votants)
+#   - sources  : une ligne par scraper et par passe (payload obtenu, latence, concordance)
+#   - ecarts   : les champs sans quorum, avec les votes de chaque source
+#   - etat     : l'état courant de chaque barème (dernière réussite, SLO, planification)
+#
+# Alimentée par scripts/reconciliation.py et scripts/scheduler.py, lue par le dashboard de l'API.
+
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DB_FILE = os.getenv("FRAICHEUR_DB", os.path.join(REPO_ROOT, "data", "fraicheur.sqlite"))
+RETENTION_JOURS = int(os.getenv("FRAICHEUR_RETENTION_JOURS", "90"))
+DEFAULT_CADENCE_HEURES = 24.0
+
+_ID_COTISATION_RE = re.compile(r"^cotisations\[id=([^\]]+)\]")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS passes (
+    ts TEXT NOT NULL, bareme TEXT NOT NULL, ok INTEGER NOT NULL, duree_s REAL, votants INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_passes_bareme_ts ON passes (bareme, ts);
+CREATE TABLE IF NOT EXISTS sources (
+    ts TEXT NOT NULL, bareme TEXT NOT NULL, script TEXT NOT NULL,
+    ok INTEGER NOT NULL, latence_s REAL, concordant INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sources_bareme_ts ON sources (bareme, ts);
+CREATE TABLE IF NOT EXISTS ecarts (
+    ts TEXT NOT NULL, bareme TEXT NOT NULL, champ TEXT NOT NULL, votes TEXT
+);
+CREATE TABLE IF NOT EXISTS etat (
+    bareme TEXT PRIMARY KEY,
+    fichier TEXT,
+    ids_cotisations TEXT,
+    slo_heures REAL,
+    derniere_tentative TEXT,
+    derniere_reussite TEXT,
+    echecs_consecutifs INTEGER NOT NULL DEFAULT 0,
+    prochaine_execution TEXT
+);
+"""
+
+
+def iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_iso(s: Optional[str]) -> Optional[datetime]:
+    if not s:
+        return None
+    return datetime.fromisoformat(s.replace("Z", "+00:00"))
+
+
+def connect(db_file: Optional[str] = None) -> sqlite3.Connection:
+    path = db_file or DB_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA_SQL)
+    return conn
+
+
+@contextmanager
+def session(db_file: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """Connexion transactionnelle : commit en sortie de bloc, puis fermeture."""
+    conn = connect(db_file)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def cadence_heures(schema: Dict[str, Any]) -> float:
+    return float(schema.get("cadence_heures", DEFAULT_CADENCE_HEURES))
+
+
+def ids_cotisations(schema: Dict[str, Any]) -> List[str]:
+    """Ids de cotisations.json couverts par un barème, déduits des chemins cibles du schéma."""
+    ids = []
+    for cible in schema.get("champs", {}):
+        m = _ID_COTISATION_RE.match(cible)
+        if m and m.group(1) not in ids:
+            ids.append(m.group(1))
+    return ids
+
+
+def enregistrer_passe(
+    resultats: List[Dict[str, Any]],
+    schemas: Dict[str, Dict[str, Any]],
+    latences: Dict[str, Optional[float]],
+    chemins_par_bareme: Dict[str, List[str]],
+    maintenant: Optional[datetime] = None,
+) -> None:
+    """
+    Historise une passe de réconciliation. `latences` associe chaque chemin de scraper
+    à sa durée en secondes (None si le scraper a échoué).
+    """
+    now = maintenant or datetime.now(timezone.utc)
+    ts = iso(now)
+    with session() as conn:
+        for res in resultats:
+            nom = res["nom"]
+            schema = schemas[nom]
+            chemins = chemins_par_bareme[nom]
+            durees = [latences[p] for p in chemins if latences.get(p) is not None]
+            conn.execute(
+                "INSERT INTO passes (ts, bareme, ok, duree_s, votants) VALUES (?, ?, ?, ?, ?)",
+                (ts, nom, int(res["ok"]), max(durees) if durees else None, len(res["votants"])),
+            )
+            for p in chemins:
+                script = os.path.basename(p)
+                conn.execute(
+                    "INSERT INTO sources (ts, bareme, script, ok, latence_s, concordant) VALUES (?, ?, ?, ?, ?, ?)",
+                    (ts, nom, script, int(latences.get(p) is not None), latences.get(p), int(script in res["votants"])),
+                )
+            for ecart in res["ecarts"]:
+                conn.execute(
+                    "INSERT INTO ecarts (ts, bareme, champ, votes) VALUES (?, ?, ?, ?)",
+                    (ts, nom, ecart["champ"], json.dumps(ecart["votes"], ensure_ascii=False)),
+                )
+
+            conn.execute(
+                """
+                INSERT INTO etat (bareme, fichier, ids_cotisations, slo_heures, derniere_tentative,
+                                  derniere_reussite, echecs_consecutifs)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(bareme) DO UPDATE SET
+                    fichier = excluded.fichier,
+                    ids_cotisations = excluded.ids_cotisations,
+                    slo_heures = excluded.slo_heures,
+                    derniere_tentative = excluded.derniere_tentative,
+                    derniere_reussite = COALESCE(excluded.derniere_reussite, etat.derniere_reussite),
+                    echecs_consecutifs = CASE WHEN excluded.derniere_reussite IS NULL
+                                              THEN etat.echecs_consecutifs + 1 ELSE 0 END
+                """,
+                (
+                    nom, schema["fichier"], json.dumps(ids_cotisations(schema)), cadence_heures(schema),
+                    ts, ts if res["ok"] else None, 0 if res["ok"] else 1,
+                ),
+            )
+        purger(conn, now)
+
+
+def planifier(bareme: str, prochaine: datetime) -> None:
+    with session() as conn:
+        conn.execute(
+            "INSERT INTO etat (bareme, prochaine_execution) VALUES (?, ?) "
+            "ON CONFLICT(bareme) DO UPDATE SET prochaine_execution = excluded.prochaine_execution",
+            (bareme, iso(prochaine)),
+        )
+
+
+def etat_baremes() -> Dict[str, Dict[str, Any]]:
+    with session() as conn:
+        return {row["bareme"]: dict(row) for row in conn.execute("SELECT * FROM etat")}
+
+
+def purger(conn: sqlite3.Connection, maintenant: datetime) -> None:
+    """Borne la taille de la base : l'historique au-delà de RETENTION_JOURS est supprimé."""
+    limite = iso(maintenant - timedelta(days=RETENTION_JOURS))
+    for table in ("passes", "sources", "ecarts"):
+        conn.execute(f"DELETE FROM {table} WHERE ts < ?", (limite,))
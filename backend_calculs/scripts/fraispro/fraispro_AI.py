@@ -7,12 +7,15 @@ from datetime import datetime, timezone
 
 import requests
 from bs4 import BeautifulSoup
-from openai import OpenAI
 from googlesearch import search
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 SEARCH_QUERY = "barèmes frais professionnels URSSAF 2025"
 
 
@@ -22,23 +25,7 @@ def iso_now() -> str:
 
 
 def extract_json_with_gpt(page_text: str, prompt: str) -> dict | None:
-    if not os.getenv("OPENAI_API_KEY"):
-        return None
-    try:
-        client = OpenAI()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un extracteur de données qui répond uniquement en JSON valide."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0
-        )
-        extracted_text = response.choices[0].message.content.strip()
-        return json.loads(extracted_text)
-    except Exception as e:
-        return None
+    return extract_json_cached(page_text, prompt, system="Tu es un extracteur de données qui répond uniquement en JSON valide.")
 
 
 # ---------- Normalisation ----------
@@ -0,0 +1,176 @@
+# scripts/llm_cache.py
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# --- CONFIGURATION ---
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", REPO_ROOT / "data" / ".cache_llm"))
+CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 jours
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+DEFAULT_SYSTEM = "Tu es un expert en extraction de données qui répond au format JSON."
+
+# Un backend reçoit (model, system, prompt) et retourne le texte brut de la réponse.
+Backend = Callable[[str, str, str], Optional[str]]
+
+_client = None
+_backend_override: Optional[Backend] = None
+
+
+# --- BACKENDS ---
+def _openai_backend(model: str, system: str, prompt: str) -> Optional[str]:
+    """Appelle l'API OpenAI en réutilisant un client unique pour tout le processus."""
+    global _client
+    if not os.getenv("OPENAI_API_KEY"):
+        print("ERREUR : La variable d'environnement OPENAI_API_KEY n'est pas définie.", file=sys.stderr)
+        return None
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI()
+    response = _client.chat.completions.create(
+        model=model,
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _stub_response(key: str) -> Optional[str]:
+    """
+    Backend local sans réseau (LLM_BACKEND=stub) : lit les réponses dans le fichier
+    LLM_STUB_FILE, un objet JSON {clé_de_cache: réponse}. Sans réponse enregistrée, retourne None.
+    """
+    stub_file = os.getenv("LLM_STUB_FILE")
+    if not stub_file or not Path(stub_file).exists():
+        return None
+    reponse = json.loads(Path(stub_file).read_text(encoding="utf-8")).get(key)
+    if reponse is None:
+        return None
+    return reponse if isinstance(reponse, str) else json.dumps(reponse, ensure_ascii=False)
+
+
+def set_backend(backend: Optional[Backend]) -> None:
+    """Remplace le backend (ex: une fonction locale dans les tests). None rétablit le choix par LLM_BACKEND."""
+    global _backend_override
+    _backend_override = backend
+
+
+def _call_backend(key: str, model: str, system: str, prompt: str) -> Optional[str]:
+    if _backend_override is not None:
+        return _backend_override(model, system, prompt)
+    if os.getenv("LLM_BACKEND", "openai").lower() == "stub":
+        return _stub_response(key)
+    return _openai_backend(model, system, prompt)
+
+
+# --- CLÉ DE CACHE ---
+def normaliser_texte(page_text: str) -> str:
+    """Normalise le texte d'une page (espaces insécables, blancs multiples) pour stabiliser la clé."""
+    texte = page_text.replace("\xa0", " ").replace("\u202f", " ")
+    return re.sub(r"\s+", " ", texte).strip()
+
+
+def cache_key(prompt_template: str, model: str, page_text: str, system: str = DEFAULT_SYSTEM) -> str:
+    """Clé adressée par contenu : hash(template du prompt, modèle, message système, texte normalisé)."""
+    material = json.dumps(
+        [prompt_template.strip(), model, system, normaliser_texte(page_text)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _split_prompt(prompt: str, page_text: Optional[str]) -> Tuple[str, str]:
+    """
+    Les scripts *_AI.py construisent leur prompt en concaténant un template et un extrait
+    de la page. On retrouve cet extrait en fin de prompt pour séparer les deux parties.
+    """
+    if page_text:
+        debut = page_text[:64]
+        idx = prompt.rfind(debut) if debut else -1
+        if idx >= 0:
+            return prompt[:idx], prompt[idx:]
+    return prompt, ""
+
+
+# --- STOCKAGE ---
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.json"
+
+
+def _read_entry(key: str) -> Optional[Dict[str, Any]]:
+    path = _entry_path(key)
+    if not path.exists():
+        return None
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if time.time() - entry.get("created_at", 0) > CACHE_TTL_SECONDS:
+        path.unlink(missing_ok=True)
+        return None
+    # On "touche" le fichier pour que l'éviction se fasse dans l'ordre LRU.
+    os.utime(path, None)
+    return entry
+
+
+def _write_entry(key: str, model: str, data: Dict[str, Any]) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    entry = {"created_at": time.time(), "model": model, "response": data}
+    tmp_path = _entry_path(key).with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, _entry_path(key))
+    _evict()
+
+
+def _evict() -> None:
+    """Supprime les entrées les moins récemment utilisées au-delà de CACHE_MAX_ENTRIES."""
+    entries = sorted(CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for path in entries[:max(0, len(entries) - CACHE_MAX_ENTRIES)]:
+        path.unlink(missing_ok=True)
+
+
+# --- POINT D'ENTRÉE ---
+def extract_json_cached(
+    page_text: str,
+    prompt: str,
+    system: str = DEFAULT_SYSTEM,
+    model: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Extrait un objet JSON d'une page via le LLM, en passant par le cache persistant.
+    Une page identique (au formatage près) ne déclenche donc qu'un seul appel.
+    """
+    model = model or DEFAULT_MODEL
+    template, texte = _split_prompt(prompt, page_text)
+    key = cache_key(template, model, texte, system)
+
+    entry = _read_entry(key)
+    if entry is not None:
+        print(f"   - Réponse LLM lue depuis le cache ({key[:12]}).", file=sys.stderr)
+        return entry["response"]
+
+    try:
+        print(f"   - Envoi de la requête au modèle {model} pour extraction JSON...", file=sys.stderr)
+        raw = _call_backend(key, model, system, prompt)
+        if raw is None:
+            return None
+        print(f"   - Réponse brute : {raw[:220]}{'…' if len(raw) > 220 else ''}", file=sys.stderr)
+        data = json.loads(raw)
+    except Exception as e:
+        print(f"   - ERREUR : L'appel au LLM ou le parsing JSON a échoué. Raison : {e}", file=sys.stderr)
+        return None
+
+    if isinstance(data, dict):
+        _write_entry(key, model, data)
+    return data
@@ -0,0 +1,418 @@
+# scripts/reconciliation.py
+#
+# Moteur de réconciliation des barèmes, piloté par les schémas de scripts/baremes_schemas.py.
+#
+#   python scripts/reconciliation.py                # tous les barèmes, en une seule passe
+#   python scripts/reconciliation.py fnal csg       # un sous-ensemble
+#   python scripts/reconciliation.py --dry-run      # vote sans écriture
+
+import json
+import os
+import re
+import sys
+import hashlib
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from baremes_schemas import BAREMES
+import fraicheur
+
+# --- CONFIGURATION ---
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+# Versions remplacées, lues par moteur_paie/baremes_timeline.py : historique/<fichier>/<date d'effet>.json
+HISTORIQUE_DIR = "historique"
+GENERATOR = "scripts/reconciliation.py"
+
+DEFAULT_TOLERANCE = 1e-6
+DEFAULT_QUORUM = 2
+MAX_WORKERS = int(os.getenv("RECONCILIATION_WORKERS", "8"))
+
+_SEGMENT_RE = re.compile(r"^([^\[\]]*)(?:\[([^=\]]+)=([^\]]+)\])?$")
+
+
+# --- UTILITAIRES ---
+def iso_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def compute_hash(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def merge_sources(payloads: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    seen, out = set(), []
+    for p in payloads:
+        for s in p.get("meta", {}).get("source", []):
+            key = (s.get("url", ""), s.get("label", ""))
+            if key not in seen:
+                seen.add(key)
+                out.append({"url": s.get("url", ""), "label": s.get("label", ""), "date_doc": s.get("date_doc", "")})
+    return out
+
+
+def run_script(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Exécute un scraper et retourne son payload JSON. Un échec ne bloque plus tout le barème :
+    la source est simplement absente du vote (retour None).
+    """
+    label = os.path.relpath(path, SCRIPTS_DIR)
+    proc = subprocess.run(
+        [sys.executable, path],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env=os.environ.copy(),
+    )
+    if proc.returncode != 0:
+        print(f"[ERREUR] {label} a échoué (code {proc.returncode})", file=sys.stderr)
+        if proc.stderr.strip():
+            print(f"--- stderr de {label} ---\n{proc.stderr.strip()}", file=sys.stderr)
+        return None
+    try:
+        payload = json.loads(proc.stdout.strip())
+    except Exception as e:
+        print(f"[ERREUR] Sortie non-JSON depuis {label}: {e}", file=sys.stderr)
+        return None
+    payload["__script"] = os.path.basename(path)
+    return payload
+
+
+def run_script_mesure(path: str) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+    """run_script + latence en secondes (None si la source n'a rien produit)."""
+    debut = time.monotonic()
+    payload = run_script(path)
+    return payload, (time.monotonic() - debut) if payload is not None else None
+
+
+# --- CHEMINS ---
+def _segments(chemin: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """'cotisations[id=fnal].patronal' -> [('cotisations', 'id', 'fnal'), ('patronal', None, None)]"""
+    out = []
+    for brut in chemin.split(".") if chemin else []:
+        m = _SEGMENT_RE.match(brut)
+        if not m:
+            raise ValueError(f"Chemin invalide : '{chemin}'")
+        out.append((m.group(1), m.group(2), m.group(3)))
+    return out
+
+
+def _select(liste: Any, cle: str, valeur: str) -> Optional[Dict[str, Any]]:
+    if not isinstance(liste, list):
+        return None
+    return next((it for it in liste if isinstance(it, dict) and str(it.get(cle)) == valeur), None)
+
+
+def lire_chemin(obj: Any, chemin: str) -> Any:
+    """Lit une valeur par chemin pointé ; retourne None si un maillon manque."""
+    for nom, cle, valeur in _segments(chemin):
+        if nom:
+            obj = obj.get(nom) if isinstance(obj, dict) else None
+        if cle is not None:
+            obj = _select(obj, cle, valeur)
+        if obj is None:
+            return None
+    return obj
+
+
+def ecrire_chemin(doc: Dict[str, Any], chemin: str, valeur: Any, gabarits: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Écrit une valeur par chemin pointé. Les dictionnaires intermédiaires sont créés au besoin ;
+    un élément de liste absent ([id=x]) n'est créé que si le schéma fournit son gabarit.
+    Un dict écrit sur un dict existant est fusionné (les clés non scrapées sont conservées).
+    """
+    segs = _segments(chemin)
+    obj = doc
+    parcouru = []
+    for i, (nom, cle, val) in enumerate(segs):
+        dernier = i == len(segs) - 1
+        parcouru.append(nom + (f"[{cle}={val}]" if cle is not None else ""))
+        if cle is None:
+            if dernier:
+                if isinstance(obj.get(nom), dict) and isinstance(valeur, dict):
+                    obj[nom].update(valeur)
+                else:
+                    obj[nom] = valeur
+                return
+            if not isinstance(obj.get(nom), dict):
+                obj[nom] = {}
+            obj = obj[nom]
+            continue
+
+        liste = obj.setdefault(nom, [])
+        item = _select(liste, cle, val)
+        if item is None:
+            gabarit = gabarits.get(".".join(parcouru))
+            if gabarit is None:
+                raise KeyError(f"L'entrée '{'.'.join(parcouru)}' est introuvable et le schéma ne fournit pas de gabarit.")
+            item = {cle: val, **json.loads(json.dumps(gabarit))}
+            liste.append(item)
+        if dernier:
+            item.update(valeur if isinstance(valeur, dict) else {})
+            return
+        obj = item
+
+
+# --- NORMALISATION ET COMPARAISON ---
+def _cle_tri(valeur: Any) -> Tuple[int, Any]:
+    if valeur is None:
+        return (2, 0)
+    if isinstance(valeur, (int, float)):
+        return (0, float(valeur))
+    return (1, str(valeur).strip().lower())
+
+
+def normaliser(valeur: Any, tri: List[str]) -> Any:
+    """Trie récursivement les listes d'objets selon la première clé de `tri` présente dans tous les éléments."""
+    if isinstance(valeur, dict):
+        return {k: normaliser(v, tri) for k, v in valeur.items()}
+    if isinstance(valeur, list):
+        items = [normaliser(v, tri) for v in valeur]
+        if items and all(isinstance(it, dict) for it in items):
+            cle = next((c for c in tri if all(c in it for it in items)), None)
+            if cle is not None:
+                items.sort(key=lambda it: _cle_tri(it.get(cle)))
+        return items
+    return valeur
+
+
+def valeurs_egales(a: Any, b: Any, tol: float) -> bool:
+    """Égalité profonde : flottants à `tol` près, chaînes sans casse ni blancs de bord."""
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(float(a) - float(b)) <= tol
+    if isinstance(a, str) and isinstance(b, str):
+        return a.strip().casefold() == b.strip().casefold()
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(valeurs_egales(a[k], b[k], tol) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(valeurs_egales(x, y, tol) for x, y in zip(a, b))
+    return a == b
+
+
+def voter(votes: List[Tuple[str, Any]], tol: float, quorum: int) -> Tuple[Optional[Any], List[str]]:
+    """
+    Regroupe les valeurs concordantes et retient le groupe majoritaire s'il atteint le quorum.
+    Une source qui n'a rien trouvé (None) s'abstient. Retourne (valeur, scripts votants) ou (None, []).
+    """
+    groupes: List[Tuple[Any, List[str]]] = []
+    for script, valeur in votes:
+        if valeur is None:
+            continue
+        for representant, membres in groupes:
+            if valeurs_egales(representant, valeur, tol):
+                membres.append(script)
+                break
+        else:
+            groupes.append((valeur, [script]))
+
+    groupes.sort(key=lambda g: len(g[1]), reverse=True)
+    if not groupes or len(groupes[0][1]) < quorum:
+        return None, []
+    if len(groupes) > 1 and len(groupes[1][1]) == len(groupes[0][1]):
+        return None, []  # égalité entre deux valeurs différentes : pas de majorité
+    return groupes[0]
+
+
+# --- RÉCONCILIATION ---
+def chemins_scripts(schema: Dict[str, Any]) -> List[str]:
+    return [os.path.join(SCRIPTS_DIR, schema["dossier"], s) for s in schema["scripts"]]
+
+
+def reconcilier(nom: str, schema: Dict[str, Any], payloads: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Applique le vote champ par champ ; le barème n'est retenu que si tous ses champs ont le quorum."""
+    tol = schema.get("tolerance", DEFAULT_TOLERANCE)
+    tri = schema.get("tri", [])
+    quorum = schema.get("quorum", DEFAULT_QUORUM)
+    presents = [(os.path.basename(p), payloads[p]) for p in chemins_scripts(schema) if payloads.get(p) is not None]
+
+    valeurs: Dict[str, Any] = {}
+    votants: set = set()
+    ecarts: List[Dict[str, Any]] = []
+    for cible, source in schema["champs"].items():
+        votes = [(script, normaliser(lire_chemin(p, source), tri)) for script, p in presents]
+        valeur, membres = voter(votes, tol, quorum)
+        if not membres:
+            ecarts.append({"champ": cible, "votes": dict(votes)})
+            continue
+        valeurs[cible] = valeur
+        votants.update(membres)
+
+    return {
+        "nom": nom,
+        "ok": not ecarts,
+        "valeurs": valeurs,
+        "ecarts": ecarts,
+        "votants": sorted(votants),
+        "sources": merge_sources([p for script, p in presents if script in votants]),
+        "date_effet": date_effet_legale(schema, [p for script, p in presents if script in votants], iso_now()[:10]),
+    }
+
+
+def date_effet_legale(schema: Dict[str, Any], payloads: List[Dict[str, Any]], aujourdhui: str) -> Optional[str]:
+    """
+    Date d'entrée en vigueur des valeurs votées : celle annoncée par les sources votantes
+    (meta.date_effet, la plus récente en cas de désaccord), sinon la règle du schéma ("MM-JJ" :
+    dernière échéance annuelle à la date du jour). None si ni les sources ni le schéma n'en donnent.
+    """
+    dates = [d for d in (p.get("meta", {}).get("date_effet") for p in payloads) if d]
+    if dates:
+        return max(dates)
+    regle = schema.get("date_effet")
+    if not regle:
+        return None
+    annee = int(aujourdhui[:4])
+    return f"{annee}-{regle}" if f"{annee}-{regle}" <= aujourdhui else f"{annee - 1}-{regle}"
+
+
+def debug_ecarts(resultat: Dict[str, Any]) -> None:
+    print(f"❌ {resultat['nom']} : quorum non atteint, barème non mis à jour.", file=sys.stderr)
+    for ecart in resultat["ecarts"]:
+        print(f"   - {ecart['champ']}", file=sys.stderr)
+        for script, valeur in ecart["votes"].items():
+            print(f"       {script:<40} {json.dumps(valeur, ensure_ascii=False)[:160]}", file=sys.stderr)
+
+
+# --- ÉCRITURE ---
+def acquire_lock(lock_file: str) -> None:
+    os.makedirs(os.path.dirname(lock_file), exist_ok=True)
+    try:
+        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        os.write(fd, b"lock")
+        os.close(fd)
+    except FileExistsError:
+        raise SystemExit(f"Lock présent ({os.path.basename(lock_file)}) : écriture en cours.")
+
+
+def release_lock(lock_file: str) -> None:
+    try:
+        os.remove(lock_file)
+    except FileNotFoundError:
+        pass
+
+
+def archiver_version(fichier: str, ancien: Optional[Dict[str, Any]], date_nouvelle: str) -> None:
+    """
+    Conserve la version remplacée sous historique/<fichier>/<sa date d'effet>.json, pour que les
+    bulletins des périodes passées soient recalculés avec les barèmes de l'époque.
+    Une correction le jour même de la version précédente la remplace sans l'archiver.
+    """
+    if ancien is None:
+        return
+    ancien_meta = ancien.get("meta", {})
+    # Une version antérieure à l'historisation n'a pas de date d'effet : elle couvre tout le passé.
+    date_effet = ancien_meta.get("date_effet") or "0001-01-01"
+    if date_effet >= date_nouvelle:
+        return
+    dossier = os.path.join(DATA_DIR, HISTORIQUE_DIR, os.path.splitext(fichier)[0])
+    os.makedirs(dossier, exist_ok=True)
+    with open(os.path.join(dossier, f"{date_effet}.json"), "w", encoding="utf-8") as f:
+        json.dump(ancien, f, ensure_ascii=False, indent=2)
+
+
+def update_data_file(fichier: str, resultats: List[Dict[str, Any]]) -> None:
+    """Écrit en une fois tous les barèmes validés qui ciblent le même fichier de data/."""
+    path = os.path.join(DATA_DIR, fichier)
+    lock_file = os.path.join(DATA_DIR, f".lock_{os.path.splitext(fichier)[0]}")
+
+    acquire_lock(lock_file)
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                db = json.load(f)
+        else:
+            db = {}
+        ancien = json.loads(json.dumps(db)) if db else None
+        meta = db.setdefault("meta", {"last_scraped": "", "hash": "", "source": [], "generator": ""})
+        par_bareme = meta.setdefault("baremes", {})
+
+        now = iso_now()
+        # Date d'effet de la nouvelle version : la plus récente des barèmes qui changent ; la date
+        # du scraping seulement si aucun d'eux n'a de date légale (sources ou schéma).
+        dates_effet: List[str] = []
+        for res in resultats:
+            schema = BAREMES[res["nom"]]
+            if any(not valeurs_egales(lire_chemin(db, cible), valeur, schema.get("tolerance", DEFAULT_TOLERANCE))
+                   for cible, valeur in res["valeurs"].items()):
+                dates_effet.append(res.get("date_effet") or now[:10])
+            for cible, valeur in res["valeurs"].items():
+                ecrire_chemin(db, cible, valeur, schema.get("gabarits", {}))
+            par_bareme[res["nom"]] = {"last_scraped": now, "votants": res["votants"], "source": res["sources"]}
+
+        meta["last_scraped"] = now
+        meta["generator"] = GENERATOR
+        meta["source"] = merge_sources([{"meta": b} for b in par_bareme.values()])
+        meta["hash"] = compute_hash({k: v for k, v in db.items() if k != "meta"})
+        if ancien is None or compute_hash({k: v for k, v in ancien.items() if k != "meta"}) != meta["hash"]:
+            date_effet = max(dates_effet, default=now[:10])
+            archiver_version(fichier, ancien, date_effet)
+            meta["date_effet"] = date_effet
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(db, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        release_lock(lock_file)
+
+
+# --- POINT D'ENTRÉE ---
+def reconcilier_tout(noms: Optional[List[str]] = None, ecrire: bool = True) -> List[Dict[str, Any]]:
+    """
+    Une seule passe : tous les scrapers des barèmes demandés sont lancés en parallèle,
+    chaque barème est voté, puis chaque fichier cible est réécrit une seule fois.
+    """
+    noms = noms or list(BAREMES)
+    inconnus = [n for n in noms if n not in BAREMES]
+    if inconnus:
+        raise SystemExit(f"Barème(s) inconnu(s) : {', '.join(inconnus)}")
+
+    chemins = sorted({p for n in noms for p in chemins_scripts(BAREMES[n])})
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        mesures = dict(zip(chemins, pool.map(run_script_mesure, chemins)))
+    payloads = {p: payload for p, (payload, _) in mesures.items()}
+
+    resultats = [reconcilier(n, BAREMES[n], payloads) for n in noms]
+    for res in resultats:
+        if res["ok"]:
+            print(f"✅ {res['nom']} : quorum atteint ({', '.join(res['votants'])}).")
+        else:
+            debug_ecarts(res)
+
+    if ecrire:
+        par_fichier: Dict[str, List[Dict[str, Any]]] = {}
+        for res in resultats:
+            if res["ok"]:
+                par_fichier.setdefault(BAREMES[res["nom"]]["fichier"], []).append(res)
+        for fichier, groupe in par_fichier.items():
+            update_data_file(fichier, groupe)
+            print(f"OK: {fichier} mis à jour ({', '.join(r['nom'] for r in groupe)}).")
+        # Historique de fraîcheur / latence / écarts, lu par le dashboard
+        fraicheur.enregistrer_passe(
+            resultats,
+            BAREMES,
+            {p: latence for p, (_, latence) in mesures.items()},
+            {n: chemins_scripts(BAREMES[n]) for n in noms},
+        )
+    return resultats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
+    ecrire = "--dry-run" not in args
+    noms = [a for a in args if not a.startswith("--")]
+    resultats = reconcilier_tout(noms or None, ecrire=ecrire)
+    if not all(r["ok"] for r in resultats):
+        raise SystemExit(2)
+
+
+if __name__ == "__main__":
+    main()
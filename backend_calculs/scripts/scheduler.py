@@ -0,0 +1,106 @@
+# scripts/scheduler.py
+#
+# Démon de rafraîchissement des barèmes.
+#
+# Chaque barème de scripts/baremes_schemas.py est réconcilié selon sa propre cadence
+# ("cadence_heures", 24 h par défaut). Les barèmes échus au même moment partagent une seule passe.
+# En cas d'échec (quorum non atteint, lock présent...), le barème est reprogrammé avec un backoff
+# exponentiel plafonné à sa cadence, avec jitter pour ne pas relancer tous les scrapers en même temps.
+#
+#   python scripts/scheduler.py           # tourne jusqu'à SIGINT / SIGTERM
+#   python scripts/scheduler.py --once    # traite les barèmes échus puis s'arrête
+
+import os
+import random
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fraicheur
+from baremes_schemas import BAREMES
+from reconciliation import reconcilier_tout
+
+# --- CONFIGURATION ---
+BACKOFF_BASE_MINUTES = float(os.getenv("SCHEDULER_BACKOFF_BASE_MINUTES", "15"))
+JITTER_RATIO = float(os.getenv("SCHEDULER_JITTER_RATIO", "0.1"))
+DEMARRAGE_ETALEMENT_MINUTES = float(os.getenv("SCHEDULER_DEMARRAGE_ETALEMENT_MINUTES", "10"))
+TICK_MAX_SECONDES = 60.0
+
+_stop = threading.Event()
+
+
+def _jitter(delai: timedelta, ratio: float = JITTER_RATIO) -> timedelta:
+    return delai * random.uniform(1 - ratio, 1 + ratio)
+
+
+def delai_suivant(nom: str, ok: bool, echecs_consecutifs: int) -> timedelta:
+    """Cadence du barème après un succès ; backoff exponentiel (plafonné à la cadence) après un échec."""
+    cadence = timedelta(hours=fraicheur.cadence_heures(BAREMES[nom]))
+    if ok:
+        return _jitter(cadence)
+    backoff = timedelta(minutes=BACKOFF_BASE_MINUTES * 2 ** max(0, echecs_consecutifs - 1))
+    # Jitter "equal" : au moins la moitié du backoff, pour rester borné vers le bas.
+    return min(cadence, backoff) * random.uniform(0.5, 1.0)
+
+
+def planning_initial(maintenant: datetime) -> Dict[str, datetime]:
+    """Reprend la planification persistée ; les barèmes jamais planifiés démarrent étalés dans le temps."""
+    etat = fraicheur.etat_baremes()
+    planning = {}
+    for nom in BAREMES:
+        prochaine = fraicheur.parse_iso((etat.get(nom) or {}).get("prochaine_execution"))
+        if prochaine is None:
+            prochaine = maintenant + timedelta(minutes=random.uniform(0, DEMARRAGE_ETALEMENT_MINUTES))
+        planning[nom] = prochaine
+    return planning
+
+
+def executer(noms: List[str]) -> Dict[str, bool]:
+    """Réconcilie les barèmes échus en une passe. Une erreur globale compte comme un échec pour chacun."""
+    try:
+        return {r["nom"]: r["ok"] for r in reconcilier_tout(noms)}
+    except (Exception, SystemExit) as e:
+        print(f"[ERREUR] Passe de réconciliation interrompue ({', '.join(noms)}) : {e}", file=sys.stderr)
+        return {nom: False for nom in noms}
+
+
+def tick(planning: Dict[str, datetime], maintenant: datetime) -> None:
+    dus = sorted(nom for nom, prochaine in planning.items() if prochaine <= maintenant)
+    if not dus:
+        return
+    print(f"--- Rafraîchissement : {', '.join(dus)} ---")
+    statuts = executer(dus)
+    etat = fraicheur.etat_baremes()
+    for nom in dus:
+        echecs = (etat.get(nom) or {}).get("echecs_consecutifs") or (0 if statuts[nom] else 1)
+        prochaine = datetime.now(timezone.utc) + delai_suivant(nom, statuts[nom], echecs)
+        planning[nom] = prochaine
+        fraicheur.planifier(nom, prochaine)
+        print(f"   {nom:<36} {'OK' if statuts[nom] else 'ÉCHEC'} -> prochaine exécution {fraicheur.iso(prochaine)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
+    une_fois = "--once" in args
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: _stop.set())
+
+    planning = planning_initial(datetime.now(timezone.utc))
+    if une_fois:
+        tick(planning, datetime.now(timezone.utc) + timedelta(minutes=DEMARRAGE_ETALEMENT_MINUTES))
+        return
+
+    print(f"--- Scheduler des barèmes démarré ({len(planning)} barèmes) ---")
+    while not _stop.is_set():
+        tick(planning, datetime.now(timezone.utc))
+        attente = (min(planning.values()) - datetime.now(timezone.utc)).total_seconds()
+        _stop.wait(max(1.0, min(TICK_MAX_SECONDES, attente)))
+    print("--- Scheduler arrêté ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,13 @@ import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from googlesearch import search
-from openai import OpenAI
 
 load_dotenv()
 
+# Cache LLM partagé par les scripts *_AI.py (scripts/llm_cache.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from llm_cache import extract_json_cached
+
 # --- Constantes ---
 SEARCH_QUERY = "taux cotisation assurance vieillesse salariale actuel"
 
@@ -22,28 +25,8 @@ def iso_now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 def extract_json_with_gpt(page_text: str, prompt: str) -> dict | None:
-    """Interroge GPT-4o-mini et attend une réponse JSON."""
-    if not os.getenv("OPENAI_API_KEY"):
-        print("ERREUR : La variable d'environnement OPENAI_API_KEY n'est pas définie.", file=sys.stderr)
-        return None
-    try:
-        client = OpenAI()
-        print("   - Envoi de la requête à l'API GPT-4o-mini pour extraction JSON...", file=sys.stderr)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "Tu es un expert en extraction de données qui répond au format JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0
-        )
-        extracted_text = response.choices[0].message.content.strip()
-        print(f"   - Réponse brute de l'API : {extracted_text}", file=sys.stderr)
-        return json.loads(extracted_text)
-    except Exception as e:
-        print(f"   - ERREUR : L'appel à l'API ou le parsing JSON a échoué. Raison : {e}", file=sys.stderr)
-        return None
+    """Interroge GPT-4o-mini (via le cache LLM) et attend une réponse JSON."""
+    return extract_json_cached(page_text, prompt)
 
 # --- SCRAPER IA ---
 def get_taux_vieillesse_salarial_via_ai() -> dict | None:
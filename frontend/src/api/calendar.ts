@@ -1,6 +1,7 @@
 // src/api/calendar.ts
 
 import apiClient from './apiClient';
+import type { Job } from './jobs';
 
 // --- INTERFACES POUR LE CALENDRIER ---
 // Ces types décrivent la forme des données échangées avec l'API.
@@ -60,9 +61,64 @@ export const updateActualHours = (employeeId: string, year: number, month: numbe
   });
 };
 
+// Met le calcul en file (202) : le travail renvoyé se suit avec waitForJob (api/jobs.ts).
 export const calculatePayrollEvents = (employeeId: string, year: number, month: number) => {
-  return apiClient.post(`/api/employees/${employeeId}/calculate-payroll-events`, {
+  return apiClient.post<Job>(`/api/employees/${employeeId}/calculate-payroll-events`, {
     year,
     month,
   });
-};
\ No newline at end of file
+};
+
+// --- CALENDRIERS GROUPÉS (vues d'équipe) ---
+// Encodage compact : `hours[i]` et `types[i]` concernent le jour i + 1 ; `types` contient des
+// indices dans `type_codes` (liste partagée par toute la réponse ou la requête).
+
+export interface CompactCalendar {
+  hours: (number | null)[];
+  types?: (number | null)[] | null;
+}
+
+export interface CalendarBatchEntry {
+  employee_id: string;
+  year: number;
+  month: number;
+  planned?: CompactCalendar;
+  actual?: CompactCalendar;
+  calendrier_prevu?: PlannedEventData[];
+  calendrier_reel?: ActualHoursData[];
+}
+
+export interface CalendarBatchResponse {
+  type_codes?: string[];
+  entries: CalendarBatchEntry[];
+}
+
+/**
+ * Récupère en une requête les calendriers de plusieurs employés, de `start` à `end` (AAAA-MM).
+ */
+export const getCalendars = (
+  employeeIds: string[],
+  start: string,
+  end: string = start,
+  options: { kinds?: ('planned' | 'actual')[]; encoding?: 'compact' | 'full' } = {}
+) => {
+  return apiClient.get<CalendarBatchResponse>('/api/schedules/calendars', {
+    params: {
+      employee_ids: employeeIds.join(','),
+      start,
+      end,
+      kinds: (options.kinds ?? ['planned', 'actual']).join(','),
+      encoding: options.encoding ?? 'compact',
+    }
+  });
+};
+
+/**
+ * Enregistre en une requête les calendriers de plusieurs employés et mois.
+ */
+export const updateCalendars = (entries: CalendarBatchEntry[], typeCodes: string[] = []) => {
+  return apiClient.put('/api/schedules/calendars', {
+    type_codes: typeCodes,
+    entries,
+  });
+};
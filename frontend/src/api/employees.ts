@@ -0,0 +1,53 @@
+// src/api/employees.ts
+import apiClient from './apiClient';
+
+
+// --- INTERFACES ---
+export interface EmployeeListItem {
+  id: string;
+  employee_folder_name: string | null;
+  first_name: string;
+  last_name: string;
+  job_title: string | null;
+  contract_type: string | null;
+  statut: string | null;
+  hire_date: string | null;
+}
+
+export interface EmployeeListPage {
+  items: EmployeeListItem[];
+  total: number | null; // servi avec la première page seulement
+  next_cursor: string | null;
+}
+
+export interface EmployeeListParams {
+  limit?: number;
+  cursor?: string;
+  statut?: string;
+  contract_type?: string;
+  search?: string;
+  ids?: string; // identifiants séparés par des virgules
+}
+
+// --- FONCTIONS D'API ---
+
+// Une page de la liste des salariés (colonnes de liste uniquement)
+export const listEmployees = (params: EmployeeListParams = {}) => {
+  return apiClient.get<EmployeeListPage>('/api/employees/list', { params });
+};
+
+// Salariés d'identifiants donnés (noms affichés à côté de saisies, bulletins...), par lots de 200
+export const getEmployeesByIds = async (ids: string[]) => {
+  const unique = [...new Set(ids)];
+  const items: EmployeeListItem[] = [];
+  for (let i = 0; i < unique.length; i += 200) {
+    const { data } = await listEmployees({ limit: 200, ids: unique.slice(i, i + 200).join(',') });
+    items.push(...data.items);
+  }
+  return items;
+};
+
+// Fiche, bulletins, contrat et saisies du mois en un seul appel (page salarié)
+export const getEmployeeOverview = (employeeId: string, year: number, month: number) => {
+  return apiClient.get(`/api/employees/${employeeId}/overview`, { params: { year, month } });
+};
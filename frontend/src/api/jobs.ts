@@ -0,0 +1,68 @@
+// src/api/jobs.ts
+
+import apiClient from './apiClient';
+
+// --- INTERFACES ---
+// Travaux longs exécutés en arrière-plan par le worker (backend_api/worker.py).
+
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface Job {
+  id: string;
+  kind: string;
+  tenant: string;
+  status: JobStatus;
+  payload: Record<string, unknown>;
+  attempts: number;
+  max_attempts: number;
+  run_after: string | null;
+  result: any;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+// --- FONCTIONS D'API ---
+
+/**
+ * Met en file la génération des bulletins du mois (un travail par employé).
+ */
+export const enqueuePayslips = (employeeIds: string[], year: number, month: number, force = false) => {
+  return apiClient.post<{ jobs: Job[] }>('/api/jobs/payslips', {
+    employee_ids: employeeIds,
+    year,
+    month,
+  }, { params: { force } });
+};
+
+/**
+ * Met en file le recalcul des événements de paie d'un employé pour un mois.
+ */
+export const enqueuePayrollEvents = (employeeId: string, year: number, month: number) => {
+  return apiClient.post<Job>('/api/jobs/payroll-events', {
+    employee_id: employeeId,
+    year,
+    month,
+  });
+};
+
+export const getJob = (jobId: string) => {
+  return apiClient.get<Job>(`/api/jobs/${jobId}`);
+};
+
+/**
+ * Interroge le travail jusqu'à ce qu'il soit terminé (réussi ou en échec définitif). Au-delà de
+ * `timeoutMs` (aucun worker ne l'a pris, par exemple), la promesse est rejetée ; le travail reste en file.
+ */
+export const waitForJob = async (jobId: string, intervalMs = 1000, timeoutMs = 10 * 60 * 1000): Promise<Job> => {
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    const { data } = await getJob(jobId);
+    if (data.status === 'succeeded' || data.status === 'failed') return data;
+    if (Date.now() + intervalMs > deadline) {
+      throw new Error(`Travail ${jobId} toujours "${data.status}" après ${Math.round(timeoutMs / 1000)} s.`);
+    }
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+};
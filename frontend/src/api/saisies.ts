@@ -59,3 +59,53 @@ export const deleteEmployeeMonthlyInput = (employeeId: string, inputId: string)
 };
 
 
+
+export interface MonthlyInputImportReport {
+  received: number;
+  valid: number;
+  imported: number;
+  duplicates: number;
+  error_count: number;
+  errors: { row: number; errors: string[] }[];
+  dry_run: boolean;
+}
+
+// Import en masse d'un fichier CSV ou JSON ; dryRun valide sans rien écrire
+export const importMonthlyInputs = (file: File, year: number, month: number, dryRun = false) => {
+  const formData = new FormData();
+  formData.append('file', file);
+  // apiClient envoie du JSON par défaut : sans ce remplacement, axios sérialiserait le FormData.
+  return apiClient.post<MonthlyInputImportReport>('/api/monthly-inputs/import', formData, {
+    params: { year, month, dry_run: dryRun },
+    headers: { 'Content-Type': 'multipart/form-data' },
+  });
+};
+
+// Flux des changements de saisies du mois (SSE) : "snapshot" à l'ouverture, puis des deltas.
+// EventSource se reconnecte seul et renvoie Last-Event-ID : le serveur rejoue ce qui a été manqué.
+export const subscribeMonthlyInputs = (
+  year: number,
+  month: number,
+  onChange: (update: (inputs: MonthlyInput[]) => MonthlyInput[]) => void,
+  onReset: () => void,
+) => {
+  const source = new EventSource(`${apiClient.defaults.baseURL}/api/monthly-inputs/events?year=${year}&month=${month}`);
+  const byDate = (a: MonthlyInput, b: MonthlyInput) => (b.created_at || '').localeCompare(a.created_at || '');
+
+  source.addEventListener('snapshot', (e) => {
+    const { rows } = JSON.parse((e as MessageEvent).data);
+    onChange(() => rows);
+  });
+  source.addEventListener('upsert', (e) => {
+    const { rows } = JSON.parse((e as MessageEvent).data) as { rows: MonthlyInput[] };
+    const ids = new Set(rows.map(r => r.id));
+    onChange(inputs => [...rows, ...inputs.filter(i => !ids.has(i.id))].sort(byDate));
+  });
+  source.addEventListener('delete', (e) => {
+    const ids = new Set<string>(JSON.parse((e as MessageEvent).data).ids);
+    onChange(inputs => inputs.filter(i => !ids.has(i.id)));
+  });
+  source.addEventListener('reset', () => onReset());
+
+  return () => source.close();
+};
@@ -47,6 +47,10 @@ interface SaisieModalProps {
   onSave: (data: MonthlyInputCreate[]) => void; // <-- CORRECTION APPLIQUÉE ICI
   employees: Employee[];
   employeeScopeId?: string;
+  // Recherche côté serveur : si fourni, la liste n'est plus filtrée localement
+  onSearchChange?: (search: string) => void;
+  hasMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 const initialState = {
@@ -58,8 +62,9 @@ const initialState = {
   is_taxable: true,
 };
 
-export function SaisieModal({ isOpen, onClose, onSave, employees, employeeScopeId }: SaisieModalProps) {
+export function SaisieModal({ isOpen, onClose, onSave, employees, employeeScopeId, onSearchChange, hasMore, onLoadMore }: SaisieModalProps) {
   const [formData, setFormData] = useState(initialState);
+  const [employeeSearch, setEmployeeSearch] = useState("");
   const [primesCatalogue, setPrimesCatalogue] = useState<PrimeFromCatalogue[]>([]);
   const [isCustomPrime, setIsCustomPrime] = useState(true);
   const [popoverOpen, setPopoverOpen] = useState(false);
@@ -73,6 +78,8 @@ export function SaisieModal({ isOpen, onClose, onSave, employees, employeeScopeI
     if (isOpen) {
       setFormData(initialState);
       setIsCustomPrime(true);
+      setEmployeeSearch("");
+      onSearchChange?.("");
       if (employeeScopeId) {
         setFormData(prev => ({ ...prev, selectedEmployees: [employeeScopeId] }));
       }
@@ -193,8 +200,12 @@ export function SaisieModal({ isOpen, onClose, onSave, employees, employeeScopeI
                   </Button>
                 </PopoverTrigger>
                 <PopoverContent className="w-[--radix-popover-trigger-width] p-0">
-                  <Command>
-                    <CommandInput placeholder="Rechercher un employé..." />
+                  <Command shouldFilter={!onSearchChange}>
+                    <CommandInput
+                      placeholder="Rechercher un employé..."
+                      value={employeeSearch}
+                      onValueChange={(value) => { setEmployeeSearch(value); onSearchChange?.(value); }}
+                    />
                     <CommandList>
                       <CommandEmpty>Aucun employé trouvé.</CommandEmpty>
                       <CommandGroup>
@@ -214,6 +225,11 @@ export function SaisieModal({ isOpen, onClose, onSave, employees, employeeScopeI
                             </div>
                           </CommandItem>
                         ))}
+                        {hasMore && onLoadMore && (
+                          <CommandItem onSelect={onLoadMore} className="cursor-pointer justify-center text-muted-foreground">
+                            Afficher plus d'employés...
+                          </CommandItem>
+                        )}
                       </CommandGroup>
                     </CommandList>
                   </Command>
@@ -3,6 +3,7 @@
 import { useState, useEffect, useCallback } from 'react';
 import { useToast } from "@/components/ui/use-toast";
 import * as calendarApi from '@/api/calendar';
+import { waitForJob } from '@/api/jobs';
 import { DayData } from '@/components/ScheduleModal';
 
 // On reprend les types de données depuis notre fichier d'API
@@ -156,7 +157,9 @@ export function useCalendar(employeeId: string | undefined) {
         console.log("  -> Succès: Données brutes enregistrées.");
 
         console.log("%c--- [WORKFLOW-PAIE | Étape 2] Demande de calcul au Backend ---", "color: blue; font-weight: bold;");
-        await calendarApi.calculatePayrollEvents(employeeId, selectedDate.year, selectedDate.month);
+        const { data: job } = await calendarApi.calculatePayrollEvents(employeeId, selectedDate.year, selectedDate.month);
+        const done = await waitForJob(job.id);
+        if (done.status === 'failed') throw new Error(done.error ?? "Échec du calcul des événements de paie.");
         console.log("  -> Succès: Le backend a terminé le calcul.");
         
         toast({ title: "Succès", description: "Calendrier et événements de paie sauvegardés et calculés." });
@@ -0,0 +1,68 @@
+// src/hooks/useEmployeeList.ts
+
+import { useState, useEffect, useCallback, useRef } from 'react';
+import { listEmployees, EmployeeListItem, EmployeeListParams } from '@/api/employees';
+
+type EmployeeListFilters = Omit<EmployeeListParams, 'cursor' | 'limit'>;
+
+const PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 300;
+
+/**
+ * Liste paginée des salariés : la recherche et les filtres sont appliqués par le serveur,
+ * les pages suivantes sont chargées à la demande (loadMore) en suivant le curseur.
+ * Le total est celui de la première page (le serveur ne le recompte pas ensuite).
+ */
+export function useEmployeeList(filters: EmployeeListFilters = {}, pageSize: number = PAGE_SIZE) {
+  const [employees, setEmployees] = useState<EmployeeListItem[]>([]);
+  const [total, setTotal] = useState<number | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+
+  // Une réponse arrivée après un changement de filtres est ignorée.
+  const requestId = useRef(0);
+  const filtersKey = JSON.stringify(filters);
+
+  const reload = useCallback(async () => {
+    const id = ++requestId.current;
+    setIsLoading(true);
+    try {
+      const { data } = await listEmployees({ ...JSON.parse(filtersKey), limit: pageSize });
+      if (id !== requestId.current) return;
+      setEmployees(data.items);
+      setTotal(data.total);
+      setNextCursor(data.next_cursor);
+      setError(null);
+    } catch (err) {
+      if (id === requestId.current) setError("Erreur : Impossible de récupérer la liste des salariés.");
+    } finally {
+      if (id === requestId.current) setIsLoading(false);
+    }
+  }, [filtersKey, pageSize]);
+
+  // Première page à chaque changement de filtres (la saisie de recherche est temporisée).
+  useEffect(() => {
+    const timer = setTimeout(reload, filters.search ? SEARCH_DEBOUNCE_MS : 0);
+    return () => clearTimeout(timer);
+  }, [reload]); // eslint-disable-line react-hooks/exhaustive-deps
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || isLoadingMore) return;
+    const id = requestId.current;
+    setIsLoadingMore(true);
+    try {
+      const { data } = await listEmployees({ ...JSON.parse(filtersKey), limit: pageSize, cursor: nextCursor });
+      if (id !== requestId.current) return;
+      setEmployees(prev => [...prev, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      if (id === requestId.current) setError("Erreur : Impossible de charger la suite de la liste.");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [filtersKey, pageSize, nextCursor, isLoadingMore]);
+
+  return { employees, total, hasMore: nextCursor !== null, isLoading, isLoadingMore, error, loadMore, reload };
+}
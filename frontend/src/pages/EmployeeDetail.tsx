@@ -1,8 +1,8 @@
 // src/pages/EmployeeDetail.tsx 
 
-import React, { useCallback, useState, useEffect } from "react";
+import React, { useCallback, useState, useEffect, useRef } from "react";
 import { useParams, Link } from "react-router-dom";
-import apiClient from "@/api/apiClient";
+import { getEmployeeOverview } from "@/api/employees";
 
 // --- Notre hook et notre modal ---
 import { DayData } from "@/components/ScheduleModal"; 
@@ -191,11 +191,17 @@ export default function EmployeeDetail() {
 
   const [isLoadingSaisies, setIsLoadingSaisies] = useState(true);
   const [employeeSaisies, setEmployeeSaisies] = useState<any[]>([]);
+  // Mois dont les saisies ont déjà été chargées avec la vue agrégée (évite un second appel)
+  const saisiesLoadedFrom = useRef<string | null>(null);
 
 
   const fetchSaisies = useCallback(async () => {
     if (!employeeId) return;
     const { year, month } = selectedDate;
+    if (saisiesLoadedFrom.current === `${employeeId}-${year}-${month}`) {
+      saisiesLoadedFrom.current = null;
+      return;
+    }
     setIsLoadingSaisies(true);
     try {
       const res = await saisiesApi.getEmployeeMonthlyInputs(employeeId, year, month);
@@ -220,8 +226,8 @@ export default function EmployeeDetail() {
 
   // Charger les saisies à chaque changement de mois ou employé
   useEffect(() => {
-    if (employeeId) fetchSaisies();
-  }, [fetchSaisies]); // fetchSaisies est maintenant stable grâce à useCallback et ses dépendances primitives
+    if (employeeId && !isPageLoading) fetchSaisies();
+  }, [fetchSaisies, isPageLoading]); // fetchSaisies est maintenant stable grâce à useCallback et ses dépendances primitives
 
 
 
@@ -234,14 +240,14 @@ export default function EmployeeDetail() {
     const fetchPageData = async () => {
       setIsPageLoading(true);
       try {
-        const [employeeRes, payslipsRes, contractRes] = await Promise.all([
-          apiClient.get(`/api/employees/${employeeId}`),
-          apiClient.get(`/api/employees/${employeeId}/payslips`),
-          apiClient.get(`/api/employees/${employeeId}/contract`),
-        ]);
-        setEmployee(employeeRes.data);
-        setPayslips(payslipsRes.data);
-        setContractUrl(contractRes.data.url);
+        const { year, month } = selectedDate;
+        const { data } = await getEmployeeOverview(employeeId, year, month);
+        setEmployee(data.employee);
+        setPayslips(data.payslips);
+        setContractUrl(data.contract_url);
+        setEmployeeSaisies(data.monthly_inputs);
+        setIsLoadingSaisies(false);
+        saisiesLoadedFrom.current = `${employeeId}-${year}-${month}`;
       } catch (err) {
         console.error("Erreur lors du chargement des données de la page", err);
       } finally {
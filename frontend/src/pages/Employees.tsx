@@ -1,6 +1,7 @@
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import apiClient from '../api/apiClient';
+import { useEmployeeList } from '@/hooks/useEmployeeList';
 
 import { useForm } from "react-hook-form";
 import { z } from "zod";
@@ -23,16 +24,6 @@ import { useFieldArray } from "react-hook-form";
 
 
 
-// Interface pour la liste (simple)
-interface EmployeeListItem {
-  id: string;
-  first_name: string;
-  last_name: string;
-  job_title: string | null;
-  contract_type: string | null;
-  hire_date: string | null;
-}
-
 // Schéma de validation Zod complet
 const formSchema = z.object({
   // --- SECTION SALARIÉ (COMPLÉTÉE) ---
@@ -153,10 +144,10 @@ const getContractBadge = (type: string) => {
 };
 
 export default function Employees() {
-  const [employees, setEmployees] = useState<EmployeeListItem[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState("");
+  // Recherche et pagination côté serveur (GET /api/employees/list)
+  const { employees, total, hasMore, isLoading: loading, isLoadingMore, error, loadMore, reload: fetchEmployees } =
+    useEmployeeList({ search: searchTerm.trim() || undefined });
   const [isDialogOpen, setIsDialogOpen] = useState(false);
 
   const navigate = useNavigate();
@@ -224,21 +215,6 @@ export default function Employees() {
 
   const isCadre = form.watch("statut")?.toLowerCase() === 'cadre';
 
-  const fetchEmployees = async () => {
-    try {
-      setLoading(true);
-      const response = await apiClient.get<EmployeeListItem[]>('/api/employees');
-      setEmployees(response.data);
-      setError(null);
-    } catch (err) {
-      setError("Erreur : Impossible de récupérer la liste des salariés.");
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => { fetchEmployees(); }, []);
-
   const onSubmit = async (values: z.infer<typeof formSchema>) => {
   console.log("Validation réussie, données brutes du formulaire :", values);
 
@@ -282,12 +258,10 @@ export default function Employees() {
     console.log("Champs en erreur :", errors);
   };
 
-  const filteredEmployees = employees.filter(emp => `${emp.first_name} ${emp.last_name}`.toLowerCase().includes(searchTerm.toLowerCase()));
-
   return (
     <div className="space-y-6">
       <div className="flex items-center justify-between">
-        <div><h1 className="text-3xl font-bold">Gestion des Salariés</h1><p className="text-muted-foreground mt-2">{loading ? 'Chargement...' : `${employees.length} salariés`}</p></div>
+        <div><h1 className="text-3xl font-bold">Gestion des Salariés</h1><p className="text-muted-foreground mt-2">{loading ? 'Chargement...' : `${total ?? employees.length} salariés`}</p></div>
         <Dialog open={isDialogOpen} onOpenChange={setIsDialogOpen}>
           <DialogTrigger asChild><Button><Plus className="mr-2 h-4 w-4"/>Nouveau Contrat</Button></DialogTrigger>
           <DialogContent className="sm:max-w-2xl">
@@ -584,7 +558,7 @@ export default function Employees() {
             <TableBody>
               {loading && <TableRow><TableCell colSpan={4} className="h-24 text-center"><Loader2 className="h-6 w-6 animate-spin mx-auto" /></TableCell></TableRow>}
               {error && <TableRow><TableCell colSpan={4} className="h-24 text-center text-destructive">{error}</TableCell></TableRow>}
-              {!loading && !error && filteredEmployees.map((employee) => (
+              {!loading && !error && employees.map((employee) => (
                 <TableRow key={employee.id} onClick={() => navigate(`/employees/${employee.id}`)} className="cursor-pointer hover:bg-muted/50">
                   <TableCell>
                     <div className="flex items-center gap-3">
@@ -604,6 +578,14 @@ export default function Employees() {
               ))}
             </TableBody>
           </Table>
+          {!loading && !error && hasMore && (
+            <div className="flex justify-center pt-4">
+              <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+                {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                Afficher plus ({employees.length}{total !== null ? ` / ${total}` : ''})
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>
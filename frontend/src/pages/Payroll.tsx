@@ -1,40 +1,21 @@
 // src/pages/Payroll.tsx
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Link } from "react-router-dom";
-import apiClient from '../api/apiClient';
+import { useEmployeeList } from '@/hooks/useEmployeeList';
 
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
-import { Loader2, ChevronRight } from "lucide-react";
+import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input";
+import { Loader2, ChevronRight, Search } from "lucide-react";
 import { Avatar, AvatarFallback } from "@/components/ui/avatar";
 
-interface Employee {
-  id: string;
-  first_name: string;
-  last_name: string;
-  job_title: string | null;
-}
-
 export default function Payroll() {
-  const [employees, setEmployees] = useState<Employee[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
-
-  useEffect(() => {
-    const fetchEmployees = async () => {
-      try {
-        setLoading(true);
-        const response = await apiClient.get<Employee[]>('/api/employees');
-        setEmployees(response.data);
-      } catch (err) {
-        setError("Erreur : Impossible de récupérer la liste des salariés.");
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchEmployees();
-  }, []);
+  const [searchTerm, setSearchTerm] = useState("");
+  // Recherche et pagination côté serveur (GET /api/employees/list)
+  const { employees, total, hasMore, isLoading: loading, isLoadingMore, error, loadMore } =
+    useEmployeeList({ search: searchTerm.trim() || undefined });
 
   return (
     <div className="space-y-6">
@@ -45,6 +26,12 @@ export default function Payroll() {
         </p>
       </div>
 
+      <Card>
+        <CardContent className="pt-6">
+          <div className="relative"><Search className="absolute left-3 top-1/2 -translate-y-1/2 h-4 w-4" /><Input placeholder="Rechercher..." value={searchTerm} onChange={(e) => setSearchTerm(e.target.value)} className="pl-10" /></div>
+        </CardContent>
+      </Card>
+
       <Card>
         <CardHeader><CardTitle>Liste des Salariés</CardTitle></CardHeader>
         <CardContent>
@@ -71,6 +58,14 @@ export default function Payroll() {
               ))}
             </TableBody>
           </Table>
+          {!loading && !error && hasMore && (
+            <div className="flex justify-center pt-4">
+              <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+                {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                Afficher plus ({employees.length}{total !== null ? ` / ${total}` : ''})
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>
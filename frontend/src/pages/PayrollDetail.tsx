@@ -3,6 +3,7 @@
 import { useState, useEffect } from "react";
 import { useParams, Link } from "react-router-dom";
 import apiClient from '../api/apiClient';
+import { enqueuePayslips, waitForJob } from '../api/jobs';
 
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -74,11 +75,10 @@ export default function PayrollDetail() {
     if (!employeeId) return;
     setStatuses(prev => ({ ...prev, [monthToCalculate]: { status: 'loading' } }));
     try {
-      await apiClient.post('/api/actions/generate-payslip', {
-        employee_id: employeeId,
-        year: 2025,
-        month: monthToCalculate
-      });
+      // Génération en file : on suit le travail jusqu'à sa fin avant de relire les bulletins.
+      const { data } = await enqueuePayslips([employeeId], 2025, monthToCalculate);
+      const job = await waitForJob(data.jobs[0].id);
+      if (job.status === 'failed') throw new Error(job.error ?? "Échec de la génération du bulletin.");
       await fetchPayslipData();
     } catch (error) {
       setStatuses(prev => ({ ...prev, [monthToCalculate]: { status: 'error' } }));
@@ -10,10 +10,10 @@ import { Loader2, PlusCircle, Trash2 } from "lucide-react";
 
 import { SaisieModal } from "@/components/SaisieModal";
 import * as saisiesApi from '@/api/saisies';
-import apiClient from '@/api/apiClient';
+import { getEmployeesByIds, EmployeeListItem } from '@/api/employees';
+import { useEmployeeList } from '@/hooks/useEmployeeList';
 
 // --- Types & Interfaces ---
-interface Employee { id: string; first_name: string; last_name: string; job_title: string; }
 type MonthlyInput = saisiesApi.MonthlyInput;
 type MonthlyInputCreate = saisiesApi.MonthlyInputCreate;
 
@@ -21,8 +21,12 @@ export default function Saisies() {
   const { toast } = useToast();
   const [modalOpen, setModalOpen] = useState(false);
   const [monthlyInputs, setMonthlyInputs] = useState<MonthlyInput[]>([]);
-  const [employees, setEmployees] = useState<Employee[]>([]);
+  // Salariés des saisies affichées, par identifiant (chargés à la demande)
+  const [employeesById, setEmployeesById] = useState<Record<string, EmployeeListItem>>({});
   const [isLoading, setIsLoading] = useState(true);
+  // Liste du sélecteur de la modale : recherche et pagination côté serveur
+  const [employeeSearch, setEmployeeSearch] = useState("");
+  const employeeList = useEmployeeList({ search: employeeSearch.trim() || undefined });
 
   const now = new Date();
   const currentMonth = now.getMonth() + 1;
@@ -32,12 +36,8 @@ export default function Saisies() {
   const fetchData = useCallback(async () => {
     setIsLoading(true);
     try {
-      const [inputsRes, employeesRes] = await Promise.all([
-        saisiesApi.getAllMonthlyInputs(currentYear, currentMonth), // Appel correct
-        apiClient.get<Employee[]>('/api/employees')
-      ]);
+      const inputsRes = await saisiesApi.getAllMonthlyInputs(currentYear, currentMonth);
       setMonthlyInputs(inputsRes.data);
-      setEmployees(employeesRes.data);
     } catch (error) {
       console.error(error);
       toast({ title: "Erreur", description: "Impossible de charger les données.", variant: "destructive" });
@@ -50,11 +50,25 @@ export default function Saisies() {
     fetchData(); 
   }, [fetchData]);
 
+  // Noms des salariés des saisies, pour ceux qui ne sont pas encore connus
+  useEffect(() => {
+    const missing = monthlyInputs.map(input => input.employee_id).filter(id => !(id in employeesById));
+    if (missing.length === 0) return;
+    getEmployeesByIds(missing)
+      .then(items => setEmployeesById(prev => ({ ...prev, ...Object.fromEntries(items.map(e => [e.id, e])) })))
+      .catch(error => console.error(error));
+  }, [monthlyInputs]); // eslint-disable-line react-hooks/exhaustive-deps
+
+  // Mises à jour incrémentales de la liste (créations, suppressions, y compris par d'autres utilisateurs)
+  useEffect(() => {
+    return saisiesApi.subscribeMonthlyInputs(currentYear, currentMonth, setMonthlyInputs, fetchData);
+  }, [currentYear, currentMonth, fetchData]);
+
   const handleSaveSaisie = async (payloads: MonthlyInputCreate[]) => {
     try {
       await saisiesApi.createMonthlyInputs(payloads); // Appel correct (pluriel)
       toast({ title: "Succès", description: "Saisie(s) ajoutée(s) avec succès." });
-      fetchData(); // Rafraîchir la liste
+      // La liste est mise à jour par le flux des changements (subscribeMonthlyInputs)
     } catch (error) {
       toast({ title: "Erreur", description: "Échec de l'ajout de la saisie.", variant: "destructive" });
     }
@@ -65,7 +79,7 @@ export default function Saisies() {
     try {
       await saisiesApi.deleteMonthlyInput(id); // Appel correct
       toast({ title: "Supprimée", description: "La saisie a été supprimée." });
-      fetchData(); // Rafraîchir la liste
+      // La liste est mise à jour par le flux des changements (subscribeMonthlyInputs)
     } catch (error) {
       toast({ title: "Erreur", description: "Impossible de supprimer la saisie.", variant: "destructive" });
     }
@@ -108,7 +122,7 @@ export default function Saisies() {
               <TableBody>
                 {monthlyInputs.length > 0 ? (
                   monthlyInputs.map((input) => {
-                    const emp = employees.find(e => e.id === input.employee_id);
+                    const emp = employeesById[input.employee_id];
                     return (
                       <TableRow key={input.id}>
                         <TableCell>{emp ? `${emp.first_name} ${emp.last_name}` : "Inconnu"}</TableCell>
@@ -147,7 +161,10 @@ export default function Saisies() {
         isOpen={modalOpen}
         onClose={() => setModalOpen(false)}
         onSave={handleSaveSaisie}
-        employees={employees}
+        employees={employeeList.employees}
+        onSearchChange={setEmployeeSearch}
+        hasMore={employeeList.hasMore}
+        onLoadMore={employeeList.loadMore}
       />
     </div>
   );